@@ -6,28 +6,38 @@ Este programa funciona como un punto de venta simple, permitiendo registrar
 ventas, crear reportes mensuales y visualizar los ingresos.
 """
 # --- Importación de Módulos Necesarios ---
+import argparse
+import asyncio
+import contextlib
 import time
 import logging
 import os
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple, List, Optional
-
-# Se intenta importar 'msvcrt' para una mejor experiencia en Windows
-try:
-    import msvcrt
-    IS_WINDOWS = True
-except ImportError:
-    IS_WINDOWS = False
+from typing import Dict, Tuple, List, Optional
+
+from tienda.almacen import CONSULTAS, AlmacenVentas, formatear_tabla
+from tienda.archivado import archivar_reporte, reportes_cerrados
+from tienda.bloques_gzip import leer_texto
+from tienda.catalogo_precios import CatalogoPrecios
+from tienda.directorio import Contacto, Directorio
+from tienda.entrada import EntradaConTiempo
+from tienda.formato import formatear_venta
+from tienda.importacion import importar_ventas
+from tienda.indice_fechas import IndiceFechas
+from tienda.inventario import Inventario
+from tienda.manifiesto import ManifiestoReportes
+from tienda.pronosticos import DIAS_PRONOSTICO, PronosticoDemanda
+from tienda.registro import configurar_logging
+from tienda.rollups import RollupsVentas
+from tienda.segmentos import (bloqueo_reporte, esta_archivado, mezclar_lineas, ordenar_lineas,
+                              partes_reporte, path_base, path_segmento, terminal_actual,
+                              terminal_de_parte, validar_terminal)
+from tienda.servidor_pos import HOST as HOST_POS, PUERTO as PUERTO_POS, ServidorPOS
 
 # --- Configuración Inicial ---
 LOG_DIR = Path(__file__).parent / "logs"
-LOG_DIR.mkdir(exist_ok=True)
-logging.basicConfig(
-    filename=LOG_DIR / "sistema_ventas.log",
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] - %(message)s",
-)
 
 DATA_DIR = Path(__file__).parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
@@ -45,11 +55,13 @@ class Usuario:
 
 class Venta:
     """Representa una única transacción de venta."""
-    def __init__(self, producto: str, cantidad: float, precio: float, usuario: Usuario) -> None:
+    def __init__(self, producto: str, cantidad: float, precio: float, usuario: Usuario,
+                 cliente: Optional[Contacto] = None) -> None:
         self.producto = producto
         self.cantidad = cantidad
         self.precio_unitario = precio
         self.usuario = usuario
+        self.cliente = cliente
 
     @property
     def subtotal(self) -> float:
@@ -58,14 +70,27 @@ class Venta:
     
     def to_linea_reporte(self) -> str:
         """Formatea la venta como una línea para el archivo de reporte."""
-        return (f"{self.usuario.nickname},{self.producto},{self.cantidad},"
-                f"{self.precio_unitario:.2f},{self.subtotal:.2f}")
+        return formatear_venta(self.usuario.nickname, self.producto,
+                               self.cantidad, self.precio_unitario)
 
 class GestorArchivos:
     """Gestiona los archivos de reporte de ventas y archivos generales."""
-    def __init__(self, base_dir: Path) -> None:
+    def __init__(self, base_dir: Path, terminal: Optional[str] = None) -> None:
         self.base_dir = base_dir
+        self.indices_dir = base_dir / "indices"
+        # Las ventas van a data/segmentos/<reporte>/<terminal>.txt; sin terminal
+        # explícita se usa TIENDA_TERMINAL o <equipo>-<pid>
+        self.terminal = validar_terminal(terminal) if terminal else terminal_actual()
+        self._lock = threading.Lock()
+        self._indices: Dict[Path, IndiceFechas] = {}
+        self.manifiesto = ManifiestoReportes(base_dir, self.indices_dir / "manifiesto.json")
+        self.rollups = RollupsVentas(base_dir, self.indices_dir / "rollups")
+        self.pronosticos = PronosticoDemanda(base_dir, self.rollups, self.indices_dir / "pronosticos.json")
+        self.inventario = Inventario(base_dir / "inventario.txt", base_dir / "inventario.log")
+        self.catalogo = CatalogoPrecios(base_dir / "precios.txt")
         self._crear_archivos_iniciales()
+        self.clientes = Directorio(base_dir / "clientes.txt")
+        self.proveedores = Directorio(base_dir / "proveedores.txt")
 
     def _crear_archivos_iniciales(self) -> None:
         """Crea 4 archivos iniciales si no existen."""
@@ -82,7 +107,11 @@ class GestorArchivos:
 
     def listar_todos_archivos(self) -> List[str]:
         """Lista todos los archivos .txt disponibles."""
-        return [p.name for p in self.base_dir.glob("*.txt")]
+        return self.manifiesto.listar()
+
+    def info_archivo(self, nombre_archivo: str) -> Optional[dict]:
+        """Metadatos del manifiesto (tamaño y, en reportes, ventas y total)."""
+        return self.manifiesto.entrada(nombre_archivo)
 
     def crear_archivo_personalizado(self, nombre: str, contenido_inicial: str = "") -> Path:
         """Crea un nuevo archivo personalizado."""
@@ -94,61 +123,226 @@ class GestorArchivos:
             raise FileExistsError(f"ERROR: El archivo '{nombre}' ya existe.")
         
         path_archivo.write_text(contenido_inicial or "# Archivo nuevo\n", encoding="utf-8")
+        self.manifiesto.actualizar_archivo(nombre)
         logging.info(f"Archivo personalizado creado: {nombre}")
         return path_archivo
 
     def leer_archivo_general(self, nombre_archivo: str) -> str:
         """Lee cualquier archivo de texto."""
-        path_archivo = self.base_dir / nombre_archivo
+        path_archivo = path_base(self.base_dir, nombre_archivo)
         if not path_archivo.exists():
             raise FileNotFoundError(f"ERROR: El archivo '{nombre_archivo}' no existe.")
         
-        return path_archivo.read_text(encoding="utf-8")
+        return leer_texto(path_archivo)
 
     def escribir_archivo_general(self, nombre_archivo: str, contenido: str, modo: str = "w") -> None:
         """Escribe contenido en un archivo."""
-        path_archivo = self.base_dir / nombre_archivo
-        if not path_archivo.exists() and modo == "a":
-            raise FileNotFoundError(f"ERROR: El archivo '{nombre_archivo}' no existe.")
-        
-        with path_archivo.open(modo, encoding="utf-8") as f:
-            f.write(contenido)
+        # En un reporte, la comprobación y la escritura van con el bloqueo que toma el archivado
+        es_reporte = Path(nombre_archivo).match("ventas_*.txt")
+        with bloqueo_reporte(self.base_dir, nombre_archivo) if es_reporte else contextlib.nullcontext():
+            if esta_archivado(self.base_dir, nombre_archivo):
+                raise ValueError(f"ERROR: El reporte '{nombre_archivo}' está archivado y no se puede modificar.")
+            path_archivo = self.base_dir / nombre_archivo
+            if not path_archivo.exists() and modo == "a":
+                raise FileNotFoundError(f"ERROR: El archivo '{nombre_archivo}' no existe.")
+
+            with path_archivo.open(modo, encoding="utf-8") as f:
+                f.write(contenido)
+        self.manifiesto.actualizar_archivo(nombre_archivo)
         
         logging.info(f"Contenido {'agregado' if modo == 'a' else 'escrito'} en: {nombre_archivo}")
 
     def listar_reportes(self) -> List[str]:
-        return [p.name for p in self.base_dir.glob("ventas_*.txt")]
+        return self.manifiesto.listar(solo_reportes=True)
 
     def crear_reporte_mensual(self, anio: int, mes: int) -> Path:
         nombre_reporte = f"ventas_{anio:04d}-{mes:02d}.txt"
         path_reporte = self.base_dir / nombre_reporte
         
-        if path_reporte.exists():
-            raise FileExistsError(f"ERROR: El reporte '{nombre_reporte}' ya existe.")
+        try:
+            if esta_archivado(self.base_dir, nombre_reporte):
+                raise FileExistsError
+            # Creación exclusiva: si dos terminales crean el mismo mes, sólo una gana
+            path_reporte.open("x").close()
+        except FileExistsError:
+            raise FileExistsError(f"ERROR: El reporte '{nombre_reporte}' ya existe.") from None
         
-        path_reporte.touch()
+        self.manifiesto.actualizar_archivo(nombre_reporte)
         logging.info(f"Reporte mensual creado: {path_reporte.name}")
         return path_reporte
 
     def registrar_venta(self, nombre_reporte: str, venta: Venta, fecha: Tuple[int, int, int]) -> None:
-        path_reporte = self.base_dir / nombre_reporte
+        self.registrar_ventas(nombre_reporte, [(venta, fecha)])
+
+    def registrar_ventas(self, nombre_reporte: str, ventas: List[Tuple[Venta, Tuple[int, int, int]]]) -> None:
+        """Agrega varias ventas a un reporte con una sola apertura y escritura."""
+        path_reporte = path_base(self.base_dir, nombre_reporte)
         if not path_reporte.exists():
             raise FileNotFoundError(f"ERROR: El reporte '{nombre_reporte}' no existe.")
         
-        dia, mes, anio = fecha
-        timestamp = f"[{anio:04d}-{mes:02d}-{dia:02d}]: "
+        lineas = []
+        for venta, (dia, mes, anio) in ventas:
+            fecha_iso = f"{anio:04d}-{mes:02d}-{dia:02d}"
+            lineas.append((fecha_iso, f"[{fecha_iso}]: " + venta.to_linea_reporte() + "\n"))
         
-        with path_reporte.open("a", encoding="utf-8") as f:
-            f.write(timestamp + venta.to_linea_reporte() + "\n")
+        # Se escribe en binario con el fin de línea del sistema (igual que el modo texto)
+        # para conocer el byte exacto donde empieza cada línea
+        codificadas = [linea.replace("\n", os.linesep).encode("utf-8") for _, linea in lineas]
+        with self._lock:
+            # Con el bloqueo del reporte, el mes no puede archivarse entre la comprobación
+            # de path_destino y la escritura (y el segmento no se recrea tras el archivado)
+            with bloqueo_reporte(self.base_dir, nombre_reporte):
+                path_destino = self.path_destino(nombre_reporte)
+                with path_destino.open("ab") as f:
+                    offset = f.tell()
+                    f.write(b"".join(codificadas))
+                indice = self._indice(path_destino)
+                for (fecha_iso, linea), codificada in zip(lineas, codificadas):
+                    fin = offset + len(codificada)
+                    indice.registrar(fecha_iso, offset, fin)
+                    self.manifiesto.registrar_linea(nombre_reporte, linea, path_destino, offset, fin,
+                                                    guardar=False)
+                    self.rollups.registrar_linea(nombre_reporte, linea, path_destino, offset, fin)
+                    offset = fin
+                self.manifiesto.guardar()
+                self.rollups.guardar(nombre_reporte)
             
-        logging.info(f"Venta registrada en: {path_reporte.name}")
+        for venta, _ in ventas:
+            logging.info(f"Venta registrada en: {path_reporte.name} (vendedor: {venta.usuario.nickname})")
+            if venta.cliente is not None:
+                logging.info(f"Cliente de la venta: #{venta.cliente.id} {venta.cliente.nombre}")
+
+    def path_destino(self, nombre_reporte: str) -> Path:
+        """Archivo donde esta terminal agrega las ventas de un reporte."""
+        if esta_archivado(self.base_dir, nombre_reporte):
+            raise ValueError(f"ERROR: El reporte '{nombre_reporte}' está archivado (mes cerrado); "
+                             "no admite ventas nuevas.")
+        path = path_segmento(self.base_dir, nombre_reporte, self.terminal)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def actualizar_derivados(self, nombre_reporte: str) -> None:
+        """Pone al día índices, manifiesto y rollups tras escribir en un reporte por fuera de registrar_ventas."""
+        for parte in partes_reporte(self.base_dir, nombre_reporte):
+            self._indice(parte).actualizar()
+        self.manifiesto.entrada(nombre_reporte)
+        self.rollups.mensual(nombre_reporte)
+
+    def resumen_reporte(self, nombre_reporte: str) -> Tuple[int, float, List[Tuple[str, int, float]]]:
+        """Ventas, total y desglose diario de un reporte, tomados de sus rollups."""
+        if not path_base(self.base_dir, nombre_reporte).exists():
+            raise FileNotFoundError(f"ERROR: El reporte '{nombre_reporte}' no existe.")
+        ventas, total = self.rollups.mensual(nombre_reporte)
+        return ventas, total, self.rollups.por_dia(nombre_reporte)
+
+    def reconstruir_rollups(self) -> List[str]:
+        """Recalcula los rollups de todos los reportes desde sus líneas."""
+        reportes = self.listar_reportes()
+        for nombre_reporte in reportes:
+            self.rollups.reconstruir(nombre_reporte)
+        logging.info(f"Rollups reconstruidos: {len(reportes)} reportes")
+        return reportes
+
+    def archivar_meses_cerrados(self, hasta: Optional[Tuple[int, int]] = None) -> List[Tuple[str, int, int]]:
+        """
+        Comprime los reportes de meses anteriores a `hasta` (por defecto, el actual).
+
+        Devuelve (reporte, bytes de texto, bytes comprimidos) por cada uno.
+        """
+        archivados = []
+        for nombre_reporte in reportes_cerrados(self.base_dir, hasta):
+            with self._lock:
+                texto, comprimido = archivar_reporte(self.base_dir, nombre_reporte)
+                # Los índices del .txt y sus segmentos (y el de un .gz anterior) ya no sirven
+                stem = Path(nombre_reporte).stem
+                for path_indice in [*self.indices_dir.glob(f"{stem}.idx"), *self.indices_dir.glob(f"{stem}.*.idx")]:
+                    path_indice.unlink()
+                self._indices.clear()
+            self.actualizar_derivados(nombre_reporte)
+            archivados.append((nombre_reporte, texto, comprimido))
+        return archivados
+
+    def vender(self, nombre_reporte: str, venta: Venta, fecha: Tuple[int, int, int]) -> None:
+        """Descuenta la venta del inventario y la registra; si falla, repone el stock."""
+        error = self.vender_lote(nombre_reporte, [(venta, fecha)])[0]
+        if error is not None:
+            raise error
+
+    def vender_lote(self, nombre_reporte: str,
+                    ventas: List[Tuple[Venta, Tuple[int, int, int]]]) -> List[Optional[Exception]]:
+        """
+        Descuenta del inventario y registra varias ventas de un mismo reporte.
+
+        Devuelve, por cada venta, None si se registró o el error que la impidió
+        (por ejemplo, stock insuficiente). Si falla la escritura del reporte se
+        repone el stock de todo el lote y se devuelve ese error para todas.
+        """
+        errores: List[Optional[Exception]] = [None] * len(ventas)
+        descontadas = []
+        for i, (venta, fecha) in enumerate(ventas):
+            try:
+                registro = self.inventario.descontar_venta(venta.producto, venta.cantidad)
+            except ValueError as e:
+                errores[i] = e
+                continue
+            descontadas.append((i, registro))
+        try:
+            self.registrar_ventas(nombre_reporte, [ventas[i] for i, _ in descontadas])
+        except Exception as e:
+            for i, registro in descontadas:
+                if registro is not None:
+                    self.inventario.ajustar_stock(registro.sku, ventas[i][0].cantidad)
+                errores[i] = e
+        return errores
+
+    def _indice(self, path_parte: Path) -> IndiceFechas:
+        """Devuelve (y guarda en memoria) el índice de fechas de una parte de reporte."""
+        if path_parte not in self._indices:
+            terminal = terminal_de_parte(path_parte)
+            if path_parte.name.endswith(".gz"):
+                # "ventas_X.txt.gz.idx": lleva un punto más que cualquier
+                # "ventas_X.<terminal>.idx", así no choca con una terminal "gz"
+                nombre_indice = path_parte.name + ".idx"
+            elif terminal:
+                nombre_indice = f"{path_parte.parent.name}.{terminal}.idx"
+            else:
+                nombre_indice = path_parte.stem + ".idx"
+            self._indices[path_parte] = IndiceFechas(path_parte, self.indices_dir / nombre_indice)
+        return self._indices[path_parte]
+
+    def ventas_por_rango(self, nombre_reporte: str, desde: datetime, hasta: datetime) -> Tuple[List[str], float]:
+        """Devuelve las líneas de un reporte entre dos fechas y su total."""
+        path_reporte = path_base(self.base_dir, nombre_reporte)
+        if not path_reporte.exists():
+            raise FileNotFoundError(f"ERROR: El reporte '{nombre_reporte}' no existe.")
+
+        desde_iso, hasta_iso = desde.strftime("%Y-%m-%d"), hasta.strftime("%Y-%m-%d")
+        lineas = list(mezclar_lineas(
+            self._indice(parte).rango(desde_iso, hasta_iso)
+            for parte in partes_reporte(self.base_dir, nombre_reporte)
+        ))
+        total_ventas = 0.0
+        for linea in lineas:
+            try:
+                total_ventas += float(linea.split("]: ")[1].split(',')[-1])
+            except (IndexError, ValueError):
+                logging.warning(f"Línea mal formada en '{nombre_reporte}': '{linea}'")
+        logging.info(f"Consulta por rango en: {path_reporte.name}")
+        return lineas, total_ventas
 
     def leer_reporte(self, nombre_reporte: str) -> Tuple[str, float]:
-        path_reporte = self.base_dir / nombre_reporte
+        path_reporte = path_base(self.base_dir, nombre_reporte)
         if not path_reporte.exists():
             raise FileNotFoundError(f"ERROR: El reporte '{nombre_reporte}' no existe.")
             
-        contenido = path_reporte.read_text(encoding="utf-8")
+        # Vista consolidada: reporte base + segmentos de cada terminal, por fecha.
+        # También con una sola parte, para que archivar no cambie el orden
+        partes = partes_reporte(self.base_dir, nombre_reporte)
+        contenido = "".join(ordenar_lineas(
+            (linea if linea.endswith("\n") else linea + "\n"
+             for linea in leer_texto(parte).splitlines(keepends=True))
+            for parte in partes
+        ))
         total_ventas = 0.0
         for i, linea in enumerate(contenido.splitlines()):
             try:
@@ -161,7 +355,7 @@ class GestorArchivos:
                 logging.warning(f"Línea {i+1} mal formada en '{nombre_reporte}': '{linea}'")
                 continue
         
-        logging.info(f"Reporte leído: {path_reporte.name}")
+        logging.info(f"Reporte leído: {nombre_reporte}")
         return contenido, total_ventas
 
 class App:
@@ -169,6 +363,8 @@ class App:
     def __init__(self) -> None:
         self.usuario: Optional[Usuario] = None
         self.gestor = GestorArchivos(DATA_DIR)
+        # Espera la entrada con selectors (o un hilo en Windows) en lugar de sondear
+        self.entrada = EntradaConTiempo()
         self._sembrar_reportes_iniciales()
 
     # --- Métodos de Interfaz de Usuario (UI) ---
@@ -213,33 +409,47 @@ class App:
         print("[1] Registrar Nueva Venta | [2] Ver Reporte de Ventas")
         print("[3] Crear Reporte Mensual | [4] Gestionar Archivos")
         print("[5] Cambiar de Vendedor | [6] Salir del Sistema")
+        print("[7] Inventario | [8] Pronóstico de Demanda")
         print("="*45)
 
     def input_con_timeout(self, segundos: int) -> str:
         """Espera la entrada del usuario con un tiempo límite."""
-        print(f"Selecciona una opción (tienes {segundos // 60} minutos): ", end="", flush=True)
-        inicio = time.monotonic()
-        if IS_WINDOWS:
-            buffer = ""
-            for _ in range(segundos):
-                time.sleep(1)
-                if msvcrt.kbhit():
-                    char = msvcrt.getwch()
-                    if char == '\r': print(); return buffer.strip()
-                    elif char == '\b':
-                        if buffer: buffer = buffer[:-1]; print('\b \b', end='', flush=True)
-                    else: buffer += char; print(char, end='', flush=True)
-        else:
-            opcion = input()
-            if (time.monotonic() - inicio) < segundos: return opcion
+        opcion = self.entrada.input(f"Selecciona una opción (tienes {segundos // 60} minutos): ", segundos)
+        if opcion is not None: return opcion.strip()
         print("\nEl tiempo de espera ha finalizado.")
         while True:
-            seguir = input("¿Deseas continuar en el sistema? (si/no): ").strip().lower()
+            # Si quedó una lectura pendiente, la respuesta llega por el mismo camino
+            seguir = self.entrada.input("¿Deseas continuar en el sistema? (si/no): ").strip().lower()
             if seguir == "si": return "continue"
-            elif seguir == "no": return "4"
+            elif seguir == "no": return "6"
             else: print("Respuesta no válida.")
     
+    def mostrar_reportes(self, reportes: List[str]) -> None:
+        """Muestra los reportes con sus cifras del manifiesto."""
+        print("Reportes disponibles:")
+        for nombre in reportes:
+            info = self.gestor.info_archivo(nombre) or {}
+            marca = " [archivado]" if info.get("archivado") else ""
+            if info.get("lineas"):
+                print(f"  {nombre}: {info['lineas']} ventas, total ${info['total']:.2f}, "
+                      f"del {info['primera']} al {info['ultima']} ({info['tamano']} bytes){marca}")
+            else:
+                print(f"  {nombre}: (sin ventas){marca}")
+
     # --- Lógica de Negocio de la Tienda ---
+    def elegir_contacto(self, directorio: Directorio, texto: str) -> Optional[Contacto]:
+        """Busca `texto` en el directorio y deja elegir uno de los resultados por número."""
+        encontrados = directorio.buscar(texto)
+        if not encontrados:
+            print("No se encontraron coincidencias.")
+            return None
+        for i, contacto in enumerate(encontrados, 1):
+            print(f"  [{i}] {contacto}")
+        eleccion = input("-> Número del contacto (Enter para ninguno): ").strip()
+        if eleccion.isdigit() and 1 <= int(eleccion) <= len(encontrados):
+            return encontrados[int(eleccion) - 1]
+        return None
+
     def registrar_nueva_venta(self) -> None:
         """Lógica para registrar una nueva venta en un reporte."""
         print("\n--- Registrar Nueva Venta ---")
@@ -248,13 +458,24 @@ class App:
             print("No hay reportes de ventas. Crea uno primero con la opción 3.")
             return
         
-        print("Reportes disponibles:", ", ".join(reportes))
+        self.mostrar_reportes(reportes)
         nombre_reporte = input("-> Escribe el nombre del reporte para añadir la venta: ").strip()
 
         producto = input("-> Nombre del producto: ").strip()
         if not producto:
             print("\nEl nombre del producto no puede estar vacío. Venta cancelada.")
             return
+
+        precio_catalogo = self.gestor.catalogo.precio(producto)
+        if precio_catalogo is None:
+            sugerencias = self.gestor.catalogo.sugerir(producto)
+            if sugerencias:
+                print("Productos del catálogo parecidos:")
+                for i, (nombre, precio_sugerido) in enumerate(sugerencias, 1):
+                    print(f"  [{i}] {nombre} (${precio_sugerido:.2f})")
+                eleccion = input("-> Número del producto (Enter para conservar el nombre escrito): ").strip()
+                if eleccion.isdigit() and 1 <= int(eleccion) <= len(sugerencias):
+                    producto, precio_catalogo = sugerencias[int(eleccion) - 1]
             
         while True:
             try:
@@ -264,18 +485,32 @@ class App:
                 print("Error: la cantidad debe ser un número.")
         while True:
             try:
-                precio = float(input("-> Precio unitario: $"))
+                if precio_catalogo is not None:
+                    texto = input(f"-> Precio unitario (Enter para ${precio_catalogo:.2f}): $").strip()
+                    precio = float(texto) if texto else precio_catalogo
+                else:
+                    precio = float(input("-> Precio unitario: $"))
                 break
             except ValueError:
                 print("Error: el precio debe ser un número.")
+
+        cliente = None
+        texto_cliente = input("-> Cliente (Enter para omitir): ").strip()
+        if texto_cliente:
+            cliente = self.elegir_contacto(self.gestor.clientes, texto_cliente)
                 
         try:
             fecha = self.pedir_fecha()
-            venta = Venta(producto, cantidad, precio, self.usuario)
-            self.gestor.registrar_venta(nombre_reporte, venta, fecha)
+            venta = Venta(producto, cantidad, precio, self.usuario, cliente)
+            self.gestor.vender(nombre_reporte, venta, fecha)
             print(f"\n¡Venta registrada exitosamente en '{nombre_reporte}'!")
             print(f"Subtotal: ${venta.subtotal:.2f}")
-        except FileNotFoundError as e:
+            if cliente is not None:
+                print(f"Cliente: {cliente.nombre}")
+            registro = self.gestor.inventario.buscar(producto)
+            if registro is not None:
+                print(f"Stock restante de '{registro.nombre}': {registro.stock:g}")
+        except (FileNotFoundError, ValueError) as e:
             print(e)
 
     def ver_reporte_ventas(self) -> None:
@@ -286,22 +521,58 @@ class App:
             print("No hay reportes de ventas para mostrar.")
             return
         
-        print("Reportes disponibles:", ", ".join(reportes))
+        self.mostrar_reportes(reportes)
         nombre_reporte = input("-> Escribe el nombre del reporte que quieres ver: ").strip()
         if not nombre_reporte:
             print("No se seleccionó ningún reporte.")
             return
 
-        try:
-            contenido, total = self.gestor.leer_reporte(nombre_reporte)
+        rango = input("-> Rango de fechas (dd/mm/aaaa-dd/mm/aaaa, Enter para ver todo): ").strip()
+        if rango:
+            try:
+                desde_str, hasta_str = rango.split("-")
+                desde = datetime.strptime(desde_str.strip(), "%d/%m/%Y")
+                hasta = datetime.strptime(hasta_str.strip(), "%d/%m/%Y")
+            except ValueError:
+                print("ERROR: Formato inválido. Ejemplo: 10/12/2023-15/12/2023.")
+                return
+            try:
+                lineas, total = self.gestor.ventas_por_rango(nombre_reporte, desde, hasta)
+            except FileNotFoundError as e:
+                print(e)
+                return
             self.limpiar_pantalla()
-            print(f"\n--- Contenido de: {nombre_reporte} ---")
-            print(contenido if contenido else "(Reporte vacío)")
+            print(f"\n--- Ventas de {nombre_reporte} del {desde_str.strip()} al {hasta_str.strip()} ---")
+            print("\n".join(lineas) if lineas else "(Sin ventas en ese rango)")
             print("-" * (len(nombre_reporte) + 20))
-            print(f"TOTAL DE INGRESOS EN ESTE REPORTE: ${total:.2f}")
+            print(f"TOTAL DE INGRESOS EN ESTE RANGO: ${total:.2f}")
             print("-" * (len(nombre_reporte) + 20))
+            return
+
+        # Los totales salen de los rollups; el reporte sólo se lee si se piden las líneas
+        try:
+            ventas, total, dias = self.gestor.resumen_reporte(nombre_reporte)
         except FileNotFoundError as e:
             print(e)
+            return
+        self.limpiar_pantalla()
+        print(f"\n--- Resumen de: {nombre_reporte} ---")
+        for fecha, ventas_dia, total_dia in dias:
+            print(f"  {fecha}: {ventas_dia:>4} ventas  ${total_dia:>10.2f}")
+        if not dias:
+            print("(Reporte vacío)")
+        print("-" * (len(nombre_reporte) + 20))
+        print(f"VENTAS: {ventas} | TOTAL DE INGRESOS EN ESTE REPORTE: ${total:.2f}")
+        print("-" * (len(nombre_reporte) + 20))
+
+        if ventas and input("-> ¿Mostrar las líneas del reporte? (s/N): ").strip().lower() == "s":
+            try:
+                contenido, _ = self.gestor.leer_reporte(nombre_reporte)
+            except FileNotFoundError as e:
+                print(e)
+                return
+            print(f"\n--- Contenido de: {nombre_reporte} ---")
+            print(contenido)
             
     def crear_reporte_mensual(self) -> None:
         """Crea un nuevo archivo de reporte mensual."""
@@ -320,6 +591,85 @@ class App:
         except FileExistsError as e:
             print(e)
 
+    def gestionar_inventario(self) -> None:
+        """Menú para consultar y actualizar el inventario."""
+        inventario = self.gestor.inventario
+        while True:
+            print("\n--- Inventario ---")
+            print("[1] Ver inventario | [2] Alta/actualizar producto")
+            print("[3] Ajustar stock | [4] Productos con poco stock")
+            print("[5] Volver al menú principal")
+
+            opcion = input("Selecciona una opción: ").strip()
+
+            if opcion == "1":
+                registros = inventario.listar()
+                print(f"\nProductos en inventario ({len(registros)}):")
+                for r in registros:
+                    print(f"{r.sku} | {r.nombre} | stock: {r.stock:g} | ${r.precio:.2f}")
+
+            elif opcion == "2":
+                sku = input("SKU: ").strip()
+                nombre = input("Nombre del producto: ").strip()
+                try:
+                    stock = float(input("Stock inicial: "))
+                    precio = float(input("Precio unitario: $"))
+                    inventario.alta(sku, nombre, stock, precio)
+                    print(f"¡Producto '{nombre}' guardado en inventario!")
+                except ValueError as e:
+                    print(e if str(e).startswith("ERROR") else "Error: stock y precio deben ser números.")
+
+            elif opcion == "3":
+                sku = input("SKU: ").strip()
+                try:
+                    delta = float(input("Unidades a sumar (negativo para restar): "))
+                    registro = inventario.ajustar_stock(sku, delta)
+                    print(f"Nuevo stock de '{registro.nombre}': {registro.stock:g}")
+                except KeyError as e:
+                    print(e.args[0])
+                except ValueError as e:
+                    print(e if str(e).startswith("ERROR") else "Error: la cantidad debe ser un número.")
+
+            elif opcion == "4":
+                try:
+                    umbral = float(input("Mostrar productos con stock menor o igual a: "))
+                except ValueError:
+                    print("Error: el umbral debe ser un número.")
+                    continue
+                registros = inventario.bajo_stock(umbral)
+                print(f"\nProductos con poco stock ({len(registros)}):")
+                for r in registros:
+                    print(f"{r.sku} | {r.nombre} | stock: {r.stock:g}")
+
+            elif opcion == "5":
+                break
+            else:
+                print("Opción no válida.")
+
+            input("\nPresiona Enter para continuar...")
+
+    def ver_pronostico_demanda(self) -> None:
+        """Demanda esperada por producto y unidades sugeridas para reponer."""
+        print("\n--- Pronóstico de Demanda ---")
+        try:
+            hasta, pronosticos, recalculados = self.gestor.pronosticos.generar()
+        except ImportError as e:
+            print(e)
+            return
+        if not pronosticos:
+            print("No hay ventas suficientes para pronosticar.")
+            return
+        print(f"Historial hasta {hasta} ({recalculados} de {len(pronosticos)} productos recalculados)")
+        filas = []
+        for p in pronosticos[:20]:
+            registro = self.gestor.inventario.buscar(p.producto)
+            stock = registro.stock if registro is not None else None
+            reponer = max(0.0, p.demanda - stock) if stock is not None else p.demanda
+            filas.append((p.producto, p.media_7, p.media_28, p.demanda, p.dia_fuerte,
+                          "-" if stock is None else f"{stock:g}", float(round(reponer))))
+        print(formatear_tabla(("producto", "prom. 7d", "prom. 28d", f"próx. {DIAS_PRONOSTICO}d",
+                               "día fuerte", "stock", "reponer"), filas))
+
     def cambiar_usuario(self) -> None:
         """Cierra la sesión del usuario actual y solicita uno nuevo."""
         print("\n--- Cambiando de Vendedor ---")
@@ -333,7 +683,8 @@ class App:
             print("\n--- Gestión de Archivos ---")
             print("[1] Listar archivos | [2] Crear archivo")
             print("[3] Leer archivo | [4] Escribir en archivo")
-            print("[5] Volver al menú principal")
+            print("[5] Buscar cliente/proveedor | [6] Agregar cliente/proveedor")
+            print("[7] Volver al menú principal")
             
             opcion = input("Selecciona una opción: ").strip()
             
@@ -341,7 +692,11 @@ class App:
                 archivos = self.gestor.listar_todos_archivos()
                 print(f"\nArchivos disponibles ({len(archivos)}):")
                 for i, archivo in enumerate(archivos, 1):
-                    print(f"{i}. {archivo}")
+                    info = self.gestor.info_archivo(archivo) or {}
+                    detalle = f"{info.get('tamano', 0)} bytes"
+                    if "lineas" in info:
+                        detalle += f", {info['lineas']} ventas, total ${info['total']:.2f}"
+                    print(f"{i}. {archivo} ({detalle})")
                     
             elif opcion == "2":
                 nombre = input("Nombre del archivo: ").strip()
@@ -389,10 +744,34 @@ class App:
                 try:
                     self.gestor.escribir_archivo_general(nombre, contenido, modo)
                     print("¡Contenido guardado exitosamente!")
-                except FileNotFoundError as e:
+                except (FileNotFoundError, ValueError) as e:
                     print(e)
+
+            elif opcion in ("5", "6"):
+                tipo = input("¿Clientes o proveedores? (c/p): ").strip().lower()
+                if tipo not in ("c", "p"):
+                    print("Opción no válida.")
+                    continue
+                directorio = self.gestor.clientes if tipo == "c" else self.gestor.proveedores
+                if opcion == "5":
+                    texto = input("Nombre o número a buscar: ").strip()
+                    inicio = time.perf_counter()
+                    encontrados = directorio.buscar(texto, limite=20)
+                    print(f"\n{len(encontrados)} resultado(s) entre {len(directorio)} contactos "
+                          f"({(time.perf_counter() - inicio) * 1000:.1f} ms):")
+                    for contacto in encontrados:
+                        print(f"  {contacto}")
+                else:
+                    nombre = input("Nombre: ").strip()
+                    telefono = input("Teléfono (opcional): ").strip()
+                    email = input("Email (opcional): ").strip()
+                    try:
+                        contacto = directorio.agregar(nombre, telefono, email)
+                        print(f"¡Contacto {contacto} agregado!")
+                    except ValueError as e:
+                        print(e)
                     
-            elif opcion == "5":
+            elif opcion == "7":
                 break
             else:
                 print("Opción no válida.")
@@ -426,15 +805,96 @@ class App:
             elif opcion == "3": self.crear_reporte_mensual()
             elif opcion == "4": self.gestionar_archivos()
             elif opcion == "5": self.cambiar_usuario()
+            elif opcion == "7": self.gestionar_inventario()
+            elif opcion == "8": self.ver_pronostico_demanda()
             elif opcion == "6":
                 print("Cerrando sistema. ¡Hasta luego!")
                 break
             else:
-                print("Opción no válida. Elige un número del 1 al 6.")
+                print("Opción no válida. Elige un número del 1 al 8.")
             
             input("\nPresiona Enter para volver al menú...")
 
 # --- Punto de Entrada de la Aplicación ---
+def main() -> None:
+    """Sin argumentos abre el punto de venta; los subcomandos no piden nada por teclado."""
+    parser = argparse.ArgumentParser(description="Sistema de Registro de Ventas v2.0")
+    subcomandos = parser.add_subparsers(dest="comando")
+
+    servidor = subcomandos.add_parser("servidor", help="recibe ventas de las cajas por TCP")
+    servidor.add_argument("--host", default=HOST_POS)
+    servidor.add_argument("--puerto", type=int, default=PUERTO_POS)
+
+    importar = subcomandos.add_parser("importar", help="carga ventas desde CSV o JSONL sin menús")
+    importar.add_argument("archivos", nargs="+", type=Path)
+    importar.add_argument("--formato", choices=["csv", "jsonl"],
+                          help="por defecto se deduce de la extensión")
+
+    subcomandos.add_parser("rollups", help="reconstruye los totales por día/producto/mes desde los reportes")
+
+    archivar = subcomandos.add_parser("archivar", help="comprime los reportes de meses cerrados")
+    archivar.add_argument("--hasta", metavar="AAAA-MM",
+                          help="archiva los meses anteriores a este (por defecto, el mes actual)")
+
+    almacen = subcomandos.add_parser("almacen", help="copia las ventas a SQLite y responde consultas")
+    almacen.add_argument("accion", choices=["sincronizar", *CONSULTAS],
+                         help="'sincronizar' o una consulta (antes de consultar se sincroniza)")
+    almacen.add_argument("--desde", default="0000-00-00", metavar="AAAA-MM-DD")
+    almacen.add_argument("--hasta", default="9999-99-99", metavar="AAAA-MM-DD")
+    almacen.add_argument("--limite", type=int, default=10, help="filas en productos y vendedores")
+
+    args = parser.parse_args()
+    # Sólo el programa configura el log de producción; quien carga este módulo
+    # (bench, pruebas, cargar_sistema_ventas) conserva su propio logging.
+    # Se escribe desde un hilo aparte y rota al llegar a 5 MB (respaldos en .gz)
+    LOG_DIR.mkdir(exist_ok=True)
+    configurar_logging(LOG_DIR / "sistema_ventas.log", comprimir=True)
+    if args.comando == "importar":
+        gestor = GestorArchivos(DATA_DIR)
+        for archivo in args.archivos:
+            try:
+                print(importar_ventas(gestor, archivo, args.formato))
+            except (FileNotFoundError, ValueError) as e:
+                print(e)
+    elif args.comando == "rollups":
+        gestor = GestorArchivos(DATA_DIR)
+        reportes = gestor.reconstruir_rollups()
+        print(f"Rollups reconstruidos para {len(reportes)} reportes.")
+    elif args.comando == "archivar":
+        gestor = GestorArchivos(DATA_DIR)
+        try:
+            hasta = datetime.strptime(args.hasta, "%Y-%m") if args.hasta else None
+            archivados = gestor.archivar_meses_cerrados((hasta.year, hasta.month) if hasta else None)
+        except ValueError as e:
+            print(e if str(e).startswith("ERROR") else "ERROR: Usa --hasta AAAA-MM (ej: 2025-09).")
+            return
+        for nombre_reporte, texto, comprimido in archivados:
+            print(f"{nombre_reporte}: {texto} -> {comprimido} bytes")
+        print(f"Reportes archivados: {len(archivados)}.")
+    elif args.comando == "almacen":
+        almacen_ventas = AlmacenVentas(DATA_DIR, DATA_DIR / "indices" / "almacen.sqlite")
+        try:
+            insertadas = almacen_ventas.sincronizar()
+            print(f"Almacén al día: {sum(insertadas.values())} ventas nuevas.")
+            if args.accion != "sincronizar":
+                titulo, columnas, filas = almacen_ventas.consultar(
+                    args.accion, args.desde, args.hasta, args.limite)
+                print(f"\n--- {titulo} ---")
+                print(formatear_tabla(columnas, filas) if filas else "(Sin ventas en ese rango)")
+        finally:
+            almacen_ventas.cerrar()
+    elif args.comando == "servidor":
+        gestor = GestorArchivos(DATA_DIR)
+        servidor_pos = ServidorPOS(gestor, Venta, Usuario, args.host, args.puerto)
+        print(f"Servidor POS en {args.host}:{args.puerto} (Ctrl+C para detener)")
+        try:
+            asyncio.run(servidor_pos.servir())
+        except KeyboardInterrupt:
+            print("Servidor detenido.")
+    else:
+        app = App()
+        app.run()
+
+
 if __name__ == "__main__":
-    app = App()
-    app.run()
+    main()
@@ -0,0 +1,26 @@
+"""
+Módulos de soporte del Sistema de Registro de Ventas
+(`proyecto final manager de tienda.py`).
+"""
+import importlib.util
+import sys
+from pathlib import Path
+
+PATH_SISTEMA_VENTAS = Path(__file__).parent.parent / "proyecto final manager de tienda.py"
+
+
+def cargar_sistema_ventas():
+    """
+    Importa el programa principal como módulo `sistema_ventas`.
+
+    Su nombre de archivo tiene espacios, así que no puede importarse con
+    `import`; los scripts de `tienda/` que necesitan `GestorArchivos` o
+    `Venta` lo cargan con esta función.
+    """
+    if "sistema_ventas" in sys.modules:
+        return sys.modules["sistema_ventas"]
+    spec = importlib.util.spec_from_file_location("sistema_ventas", PATH_SISTEMA_VENTAS)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules["sistema_ventas"] = modulo
+    spec.loader.exec_module(modulo)
+    return modulo
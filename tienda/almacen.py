@@ -0,0 +1,189 @@
+"""
+Almacén SQLite con las ventas de los reportes, para consultas ad hoc.
+
+Copia las líneas de `data/ventas_*.txt` (y de sus segmentos y archivados)
+a `data/indices/almacen.sqlite`:
+
+    ventas  (reporte, fecha, vendedor, producto, cantidad,
+             precio_centavos, subtotal_centavos)   índices por fecha, producto y vendedor
+    partes  (parte, reporte, offset)               hasta dónde se copió cada parte
+
+La sincronización es incremental: de cada parte sólo se leen las líneas
+completas agregadas después de su `offset`, y se insertan con
+`executemany` en una transacción por reporte junto con el nuevo offset
+(si se corta a la mitad, no queda nada a medias). Si una parte se achicó
+o desapareció (edición a mano, reporte archivado) se vuelven a copiar las
+ventas de ese reporte desde cero.
+
+Uso:
+    python "proyecto final manager de tienda.py" almacen sincronizar
+    python "proyecto final manager de tienda.py" almacen meses|dias|productos|vendedores
+                                                 [--desde AAAA-MM-DD] [--hasta AAAA-MM-DD] [--limite N]
+"""
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .bloques_gzip import abrir_binario
+from .formato import parsear_linea
+from .segmentos import nombres_reportes, solo_crecieron, tamanos_partes
+
+TAMANO_LOTE = 10_000
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS ventas (
+    id INTEGER PRIMARY KEY,
+    reporte TEXT NOT NULL,
+    fecha TEXT NOT NULL,
+    vendedor TEXT NOT NULL,
+    producto TEXT NOT NULL,
+    cantidad REAL NOT NULL,
+    precio_centavos INTEGER NOT NULL,
+    subtotal_centavos INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ventas_fecha ON ventas (fecha);
+CREATE INDEX IF NOT EXISTS ventas_producto ON ventas (producto, fecha);
+CREATE INDEX IF NOT EXISTS ventas_vendedor ON ventas (vendedor, fecha);
+CREATE INDEX IF NOT EXISTS ventas_reporte ON ventas (reporte);
+CREATE TABLE IF NOT EXISTS partes (
+    parte TEXT PRIMARY KEY,
+    reporte TEXT NOT NULL,
+    offset INTEGER NOT NULL
+);
+"""
+
+# Consultas frecuentes: (título, columnas, SQL). El SQL recibe :desde, :hasta y :limite.
+CONSULTAS: Dict[str, Tuple[str, Sequence[str], str]] = {
+    "meses": ("Ingresos por mes", ("mes", "ventas", "total"), """
+        SELECT substr(fecha, 1, 7), COUNT(*), SUM(subtotal_centavos) / 100.0
+        FROM ventas WHERE fecha BETWEEN :desde AND :hasta
+        GROUP BY 1 ORDER BY 1"""),
+    "dias": ("Ingresos por día", ("fecha", "ventas", "total"), """
+        SELECT fecha, COUNT(*), SUM(subtotal_centavos) / 100.0
+        FROM ventas WHERE fecha BETWEEN :desde AND :hasta
+        GROUP BY fecha ORDER BY fecha"""),
+    "productos": ("Productos más vendidos", ("producto", "cantidad", "total"), """
+        SELECT producto, SUM(cantidad), SUM(subtotal_centavos) / 100.0
+        FROM ventas WHERE fecha BETWEEN :desde AND :hasta
+        GROUP BY producto ORDER BY 3 DESC LIMIT :limite"""),
+    "vendedores": ("Ventas por vendedor", ("vendedor", "ventas", "total"), """
+        SELECT vendedor, COUNT(*), SUM(subtotal_centavos) / 100.0
+        FROM ventas WHERE fecha BETWEEN :desde AND :hasta
+        GROUP BY vendedor ORDER BY 3 DESC LIMIT :limite"""),
+}
+
+
+class AlmacenVentas:
+    """Réplica incremental de los reportes de ventas en SQLite."""
+    def __init__(self, base_dir: Path, path_db: Path) -> None:
+        self.base_dir = base_dir
+        self.path_db = path_db
+        self._conexion: Optional[sqlite3.Connection] = None
+
+    def conexion(self) -> sqlite3.Connection:
+        if self._conexion is None:
+            self.path_db.parent.mkdir(parents=True, exist_ok=True)
+            self._conexion = sqlite3.connect(self.path_db, timeout=30)
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.executescript(ESQUEMA)
+        return self._conexion
+
+    def cerrar(self) -> None:
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+    # --- Sincronización ---
+    def _lineas_completas(self, parte: str, desde: int) -> Iterator[Tuple[str, int]]:
+        """(línea, offset final) de cada línea terminada a partir de `desde`."""
+        with abrir_binario(self.base_dir / parte) as f:
+            f.seek(desde)
+            offset = desde
+            for linea_bytes in f:
+                if not linea_bytes.endswith(b"\n"):
+                    break  # Línea a medio escribir; se copiará en otra sincronización
+                offset += len(linea_bytes)
+                yield linea_bytes.decode("utf-8", errors="replace"), offset
+
+    def _sincronizar_reporte(self, nombre_reporte: str) -> int:
+        conexion = self.conexion()
+        copiadas = dict(conexion.execute(
+            "SELECT parte, offset FROM partes WHERE reporte = ?", (nombre_reporte,)))
+        partes = tamanos_partes(self.base_dir, nombre_reporte)
+        insertadas = 0
+        with conexion:  # Una transacción por reporte
+            if not solo_crecieron(copiadas, partes):
+                logging.warning(f"Almacén: se vuelve a copiar {nombre_reporte}")
+                conexion.execute("DELETE FROM ventas WHERE reporte = ?", (nombre_reporte,))
+                conexion.execute("DELETE FROM partes WHERE reporte = ?", (nombre_reporte,))
+                copiadas = {}
+            for parte, tamano in partes.items():
+                desde = copiadas.get(parte, 0)
+                if tamano <= desde:
+                    continue
+                filas = []
+                hasta = desde
+                for linea, hasta in self._lineas_completas(parte, desde):
+                    venta = parsear_linea(linea)
+                    if venta is None:
+                        continue
+                    filas.append((nombre_reporte, venta.fecha, venta.vendedor, venta.producto,
+                                  venta.cantidad, round(venta.precio * 100), round(venta.subtotal * 100)))
+                    if len(filas) >= TAMANO_LOTE:
+                        self._insertar(filas)
+                        insertadas += len(filas)
+                        filas = []
+                self._insertar(filas)
+                insertadas += len(filas)
+                conexion.execute(
+                    "INSERT OR REPLACE INTO partes (parte, reporte, offset) VALUES (?, ?, ?)",
+                    (parte, nombre_reporte, hasta))
+        return insertadas
+
+    def _insertar(self, filas: List[tuple]) -> None:
+        if filas:
+            self.conexion().executemany(
+                "INSERT INTO ventas (reporte, fecha, vendedor, producto, cantidad, "
+                "precio_centavos, subtotal_centavos) VALUES (?, ?, ?, ?, ?, ?, ?)", filas)
+
+    def sincronizar(self) -> Dict[str, int]:
+        """Copia lo nuevo de todos los reportes; devuelve las ventas insertadas por reporte."""
+        inicio = time.perf_counter()
+        reportes = nombres_reportes(self.base_dir)
+        conexion = self.conexion()
+        with conexion:
+            # Reportes que ya no existen en disco
+            for (nombre,) in conexion.execute("SELECT DISTINCT reporte FROM partes").fetchall():
+                if nombre not in reportes:
+                    conexion.execute("DELETE FROM ventas WHERE reporte = ?", (nombre,))
+                    conexion.execute("DELETE FROM partes WHERE reporte = ?", (nombre,))
+        insertadas = {nombre: self._sincronizar_reporte(nombre) for nombre in reportes}
+        logging.info(f"Almacén sincronizado: {sum(insertadas.values())} ventas nuevas "
+                     f"en {time.perf_counter() - inicio:.2f} s")
+        return insertadas
+
+    # --- Consultas ---
+    def consultar(self, consulta: str, desde: str = "0000-00-00", hasta: str = "9999-99-99",
+                  limite: int = 10) -> Tuple[str, Sequence[str], List[tuple]]:
+        """Ejecuta una de las CONSULTAS; devuelve (título, columnas, filas)."""
+        if consulta not in CONSULTAS:
+            raise ValueError(f"ERROR: Consulta desconocida '{consulta}'. "
+                             f"Opciones: {', '.join(CONSULTAS)}.")
+        titulo, columnas, sql = CONSULTAS[consulta]
+        filas = self.conexion().execute(sql, {"desde": desde, "hasta": hasta, "limite": limite}).fetchall()
+        return titulo, columnas, filas
+
+
+def formatear_tabla(columnas: Sequence[str], filas: List[tuple]) -> str:
+    """Tabla de texto alineada para imprimir en consola."""
+    textos = [[f"{v:,.2f}" if isinstance(v, float) else str(v) for v in fila] for fila in filas]
+    anchos = [max([len(c)] + [len(fila[i]) for fila in textos]) for i, c in enumerate(columnas)]
+    lineas = ["  ".join(c.ljust(a) for c, a in zip(columnas, anchos)),
+              "  ".join("-" * a for a in anchos)]
+    for fila in textos:
+        lineas.append("  ".join(v.ljust(a) if i == 0 else v.rjust(a)
+                                for i, (v, a) in enumerate(zip(fila, anchos))))
+    return "\n".join(lineas)
@@ -0,0 +1,225 @@
+"""
+Análisis incremental de los logs de `logs/`.
+
+Lee `app.log` y `sistema_ventas.log` desde el último byte procesado
+(guardado en `logs/analisis_estado.json`), así cada ejecución sólo cuesta
+lo nuevo. Mantiene estas métricas:
+
+    ventas por vendedor y por hora   ("Venta registrada en ... (vendedor: X)";
+                                       las líneas viejas sin vendedor se
+                                       atribuyen al último "Vendedor activo")
+    operaciones por archivo          (lecturas, escrituras y creaciones)
+    tasa de advertencias             (líneas mal formadas por lectura de reporte)
+
+Si un log fue rotado (su primera línea ya no es la recordada o es más
+corto que el offset), se termina de leer el respaldo `.1` / `.1.gz` antes
+de empezar con el archivo nuevo.
+
+Uso:
+    python -m tienda.analisis_logs [--reiniciar] [--ventana-dias N]
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+LOG_DIR = Path(__file__).parent.parent / "logs"
+ARCHIVOS_LOG = ("app.log", "sistema_ventas.log")
+VENTANA_DIAS = 30
+
+PATRON_REGISTRO = re.compile(
+    r"^(\d{4}-\d{2}-\d{2} \d{2}):\d{2}:\d{2},\d{3} \[(\w+)\] (?:- )?(.*)$")
+PATRON_MAL_FORMADA = re.compile(r"^Línea (?:\d+ )?mal formada en '([^']*)'")
+PATRON_VENTA = re.compile(r"^Venta registrada en: (.*?)(?: \(vendedor: (.*)\))?$")
+
+OPERACIONES = (
+    ("Lectura OK de: ", "lectura"),
+    ("Reporte leído: ", "lectura"),
+    ("Consulta por rango en: ", "lectura"),
+    ("Venta registrada en: ", "escritura"),
+    ("Contenido agregado en: ", "escritura"),
+    ("Contenido escrito en: ", "escritura"),
+    ("Archivo creado: ", "creacion"),
+    ("Archivo personalizado creado: ", "creacion"),
+    ("Reporte mensual creado: ", "creacion"),
+)
+
+
+def _nombre_archivo(ruta: str) -> str:
+    """Nombre base de una ruta, sea de Windows o de Linux."""
+    return re.split(r"[\\/]", ruta.strip())[-1]
+
+
+def _primera_linea(path: Path) -> str:
+    """Huella del archivo: su primera línea completa ('' si aún no hay)."""
+    abrir = gzip.open if path.suffix == ".gz" else open
+    try:
+        with abrir(path, "rb") as f:
+            linea = f.readline(512)
+    except (FileNotFoundError, OSError, EOFError):
+        return ""
+    return linea.decode("utf-8", errors="replace") if linea.endswith(b"\n") else ""
+
+
+class AnalizadorLogs:
+    """Métricas acumuladas de los logs, procesando sólo los bytes nuevos."""
+    def __init__(self, log_dir: Path = LOG_DIR, ventana_dias: int = VENTANA_DIAS) -> None:
+        self.log_dir = log_dir
+        self.path_estado = log_dir / "analisis_estado.json"
+        self.ventana_dias = ventana_dias
+        self.estado = self._estado_vacio()
+        if self.path_estado.exists():
+            try:
+                self.estado = json.loads(self.path_estado.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                pass
+
+    @staticmethod
+    def _estado_vacio() -> dict:
+        return {
+            "archivos": {},
+            "ventas_por_vendedor_hora": {},
+            "operaciones_por_archivo": {},
+            "lecturas_reporte": 0,
+            "lineas_mal_formadas": {},
+        }
+
+    def guardar(self) -> None:
+        temporal = self.path_estado.with_suffix(".tmp")
+        temporal.write_text(json.dumps(self.estado, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(temporal, self.path_estado)
+
+    # --- Lectura incremental ---
+    def actualizar(self) -> int:
+        """Procesa lo agregado a cada log desde la última vez; devuelve los bytes leídos."""
+        leidos = 0
+        for nombre in ARCHIVOS_LOG:
+            path = self.log_dir / nombre
+            if not path.exists():
+                continue
+            seguimiento = self.estado["archivos"].setdefault(
+                nombre, {"offset": 0, "huella": "", "vendedor": None})
+            huella = _primera_linea(path)
+            rotado = seguimiento["huella"] and (
+                huella != seguimiento["huella"] or path.stat().st_size < seguimiento["offset"])
+            if rotado:
+                respaldo = self._buscar_respaldo(path, seguimiento["huella"])
+                if respaldo is not None:
+                    leidos += self._procesar(respaldo, seguimiento)
+                seguimiento["offset"] = 0
+            seguimiento["huella"] = huella
+            leidos += self._procesar(path, seguimiento)
+        self._recortar_ventana()
+        self.guardar()
+        return leidos
+
+    @staticmethod
+    def _buscar_respaldo(path: Path, huella: str) -> Optional[Path]:
+        """El archivo rotado que empieza con la huella recordada, si existe."""
+        for candidato in sorted(path.parent.glob(path.name + ".*")):
+            if _primera_linea(candidato) == huella:
+                return candidato
+        return None
+
+    def _procesar(self, path: Path, seguimiento: dict) -> int:
+        abrir = gzip.open if path.suffix == ".gz" else open
+        with abrir(path, "rb") as f:
+            f.seek(seguimiento["offset"])
+            leidos = self._procesar_flujo(f, seguimiento)
+        seguimiento["offset"] += leidos
+        return leidos
+
+    def _procesar_flujo(self, f: BinaryIO, seguimiento: dict) -> int:
+        leidos = 0
+        for linea_bytes in f:
+            if not linea_bytes.endswith(b"\n"):
+                break  # Registro a medio escribir: se leerá la próxima vez
+            leidos += len(linea_bytes)
+            coincidencia = PATRON_REGISTRO.match(linea_bytes.decode("utf-8", errors="replace").rstrip("\r\n"))
+            if coincidencia:
+                self._registrar(seguimiento, *coincidencia.groups())
+        return leidos
+
+    # --- Métricas ---
+    def _registrar(self, seguimiento: dict, hora: str, nivel: str, mensaje: str) -> None:
+        for prefijo in ("Usuario activo: ", "Vendedor activo: "):
+            if mensaje.startswith(prefijo):
+                seguimiento["vendedor"] = mensaje[len(prefijo):].strip()
+                return
+
+        for prefijo, operacion in OPERACIONES:
+            if mensaje.startswith(prefijo):
+                venta = PATRON_VENTA.match(mensaje) if prefijo == "Venta registrada en: " else None
+                archivo = _nombre_archivo(venta.group(1) if venta else mensaje[len(prefijo):])
+                ops = self.estado["operaciones_por_archivo"].setdefault(archivo, {})
+                ops[operacion] = ops.get(operacion, 0) + 1
+                if venta:
+                    # Servidor, importación y varias terminales escriben en el mismo log:
+                    # el vendedor viene en la línea de la venta
+                    vendedor = venta.group(2) or seguimiento["vendedor"] or "(desconocido)"
+                    horas = self.estado["ventas_por_vendedor_hora"].setdefault(vendedor, {})
+                    horas[hora] = horas.get(hora, 0) + 1
+                elif prefijo in ("Reporte leído: ", "Consulta por rango en: "):
+                    self.estado["lecturas_reporte"] += 1
+                return
+
+        if nivel == "WARNING":
+            coincidencia = PATRON_MAL_FORMADA.match(mensaje)
+            if coincidencia:
+                malas = self.estado["lineas_mal_formadas"]
+                malas[coincidencia.group(1)] = malas.get(coincidencia.group(1), 0) + 1
+
+    def _recortar_ventana(self) -> None:
+        """Descarta las horas de ventas más antiguas que la ventana."""
+        horas = [h for por_hora in self.estado["ventas_por_vendedor_hora"].values() for h in por_hora]
+        if not horas or not self.ventana_dias:
+            return
+        limite = (datetime.strptime(max(horas), "%Y-%m-%d %H")
+                  - timedelta(days=self.ventana_dias)).strftime("%Y-%m-%d %H")
+        for por_hora in self.estado["ventas_por_vendedor_hora"].values():
+            for hora in [h for h in por_hora if h < limite]:
+                del por_hora[hora]
+
+    def tasa_advertencias(self) -> float:
+        """Líneas mal formadas por cada lectura de reporte."""
+        lecturas = self.estado["lecturas_reporte"]
+        return sum(self.estado["lineas_mal_formadas"].values()) / lecturas if lecturas else 0.0
+
+    def resumen(self) -> str:
+        lineas = ["--- Ventas por vendedor y hora ---"]
+        for vendedor, por_hora in sorted(self.estado["ventas_por_vendedor_hora"].items()):
+            for hora, cantidad in sorted(por_hora.items()):
+                lineas.append(f"{vendedor} | {hora}h | {cantidad} ventas")
+        lineas.append("--- Operaciones por archivo ---")
+        for archivo, ops in sorted(self.estado["operaciones_por_archivo"].items()):
+            detalle = ", ".join(f"{op}: {n}" for op, n in sorted(ops.items()))
+            lineas.append(f"{archivo} | {detalle}")
+        lineas.append("--- Advertencias ---")
+        for archivo, cantidad in sorted(self.estado["lineas_mal_formadas"].items()):
+            lineas.append(f"{archivo} | {cantidad} líneas mal formadas")
+        lineas.append(f"Tasa: {self.tasa_advertencias():.2f} líneas mal formadas por lectura "
+                      f"({self.estado['lecturas_reporte']} lecturas de reporte)")
+        return "\n".join(lineas)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Analiza los logs del sistema de ventas.")
+    parser.add_argument("--reiniciar", action="store_true", help="olvida los offsets y relee todo")
+    parser.add_argument("--ventana-dias", type=int, default=VENTANA_DIAS,
+                        help="días de ventas por hora que se conservan (0 = todos)")
+    args = parser.parse_args()
+
+    analizador = AnalizadorLogs(ventana_dias=args.ventana_dias)
+    if args.reiniciar:
+        analizador.estado = analizador._estado_vacio()
+    leidos = analizador.actualizar()
+    print(analizador.resumen())
+    print(f"\n({leidos} bytes nuevos procesados)")
+
+
+if __name__ == "__main__":
+    main()
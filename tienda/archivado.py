@@ -0,0 +1,85 @@
+"""
+Archivado (compresión) de los reportes de meses cerrados.
+
+Un reporte `ventas_AAAA-MM.txt` no vuelve a modificarse cuando termina su
+mes. `archivar_reporte` ordena por fecha las líneas de su archivo base y
+de los segmentos de cada terminal (con `ordenar_lineas`, igual que la
+vista consolidada, así archivar no cambia lo que se ve) y las guarda como
+`ventas_AAAA-MM.txt.gz`
+por bloques (ver `bloques_gzip.py`); después borra el `.txt` y los
+segmentos. Los lectores lo siguen abriendo por su nombre `.txt`.
+
+Un reporte archivado no admite ventas nuevas. Mientras se comprime se
+tiene el bloqueo del reporte (`segmentos.bloqueo_reporte`), así ninguna
+terminal escribe en él; si igual alguna parte cambia (p. ej. se editó a
+mano), el archivado se cancela y el reporte queda como estaba.
+
+Uso:
+    python "proyecto final manager de tienda.py" archivar [--hasta AAAA-MM]
+"""
+import logging
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from .bloques_gzip import EXTENSION, escribir_bloques
+from .segmentos import bloqueo_reporte, ordenar_lineas, partes_reporte, tamanos_partes
+
+PATRON_MES = re.compile(r"^ventas_(\d{4})-(\d{2})\.txt$")
+
+
+def mes_de_reporte(nombre_reporte: str) -> Optional[Tuple[int, int]]:
+    coincidencia = PATRON_MES.match(nombre_reporte)
+    return (int(coincidencia.group(1)), int(coincidencia.group(2))) if coincidencia else None
+
+
+def reportes_cerrados(base_dir: Path, hasta: Optional[Tuple[int, int]] = None) -> List[str]:
+    """Reportes `.txt` de meses anteriores a `hasta` (por defecto, el mes actual)."""
+    if hasta is None:
+        hoy = date.today()
+        hasta = (hoy.year, hoy.month)
+    return sorted(path.name for path in base_dir.glob("ventas_*.txt")
+                  if (mes_de_reporte(path.name) or hasta) < hasta)
+
+
+def _lineas(path: Path) -> Iterator[str]:
+    # newline="" conserva el fin de línea original de cada venta
+    with path.open(encoding="utf-8", errors="surrogateescape", newline="") as f:
+        for linea in f:
+            yield linea if linea.endswith("\n") else linea + os.linesep
+
+
+def archivar_reporte(base_dir: Path, nombre_reporte: str) -> Tuple[int, int]:
+    """Comprime un reporte y sus segmentos; devuelve (bytes de texto, bytes comprimidos)."""
+    with bloqueo_reporte(base_dir, nombre_reporte):
+        # Con el bloqueo tomado ninguna terminal agrega ventas ni recrea partes
+        path_reporte = base_dir / nombre_reporte
+        if not path_reporte.exists():
+            raise FileNotFoundError(f"ERROR: El reporte '{nombre_reporte}' no existe o ya está archivado.")
+
+        partes = partes_reporte(base_dir, nombre_reporte)
+        tamanos = tamanos_partes(base_dir, nombre_reporte)
+        destino = base_dir / (nombre_reporte + EXTENSION)
+        temporal = destino.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            lineas = ordenar_lineas(_lineas(parte) for parte in partes)
+            texto, comprimido = escribir_bloques(
+                (linea.encode("utf-8", errors="surrogateescape") for linea in lineas), temporal)
+            if tamanos_partes(base_dir, nombre_reporte) != tamanos:
+                raise ValueError(f"ERROR: El reporte '{nombre_reporte}' cambió mientras se archivaba; "
+                                 "vuelve a intentarlo.")
+            os.replace(temporal, destino)
+        finally:
+            temporal.unlink(missing_ok=True)
+
+        for parte in partes:
+            parte.unlink()
+        if len(partes) > 1:
+            try:
+                partes[1].parent.rmdir()
+            except OSError:
+                pass  # Quedan otros archivos en la carpeta de segmentos
+    logging.info(f"Reporte archivado: {nombre_reporte} ({texto} -> {comprimido} bytes)")
+    return texto, comprimido
@@ -0,0 +1,77 @@
+"""
+Mide cuántas ventas por segundo registra GestorArchivos según el logging.
+
+Compara tres modos sobre una carpeta temporal:
+    sin logging   logging desactivado
+    síncrono      FileHandler en el hilo que vende (el antiguo basicConfig)
+    en cola       QueueHandler + hilo escritor (configurar_logging)
+
+Uso:
+    python -m tienda.bench_logging [cantidad_ventas]
+"""
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Tuple
+
+from tienda import cargar_sistema_ventas
+from tienda.registro import FORMATO, configurar_logging, detener_logging
+
+
+def medir(sistema, base_dir: Path, cantidad: int) -> Tuple[float, float]:
+    """Registra `cantidad` ventas; devuelve ventas por segundo y latencia p99 en ms."""
+    gestor = sistema.GestorArchivos(base_dir)
+    path_reporte = gestor.crear_reporte_mensual(2025, 1)
+    usuario = sistema.Usuario("bench")
+    latencias = []
+    inicio = time.perf_counter()
+    for i in range(cantidad):
+        venta = sistema.Venta(f"producto {i % 50}", 1 + i % 3, 9.99, usuario)
+        t0 = time.perf_counter()
+        gestor.registrar_venta(path_reporte.name, venta, (1 + i % 28, 1, 2025))
+        latencias.append(time.perf_counter() - t0)
+    total = time.perf_counter() - inicio
+    latencias.sort()
+    return cantidad / total, latencias[int(len(latencias) * 0.99)] * 1000
+
+
+def main() -> None:
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    sistema = cargar_sistema_ventas()
+    raiz = logging.getLogger()
+    resultados = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        detener_logging()
+        logging.disable(logging.CRITICAL)
+        (tmp / "sin").mkdir()
+        resultados["sin logging"] = medir(sistema, tmp / "sin", cantidad)
+        logging.disable(logging.NOTSET)
+
+        for handler in raiz.handlers[:]:
+            raiz.removeHandler(handler)
+        handler = logging.FileHandler(tmp / "sincrono.log", encoding="utf-8")
+        handler.setFormatter(logging.Formatter(FORMATO))
+        raiz.addHandler(handler)
+        raiz.setLevel(logging.INFO)
+        (tmp / "sincrono").mkdir()
+        resultados["síncrono"] = medir(sistema, tmp / "sincrono", cantidad)
+        raiz.removeHandler(handler)
+        handler.close()
+
+        configurar_logging(tmp / "cola.log", comprimir=True)
+        (tmp / "cola").mkdir()
+        resultados["en cola"] = medir(sistema, tmp / "cola", cantidad)
+        detener_logging()
+
+    print(f"Ventas registradas por modo: {cantidad}")
+    for modo, (ventas_seg, p99_ms) in resultados.items():
+        print(f"  {modo:<12} {ventas_seg:10.0f} ventas/s   p99 {p99_ms:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
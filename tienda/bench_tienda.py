@@ -0,0 +1,254 @@
+"""
+Benchmarks de GestorArchivos y del flujo de ventas.
+
+Genera reportes sintéticos (con una fracción configurable de líneas mal
+formadas) en una carpeta temporal y mide, llamando directamente al gestor
+sin menús ni pantalla y con el logging desactivado:
+
+    registrar_venta     ventas/s y latencia p50/p99
+    leer_reporte        latencia por tamaño de reporte (y la del resumen por rollups)
+    listar_reportes     con miles de reportes (manifiesto frío, caliente y tras un cambio)
+    agregación anual    total de 12 meses leyendo líneas, con rollups y con SalesBatch
+
+Los resultados se guardan en JSON. Con --comparar se contrastan con una
+ejecución anterior y se marca como regresión toda métrica que empeore más
+que la tolerancia (el proceso termina con código 1).
+
+Uso:
+    python -m tienda.bench_tienda [--lineas 10000,100000,1000000] [--mal-formadas 0.01]
+                                  [--salida bench.json] [--comparar base.json]
+"""
+import argparse
+import calendar
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from tienda import cargar_sistema_ventas
+from tienda.registro import detener_logging
+
+PRODUCTOS = [f"producto {i}" for i in range(200)]
+VENDEDORES = [f"cajero{i}" for i in range(20)]
+LINEAS_MAL_FORMADAS = ["[2025-13-45]: sin datos", "línea sin fecha", "[2025-01-01]: a,b,c,x,y"]
+
+
+# --- Datos sintéticos ---
+def generar_reporte(path: Path, lineas: int, anio: int, mes: int,
+                    fraccion_mal: float = 0.0, semilla: int = 0) -> None:
+    """Escribe un reporte con `lineas` ventas en orden de fecha."""
+    azar = random.Random(semilla)
+    dias = calendar.monthrange(anio, mes)[1]
+    with path.open("w", encoding="utf-8") as f:
+        bloque = []
+        for i in range(lineas):
+            if azar.random() < fraccion_mal:
+                bloque.append(azar.choice(LINEAS_MAL_FORMADAS) + "\n")
+            else:
+                cantidad = azar.randint(1, 5)
+                precio = azar.randint(100, 50_000) / 100
+                bloque.append(f"[{anio:04d}-{mes:02d}-{1 + i * dias // lineas:02d}]: "
+                              f"{azar.choice(VENDEDORES)},{azar.choice(PRODUCTOS)},"
+                              f"{cantidad},{precio:.2f},{cantidad * precio:.2f}\n")
+            if len(bloque) >= 100_000:
+                f.writelines(bloque)
+                bloque.clear()
+        f.writelines(bloque)
+
+
+# --- Medición ---
+def cronometrar(funcion: Callable[[], object], repeticiones: int) -> List[float]:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def percentil(valores: List[float], p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+class Resultados:
+    """Métricas con su unidad y si un valor mayor es mejor."""
+    def __init__(self) -> None:
+        self.metricas: Dict[str, dict] = {}
+
+    def agregar(self, nombre: str, valor: float, unidad: str, mayor_es_mejor: bool = False) -> None:
+        self.metricas[nombre] = {"valor": valor, "unidad": unidad, "mayor_es_mejor": mayor_es_mejor}
+        print(f"  {nombre:<45} {valor:>14.4f} {unidad}")
+
+
+def bench_registrar(sistema, base_dir: Path, ventas: int, resultados: Resultados) -> None:
+    print(f"registrar_venta ({ventas} ventas)")
+    gestor = sistema.GestorArchivos(base_dir)
+    nombre = gestor.crear_reporte_mensual(2030, 1).name
+    usuario = sistema.Usuario("bench")
+    latencias = []
+    inicio = time.perf_counter()
+    for i in range(ventas):
+        venta = sistema.Venta(PRODUCTOS[i % len(PRODUCTOS)], 1 + i % 3, 9.99, usuario)
+        t0 = time.perf_counter()
+        gestor.registrar_venta(nombre, venta, (1 + i * 31 // ventas, 1, 2030))
+        latencias.append(time.perf_counter() - t0)
+    duracion = time.perf_counter() - inicio
+    resultados.agregar("registrar_venta.ventas_por_s", ventas / duracion, "ventas/s", True)
+    resultados.agregar("registrar_venta.p50_ms", percentil(latencias, 0.50) * 1000, "ms")
+    resultados.agregar("registrar_venta.p99_ms", percentil(latencias, 0.99) * 1000, "ms")
+
+
+def bench_leer(sistema, base_dir: Path, tamanos: List[int], fraccion_mal: float,
+               repeticiones: int, resultados: Resultados) -> None:
+    for lineas in tamanos:
+        print(f"leer_reporte ({lineas} líneas)")
+        directorio = base_dir / f"leer_{lineas}"
+        directorio.mkdir()
+        generar_reporte(directorio / "ventas_2030-02.txt", lineas, 2030, 2, fraccion_mal, semilla=lineas)
+        gestor = sistema.GestorArchivos(directorio)
+        nombre = "ventas_2030-02.txt"
+        resultados.agregar(f"leer_reporte.{lineas}.frio_s",
+                           cronometrar(lambda: gestor.leer_reporte(nombre), 1)[0], "s")
+        resultados.agregar(f"leer_reporte.{lineas}.mediana_s",
+                           statistics.median(cronometrar(lambda: gestor.leer_reporte(nombre), repeticiones)), "s")
+        resultados.agregar(f"resumen_reporte.{lineas}.frio_s",
+                           cronometrar(lambda: gestor.resumen_reporte(nombre), 1)[0], "s")
+        resultados.agregar(f"resumen_reporte.{lineas}.mediana_s",
+                           statistics.median(cronometrar(lambda: gestor.resumen_reporte(nombre), repeticiones)), "s")
+
+
+def bench_listar(sistema, base_dir: Path, reportes: int, repeticiones: int,
+                 resultados: Resultados) -> None:
+    print(f"listar_reportes ({reportes} reportes)")
+    directorio = base_dir / "listar"
+    directorio.mkdir()
+    for i in range(reportes):
+        (directorio / f"ventas_{2000 + i // 12:04d}-{1 + i % 12:02d}.txt").write_text(
+            f"[2030-01-01]: bench,producto {i},1,1.00,1.00\n", encoding="utf-8")
+    gestor = sistema.GestorArchivos(directorio)
+    resultados.agregar(f"listar_reportes.{reportes}.frio_s",
+                       cronometrar(gestor.listar_reportes, 1)[0], "s")
+    resultados.agregar(f"listar_reportes.{reportes}.mediana_s",
+                       statistics.median(cronometrar(gestor.listar_reportes, repeticiones)), "s")
+    # Un archivo nuevo cambia el mtime de la carpeta y obliga a reconciliar
+    (directorio / "cambio.txt").write_text("x\n", encoding="utf-8")
+    resultados.agregar(f"listar_reportes.{reportes}.tras_cambio_s",
+                       cronometrar(gestor.listar_reportes, 1)[0], "s")
+
+
+def bench_anual(sistema, base_dir: Path, lineas_anio: int, fraccion_mal: float,
+                repeticiones: int, resultados: Resultados) -> None:
+    print(f"agregación anual ({lineas_anio} líneas en 12 reportes)")
+    directorio = base_dir / "anual"
+    directorio.mkdir()
+    nombres = []
+    for mes in range(1, 13):
+        nombre = f"ventas_2029-{mes:02d}.txt"
+        generar_reporte(directorio / nombre, lineas_anio // 12, 2029, mes, fraccion_mal, semilla=mes)
+        nombres.append(nombre)
+    gestor = sistema.GestorArchivos(directorio)
+
+    def leyendo_lineas() -> float:
+        return sum(gestor.leer_reporte(nombre)[1] for nombre in nombres)
+
+    def con_rollups() -> float:
+        return sum(gestor.rollups.mensual(nombre)[1] for nombre in nombres)
+
+    resultados.agregar(f"anual.{lineas_anio}.leyendo_lineas_s",
+                       statistics.median(cronometrar(leyendo_lineas, repeticiones)), "s")
+    resultados.agregar(f"anual.{lineas_anio}.rollups_frio_s", cronometrar(con_rollups, 1)[0], "s")
+    resultados.agregar(f"anual.{lineas_anio}.rollups_s", statistics.median(cronometrar(con_rollups, repeticiones)), "s")
+    try:
+        from tienda.lote_ventas import SalesBatch
+    except ImportError:
+        print("  (numpy no está instalado: se omite SalesBatch)")
+        return
+
+    def con_lotes() -> None:
+        SalesBatch.desde_reportes([directorio / nombre for nombre in nombres]).por_producto()
+    resultados.agregar(f"anual.{lineas_anio}.salesbatch_s", statistics.median(cronometrar(con_lotes, repeticiones)), "s")
+
+
+# --- Comparación ---
+def comparar(actual: Dict[str, dict], base: Dict[str, dict], tolerancia: float) -> List[str]:
+    """Imprime la variación de cada métrica común; devuelve las que empeoraron."""
+    regresiones = []
+    print(f"\nComparación con la base (tolerancia {tolerancia:.0%}):")
+    for nombre in sorted(set(actual) & set(base)):
+        nuevo, viejo = actual[nombre]["valor"], base[nombre]["valor"]
+        if not viejo:
+            continue
+        cambio = (nuevo - viejo) / viejo
+        empeora = -cambio if actual[nombre]["mayor_es_mejor"] else cambio
+        marca = "REGRESIÓN" if empeora > tolerancia else ("mejora" if empeora < -tolerancia else "")
+        print(f"  {nombre:<45} {viejo:>12.4f} -> {nuevo:>12.4f} ({cambio:+.1%}) {marca}")
+        if empeora > tolerancia:
+            regresiones.append(nombre)
+    for nombre in sorted(set(base) - set(actual)):
+        print(f"  {nombre:<45} (sin medir en esta ejecución)")
+    return regresiones
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks del sistema de ventas")
+    parser.add_argument("--lineas", default="10000,100000",
+                        help="tamaños de reporte para leer_reporte, separados por comas (hasta 10000000)")
+    parser.add_argument("--mal-formadas", type=float, default=0.01,
+                        help="fracción de líneas mal formadas en los reportes generados")
+    parser.add_argument("--ventas", type=int, default=5000, help="ventas para medir registrar_venta")
+    parser.add_argument("--reportes", type=int, default=2000, help="reportes para medir listar_reportes")
+    parser.add_argument("--lineas-anio", type=int, default=120_000, help="ventas del año agregado")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--salida", type=Path, help="archivo JSON con los resultados")
+    parser.add_argument("--comparar", type=Path, help="JSON de una ejecución anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="empeoramiento relativo permitido antes de marcar regresión")
+    args = parser.parse_args(argv)
+    tamanos = [int(n) for n in args.lineas.split(",") if n.strip()]
+
+    sistema = cargar_sistema_ventas()
+    detener_logging()
+    logging.disable(logging.CRITICAL)
+    resultados = Resultados()
+    with tempfile.TemporaryDirectory(prefix="bench_tienda_") as tmp:
+        tmp = Path(tmp)
+        (tmp / "registrar").mkdir()
+        bench_registrar(sistema, tmp / "registrar", args.ventas, resultados)
+        bench_leer(sistema, tmp, tamanos, args.mal_formadas, args.repeticiones, resultados)
+        bench_listar(sistema, tmp, args.reportes, args.repeticiones, resultados)
+        bench_anual(sistema, tmp, args.lineas_anio, args.mal_formadas, args.repeticiones, resultados)
+
+    datos = {
+        "meta": {"fecha": datetime.now().isoformat(timespec="seconds"),
+                 "python": platform.python_version(), "plataforma": platform.platform(),
+                 "parametros": {k: str(v) for k, v in vars(args).items()}},
+        "metricas": resultados.metricas,
+    }
+    if args.salida:
+        args.salida.write_text(json.dumps(datos, ensure_ascii=False, indent=1), encoding="utf-8")
+        print(f"\nResultados guardados en {args.salida}")
+    if args.comparar:
+        try:
+            base = json.loads(args.comparar.read_text(encoding="utf-8"))
+            metricas_base = base["metricas"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+            print(f"ERROR: No se pudo leer la base '{args.comparar}': {e}")
+            sys.exit(2)
+        if base.get("meta", {}).get("plataforma") != datos["meta"]["plataforma"]:
+            print("AVISO: la base se midió en otra plataforma; la comparación es orientativa.")
+        regresiones = comparar(resultados.metricas, metricas_base, args.tolerancia)
+        if regresiones:
+            print(f"Regresiones: {len(regresiones)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Bloqueo exclusivo entre procesos sobre un archivo `.lock`.
+
+Varias terminales comparten la carpeta `data/`; cuando una operación lee
+el estado del disco y escribe según lo leído (p. ej. asignar el siguiente
+número de secuencia del inventario), la lectura y la escritura se hacen
+con el bloqueo tomado. Usa `fcntl.flock` en Linux/macOS y
+`msvcrt.locking` en Windows.
+
+El bloqueo no es reentrante: quien lo toma no debe volver a pedirlo sobre
+el mismo archivo antes de soltarlo.
+"""
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def bloqueo_archivo(path: Path) -> Iterator[None]:
+    """Espera hasta tener el bloqueo de `path` (se crea si no existe) y lo suelta al salir."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+b") as f:
+        if os.name == "nt":
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)  # LK_LOCK se rinde tras 10 s; se sigue esperando
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,251 @@
+"""
+Archivos gzip por bloques con acceso aleatorio.
+
+Un reporte archivado (`ventas_AAAA-MM.txt.gz`) es un gzip normal formado
+por varios miembros seguidos, cada uno con ~256 KB de líneas completas;
+`zcat` o `gzip -d` lo leen como un único texto. Igual que en el formato
+BGZF, la cabecera de cada miembro lleva en su campo extra (subcampo "VB")
+el tamaño comprimido del miembro y el tamaño del texto que contiene, así
+que la tabla de bloques se arma leyendo sólo las cabeceras.
+
+Con esa tabla, `abrir_binario` devuelve un archivo de sólo lectura en el
+que `seek`/`tell` usan posiciones del texto descomprimido: los índices de
+fechas y las lecturas incrementales funcionan igual que con el `.txt`.
+Los bloques descomprimidos se guardan en una caché LRU compartida (32 MB),
+de modo que ver dos veces el mismo mes no vuelve a inflarlo.
+
+Un gzip de otro origen (sin el subcampo) también se puede leer: su tabla
+se calcula descomprimiéndolo una vez.
+"""
+import bisect
+import io
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, List, TextIO, Tuple
+
+EXTENSION = ".gz"
+TAMANO_BLOQUE = 256 * 1024
+NIVEL_COMPRESION = 6
+CACHE_BYTES = 32 * 1024 * 1024
+
+_MAGIA = b"\x1f\x8b\x08"
+_FEXTRA = 0x04
+_SUBCAMPO = b"VB"
+
+# (offset comprimido, tamaño comprimido, offset en el texto, tamaño del texto)
+Bloque = Tuple[int, int, int, int]
+
+
+def es_comprimido(path: Path) -> bool:
+    return path.name.endswith(EXTENSION)
+
+
+# --- Escritura ---
+def _miembro(datos: bytes) -> bytes:
+    compresor = zlib.compressobj(NIVEL_COMPRESION, zlib.DEFLATED, -15)
+    cuerpo = compresor.compress(datos) + compresor.flush()
+    tamano_miembro = 10 + 2 + 12 + len(cuerpo) + 8
+    extra = _SUBCAMPO + struct.pack("<HII", 8, tamano_miembro, len(datos))
+    cabecera = _MAGIA + bytes([_FEXTRA]) + b"\x00\x00\x00\x00\x00\xff" + struct.pack("<H", len(extra))
+    cola = struct.pack("<II", zlib.crc32(datos), len(datos) & 0xFFFFFFFF)
+    return cabecera + extra + cuerpo + cola
+
+
+def escribir_bloques(lineas: Iterable[bytes], destino: Path) -> Tuple[int, int]:
+    """Comprime las líneas en `destino` por bloques; devuelve (bytes de texto, bytes comprimidos)."""
+    total = 0
+    with destino.open("wb") as f:
+        pendiente: List[bytes] = []
+        tamano = 0
+        for linea in lineas:
+            pendiente.append(linea)
+            tamano += len(linea)
+            if tamano >= TAMANO_BLOQUE:
+                f.write(_miembro(b"".join(pendiente)))
+                total += tamano
+                pendiente, tamano = [], 0
+        if pendiente or total == 0:
+            f.write(_miembro(b"".join(pendiente)))
+            total += tamano
+        return total, f.tell()
+
+
+# --- Tabla de bloques ---
+def _tabla_por_cabeceras(f: BinaryIO, tamano_archivo: int) -> List[Bloque]:
+    tabla: List[Bloque] = []
+    offset, texto = 0, 0
+    while offset < tamano_archivo:
+        f.seek(offset)
+        cabecera = f.read(12)
+        if cabecera[:3] != _MAGIA or not cabecera[3] & _FEXTRA:
+            raise ValueError("miembro sin tabla")
+        extra = f.read(struct.unpack("<H", cabecera[10:12])[0])
+        i = 0
+        while i + 4 <= len(extra):
+            largo = struct.unpack("<H", extra[i + 2:i + 4])[0]
+            if extra[i:i + 2] == _SUBCAMPO and largo == 8:
+                tamano_miembro, tamano_texto = struct.unpack("<II", extra[i + 4:i + 12])
+                break
+            i += 4 + largo
+        else:
+            raise ValueError("miembro sin tabla")
+        tabla.append((offset, tamano_miembro, texto, tamano_texto))
+        offset += tamano_miembro
+        texto += tamano_texto
+    return tabla
+
+
+def _tabla_descomprimiendo(f: BinaryIO) -> List[Bloque]:
+    f.seek(0)
+    datos = f.read()
+    tabla: List[Bloque] = []
+    offset, texto = 0, 0
+    while datos[offset:offset + 2] == _MAGIA[:2]:
+        descompresor = zlib.decompressobj(31)
+        tamano_texto = len(descompresor.decompress(datos[offset:]))
+        usado = len(datos) - offset - len(descompresor.unused_data)
+        tabla.append((offset, usado, texto, tamano_texto))
+        offset += usado
+        texto += tamano_texto
+    return tabla
+
+
+_tablas: Dict[Tuple[str, int, int], List[Bloque]] = {}
+_lock_tablas = threading.Lock()
+
+
+def _tabla(path: Path, f: BinaryIO) -> Tuple[Tuple[str, int, int], List[Bloque]]:
+    stat = path.stat()
+    clave = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _lock_tablas:
+        tabla = _tablas.get(clave)
+    if tabla is None:
+        try:
+            tabla = _tabla_por_cabeceras(f, stat.st_size)
+        except (ValueError, struct.error):
+            tabla = _tabla_descomprimiendo(f)
+        with _lock_tablas:
+            _tablas[clave] = tabla
+    return clave, tabla
+
+
+def tamano(path: Path) -> int:
+    """Tamaño del texto de un archivo (descomprimido si es .gz)."""
+    if not es_comprimido(path):
+        return path.stat().st_size
+    with path.open("rb") as f:
+        _, tabla = _tabla(path, f)
+    return tabla[-1][2] + tabla[-1][3] if tabla else 0
+
+
+# --- Caché de bloques descomprimidos ---
+class CacheBloques:
+    """LRU de bloques descomprimidos, acotada por bytes."""
+    def __init__(self, limite_bytes: int = CACHE_BYTES) -> None:
+        self.limite_bytes = limite_bytes
+        self._bloques: "OrderedDict[tuple, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave: tuple, cargar: Callable[[], bytes]) -> bytes:
+        with self._lock:
+            bloque = self._bloques.get(clave)
+            if bloque is not None:
+                self._bloques.move_to_end(clave)
+                self.aciertos += 1
+                return bloque
+            self.fallos += 1
+        bloque = cargar()
+        with self._lock:
+            if clave not in self._bloques:
+                self._bloques[clave] = bloque
+                self._bytes += len(bloque)
+                while self._bytes > self.limite_bytes and len(self._bloques) > 1:
+                    _, viejo = self._bloques.popitem(last=False)
+                    self._bytes -= len(viejo)
+        return bloque
+
+    def vaciar(self) -> None:
+        with self._lock:
+            self._bloques.clear()
+            self._bytes = 0
+
+
+cache = CacheBloques()
+
+
+# --- Lectura ---
+class LectorBloques(io.RawIOBase):
+    """Lectura con seek sobre el texto de un gzip por bloques."""
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self._f = path.open("rb")
+        try:
+            self._clave, self._tabla = _tabla(path, self._f)
+        except BaseException:
+            self._f.close()
+            raise
+        self._inicios = [texto for _, _, texto, _ in self._tabla]
+        self._total = self._tabla[-1][2] + self._tabla[-1][3] if self._tabla else 0
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: self._total}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def _bloque(self, i: int) -> bytes:
+        offset, tamano_miembro, _, _ = self._tabla[i]
+
+        def inflar() -> bytes:
+            self._f.seek(offset)
+            return zlib.decompress(self._f.read(tamano_miembro), 31)
+        return cache.obtener(self._clave + (i,), inflar)
+
+    def readinto(self, destino) -> int:
+        if self._pos >= self._total:
+            return 0
+        i = bisect.bisect_right(self._inicios, self._pos) - 1
+        bloque = self._bloque(i)
+        desde = self._pos - self._inicios[i]
+        n = min(len(destino), len(bloque) - desde)
+        destino[:n] = bloque[desde:desde + n]
+        self._pos += n
+        return n
+
+    def close(self) -> None:
+        self._f.close()
+        super().close()
+
+
+def abrir_binario(path: Path) -> BinaryIO:
+    """Abre un archivo en modo 'rb', descomprimiendo por bloques si es .gz."""
+    if not es_comprimido(path):
+        return path.open("rb")
+    return io.BufferedReader(LectorBloques(path), buffer_size=64 * 1024)
+
+
+def abrir_texto(path: Path, errors: str = "strict") -> TextIO:
+    """Equivalente a `path.open(encoding="utf-8")` para archivos .txt o .gz."""
+    if not es_comprimido(path):
+        return path.open(encoding="utf-8", errors=errors)
+    return io.TextIOWrapper(abrir_binario(path), encoding="utf-8", errors=errors)
+
+
+def leer_texto(path: Path) -> str:
+    with abrir_texto(path) as f:
+        return f.read()
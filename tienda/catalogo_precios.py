@@ -0,0 +1,82 @@
+"""
+Catálogo de precios leído de `data/precios.txt`.
+
+Formato del archivo (las líneas que empiezan con # se ignoran):
+
+    producto,precio
+    Café molido,50.00
+
+Los productos se guardan en un diccionario por nombre normalizado (sin
+mayúsculas ni acentos), así que buscar un precio es O(1). El archivo sólo
+se vuelve a leer cuando cambia su fecha de modificación.
+"""
+import bisect
+import difflib
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .formato import normalizar_nombre
+
+
+class CatalogoPrecios:
+    """Precios por producto con autocompletado por prefijo y aproximado."""
+    def __init__(self, path_precios: Path) -> None:
+        self.path_precios = path_precios
+        self.precios: Dict[str, Tuple[str, float]] = {}  # normalizado -> (nombre, precio)
+        self._claves_ordenadas: List[str] = []
+        self._mtime_ns: Optional[int] = -1
+
+    def _vigente(self) -> None:
+        """Relee precios.txt sólo si cambió desde la última carga."""
+        try:
+            mtime = self.path_precios.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime_ns:
+            return
+        self._mtime_ns = mtime
+        self.precios = {}
+        if mtime is not None:
+            for i, linea in enumerate(self.path_precios.read_text(encoding="utf-8").splitlines()):
+                if not linea.strip() or linea.startswith("#"):
+                    continue
+                nombre, _, precio_str = linea.rpartition(",")
+                try:
+                    precio = float(precio_str)
+                except ValueError:
+                    logging.warning(f"Línea {i+1} mal formada en '{self.path_precios.name}': '{linea}'")
+                    continue
+                if nombre.strip():
+                    self.precios[normalizar_nombre(nombre)] = (nombre.strip(), precio)
+        self._claves_ordenadas = sorted(self.precios)
+        logging.info(f"Catálogo de precios cargado ({len(self.precios)} productos)")
+
+    def precio(self, producto: str) -> Optional[float]:
+        """Precio de un producto, o None si no está en el catálogo."""
+        self._vigente()
+        encontrado = self.precios.get(normalizar_nombre(producto))
+        return encontrado[1] if encontrado else None
+
+    def autocompletar(self, texto: str, limite: int = 5) -> List[Tuple[str, float]]:
+        """Productos cuyo nombre empieza con `texto`."""
+        self._vigente()
+        prefijo = normalizar_nombre(texto)
+        i = bisect.bisect_left(self._claves_ordenadas, prefijo)
+        resultados = []
+        while (i < len(self._claves_ordenadas) and len(resultados) < limite
+               and self._claves_ordenadas[i].startswith(prefijo)):
+            resultados.append(self.precios[self._claves_ordenadas[i]])
+            i += 1
+        return resultados
+
+    def sugerir(self, texto: str, limite: int = 5) -> List[Tuple[str, float]]:
+        """Autocompleta por prefijo y, si no hay suficientes, por parecido."""
+        resultados = self.autocompletar(texto, limite)
+        if len(resultados) < limite:
+            vistos = {normalizar_nombre(nombre) for nombre, _ in resultados}
+            for clave in difflib.get_close_matches(normalizar_nombre(texto), self._claves_ordenadas,
+                                                   n=limite, cutoff=0.6):
+                if clave not in vistos and len(resultados) < limite:
+                    resultados.append(self.precios[clave])
+        return resultados
@@ -0,0 +1,325 @@
+"""
+Directorios de clientes y proveedores con búsqueda rápida.
+
+`data/clientes.txt` y `data/proveedores.txt` guardan un contacto por línea
+(las que empiezan con # se ignoran):
+
+    id,nombre,telefono,email
+    1,María José Pérez,555-1234,mjperez@correo.com
+
+El archivo se lee una sola vez; las altas se agregan al final y a los
+índices en memoria, y si el archivo creció por fuera sólo se lee lo nuevo.
+Para buscar por nombre (normalizado: sin mayúsculas ni acentos) hay dos
+índices sobre las palabras de los nombres:
+
+    prefijos   vocabulario ordenado de palabras -> contactos que la usan.
+               Es la forma "aplanada" de un trie: todas las palabras que
+               empiezan con un prefijo forman un tramo contiguo que se
+               encuentra con bisect, sin un diccionario por nodo (con un
+               millón de nombres el trie de nodos ocuparía gigabytes).
+    n-gramas   bigrama -> palabras del vocabulario que lo contienen. Las
+               palabras que comparten suficientes bigramas con la buscada
+               son candidatas y se confirman con la distancia de edición
+               (con transposiciones), así "jaun" encuentra "juan".
+
+Como ambos índices trabajan sobre el vocabulario (decenas de miles de
+palabras) y no sobre cada contacto, una búsqueda entre un millón de
+clientes tarda milisegundos.
+"""
+import bisect
+import logging
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .formato import normalizar_nombre
+
+CANDIDATOS_APROXIMADOS = 5_000
+
+
+class Contacto:
+    """Un cliente o proveedor."""
+    def __init__(self, id: int, nombre: str, telefono: str = "", email: str = "") -> None:
+        self.id = id
+        self.nombre = nombre
+        self.telefono = telefono
+        self.email = email
+
+    def to_linea(self) -> str:
+        return f"{self.id},{self.nombre},{self.telefono},{self.email}"
+
+    def __str__(self) -> str:
+        detalles = ", ".join(d for d in (self.telefono, self.email) if d)
+        return f"#{self.id} {self.nombre}" + (f" ({detalles})" if detalles else "")
+
+
+def _bigramas(palabra: str) -> Set[str]:
+    rellena = f"${palabra}$"
+    return {rellena[i:i + 2] for i in range(len(rellena) - 1)}
+
+
+def _errores_permitidos(palabra: str) -> int:
+    return 0 if len(palabra) <= 2 else 1 if len(palabra) <= 5 else 2
+
+
+def distancia_edicion(a: str, b: str, maximo: int) -> int:
+    """Distancia de Damerau-Levenshtein (transposiciones adyacentes); corta al pasar `maximo`."""
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    anterior2: List[int] = []
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            actual[j] = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                actual[j] = min(actual[j], anterior2[j - 2] + 1)
+        if min(actual) > maximo:
+            return maximo + 1
+        anterior2, anterior = anterior, actual
+    return anterior[-1]
+
+
+class Directorio:
+    """Contactos de un archivo con índice de prefijos y de bigramas."""
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        # Cada contacto se guarda como su línea; el objeto Contacto se arma al devolverlo
+        self._lineas: List[str] = []
+        self._nombres: List[str] = []  # Nombre normalizado de cada contacto
+        self._por_id: Dict[int, int] = {}
+        self._palabras: List[str] = []  # Vocabulario ordenado
+        self._contactos_de: Dict[str, array] = {}  # palabra -> posiciones en `_lineas`
+        self._id_palabra: Dict[str, int] = {}
+        self._palabra_de_id: List[str] = []
+        self._bigramas: Dict[str, array] = {}  # bigrama -> ids de palabra
+        self._normalizadas: Dict[str, str] = {}  # Caché palabra escrita -> normalizada
+        self._ultimo_id = 0
+        self._leido = -1  # Bytes del archivo ya indexados
+        self._mtime_ns: Optional[int] = None
+
+    # --- Carga ---
+    def _vigente(self) -> None:
+        """
+        Carga el archivo la primera vez; después sólo lee lo que se agregó. Si
+        cambió su mtime sin crecer (se editó a mano, aunque tenga el mismo
+        tamaño) se vuelve a leer entero.
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            if self._leido != 0:
+                self._reiniciar()
+                self._leido = 0
+            return
+        if stat.st_mtime_ns == self._mtime_ns and stat.st_size == self._leido:
+            return
+        if stat.st_size <= self._leido:
+            self._reiniciar()  # Se editó a mano: leer todo otra vez
+        inicio = max(self._leido, 0)
+        with self.path.open("rb") as f:
+            f.seek(inicio)
+            datos = f.read()
+        fin = datos.rfind(b"\n") + 1  # Una última línea a medio escribir se lee después
+        vocabulario = len(self._palabras)
+        for linea in datos[:fin].decode("utf-8", errors="replace").splitlines():
+            if not linea or linea[0] == "#":
+                continue
+            id_texto, _, resto = linea.partition(",")
+            campos = resto.rsplit(",", 2)
+            if len(campos) < 3 or not id_texto.strip().isdigit():
+                logging.warning(f"Línea ignorada en '{self.path.name}': '{linea}'")
+                continue
+            self._indexar(int(id_texto), campos[0], linea)
+        if len(self._palabras) != vocabulario:
+            self._palabras.sort()  # Una sola vez por lectura (Timsort aprovecha lo ya ordenado)
+        self._leido = inicio + fin
+        self._mtime_ns = stat.st_mtime_ns
+        logging.info(f"Directorio {self.path.name} cargado ({len(self._lineas)} contactos)")
+
+    def _reiniciar(self) -> None:
+        self._lineas.clear()
+        self._nombres.clear()
+        self._por_id.clear()
+        self._palabras.clear()
+        self._contactos_de.clear()
+        self._id_palabra.clear()
+        self._palabra_de_id.clear()
+        self._bigramas.clear()
+        self._ultimo_id = 0
+        self._leido = -1
+
+    def _contacto(self, posicion: int) -> Contacto:
+        id_texto, _, resto = self._lineas[posicion].partition(",")
+        nombre, telefono, email = resto.rsplit(",", 2)
+        return Contacto(int(id_texto), nombre.strip(), telefono.strip(), email.strip())
+
+    # --- Índices en memoria ---
+    def _normalizar(self, nombre: str) -> str:
+        """normalizar_nombre palabra por palabra, memorizando cada palabra (se repiten mucho)."""
+        palabras = []
+        for palabra in nombre.split():
+            normalizada = self._normalizadas.get(palabra)
+            if normalizada is None:
+                normalizada = self._normalizadas[palabra] = normalizar_nombre(palabra)
+            if normalizada:
+                palabras.append(normalizada)
+        return " ".join(palabras)
+
+    def _indexar(self, id: int, nombre: str, linea: str) -> None:
+        posicion = len(self._lineas)
+        nombre = self._normalizar(nombre)
+        self._lineas.append(linea)
+        self._nombres.append(nombre)
+        self._por_id[id] = posicion
+        if id > self._ultimo_id:
+            self._ultimo_id = id
+        for palabra in set(nombre.split()):
+            posiciones = self._contactos_de.get(palabra)
+            if posiciones is None:
+                posiciones = self._contactos_de[palabra] = array("I")
+                self._palabras.append(palabra)
+                id_palabra = self._id_palabra[palabra] = len(self._palabra_de_id)
+                self._palabra_de_id.append(palabra)
+                for bigrama in _bigramas(palabra):
+                    self._bigramas.setdefault(bigrama, array("I")).append(id_palabra)
+            posiciones.append(posicion)
+
+    # --- Altas ---
+    def agregar(self, nombre: str, telefono: str = "", email: str = "") -> Contacto:
+        """Da de alta un contacto y lo agrega al final del archivo."""
+        self._vigente()
+        nombre, telefono, email = nombre.strip(), telefono.strip(), email.strip()
+        if not normalizar_nombre(nombre):
+            raise ValueError("ERROR: El nombre no puede estar vacío.")
+        if "," in telefono or "," in email:
+            raise ValueError("ERROR: El teléfono y el email no pueden contener comas.")
+        contacto = Contacto(self._ultimo_id + 1, nombre, telefono, email)
+        # Si la última línea quedó sin salto (edición a mano), se cierra antes
+        separador = "\n" if 0 < self._tamano_sin_salto() else ""
+        with self.path.open("a", encoding="utf-8", newline="\n") as f:
+            f.write(separador + contacto.to_linea() + "\n")
+        self._vigente()  # Indexa la línea recién escrita (y lo que otro haya agregado)
+        logging.info(f"Alta en {self.path.name}: #{contacto.id} {contacto.nombre}")
+        return self._contacto(self._por_id[contacto.id])
+
+    def _tamano_sin_salto(self) -> int:
+        """Bytes al final del archivo que no terminan en salto de línea."""
+        try:
+            return self.path.stat().st_size - self._leido if self._leido >= 0 else 0
+        except FileNotFoundError:
+            return 0
+
+    # --- Consultas ---
+    def __len__(self) -> int:
+        self._vigente()
+        return len(self._lineas)
+
+    def obtener(self, id: int) -> Optional[Contacto]:
+        self._vigente()
+        posicion = self._por_id.get(id)
+        return self._contacto(posicion) if posicion is not None else None
+
+    def _tramo(self, prefijo: str) -> Tuple[int, int]:
+        """Posiciones [i, j) del vocabulario con palabras que empiezan con `prefijo`."""
+        return (bisect.bisect_left(self._palabras, prefijo),
+                bisect.bisect_left(self._palabras, prefijo + "\U0010ffff"))
+
+    def buscar_prefijo(self, texto: str, limite: int = 10) -> List[Contacto]:
+        """Contactos con una palabra que empiece por cada palabra de `texto`."""
+        self._vigente()
+        consulta = normalizar_nombre(texto).split()
+        if not consulta:
+            return []
+        # Se recorre el tramo más corto y se verifica el resto de las palabras
+        tramos = {palabra: self._tramo(palabra) for palabra in consulta}
+        guia = min(consulta, key=lambda p: tramos[p][1] - tramos[p][0])
+        resto = [p for p in consulta if p != guia]
+        i, j = tramos[guia]
+        encontrados: List[Contacto] = []
+        vistos: Set[int] = set()
+        for palabra in self._palabras[i:j]:
+            for posicion in self._contactos_de[palabra]:
+                if posicion in vistos:
+                    continue
+                vistos.add(posicion)
+                palabras = self._nombres[posicion].split()
+                if all(any(p.startswith(q) for p in palabras) for q in resto):
+                    encontrados.append(self._contacto(posicion))
+                    if len(encontrados) >= limite:
+                        return encontrados
+        return encontrados
+
+    def _parecidas(self, palabra: str) -> Dict[str, float]:
+        """Palabras del vocabulario a pocos errores de `palabra`, con su similitud (0-1]."""
+        maximo = _errores_permitidos(palabra)
+        bigramas = _bigramas(palabra)
+        # Cada error cambia a lo sumo 3 bigramas: con menos en común no puede ser parecida
+        minimo_comunes = max(1, len(bigramas) - 3 * maximo)
+        comunes: Counter = Counter()
+        for bigrama in bigramas:
+            comunes.update(self._bigramas.get(bigrama, ()))
+        parecidas = {}
+        for id_palabra, cantidad in comunes.items():
+            if cantidad < minimo_comunes:
+                continue
+            candidata = self._palabra_de_id[id_palabra]
+            distancia = distancia_edicion(palabra, candidata, maximo)
+            if distancia <= maximo:
+                parecidas[candidata] = 1 - distancia / max(len(palabra), len(candidata))
+        return parecidas
+
+    def buscar_aproximado(self, texto: str, limite: int = 10) -> List[Tuple[Contacto, float]]:
+        """Contactos cuyo nombre se parece a `texto` aunque tenga errores; con su puntaje."""
+        self._vigente()
+        consulta = normalizar_nombre(texto).split()
+        if not consulta:
+            return []
+        parecidas = [self._parecidas(palabra) for palabra in consulta]
+        if not all(parecidas):
+            return []
+        # Candidatos: los contactos de la palabra de consulta con menos apariciones
+        guia = min(range(len(consulta)),
+                   key=lambda k: sum(len(self._contactos_de[p]) for p in parecidas[k]))
+        puntajes: Dict[int, float] = {}
+        revisados: Set[int] = set()
+        for palabra in sorted(parecidas[guia], key=parecidas[guia].get, reverse=True):
+            for posicion in self._contactos_de[palabra]:
+                if posicion in revisados:
+                    continue
+                revisados.add(posicion)
+                palabras = self._nombres[posicion].split()
+                puntaje = 0.0
+                for similares in parecidas:
+                    mejor = max((similares.get(p, 0.0) for p in palabras), default=0.0)
+                    if not mejor:
+                        break
+                    puntaje += mejor
+                else:
+                    puntajes[posicion] = puntaje / len(consulta)
+                if len(revisados) >= CANDIDATOS_APROXIMADOS:
+                    break
+            if len(revisados) >= CANDIDATOS_APROXIMADOS:
+                break
+        mejores = sorted(puntajes.items(), key=lambda par: (-par[1], par[0]))[:limite]
+        return [(self._contacto(posicion), puntaje) for posicion, puntaje in mejores]
+
+    def buscar(self, texto: str, limite: int = 10) -> List[Contacto]:
+        """Por prefijo y, si no alcanzan, completa con resultados aproximados."""
+        texto = texto.strip()
+        if texto.isdigit():
+            contacto = self.obtener(int(texto))
+            if contacto is not None:
+                return [contacto]
+        resultados = self.buscar_prefijo(texto, limite)
+        if len(resultados) < limite:
+            ids = {c.id for c in resultados}
+            for contacto, _ in self.buscar_aproximado(texto, limite):
+                if contacto.id not in ids and len(resultados) < limite:
+                    resultados.append(contacto)
+        return resultados
+
+    def __iter__(self) -> Iterator[Contacto]:
+        self._vigente()
+        return (self._contacto(posicion) for posicion in range(len(self._lineas)))
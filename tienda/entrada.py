@@ -0,0 +1,96 @@
+"""
+Lectura de líneas del teclado con tiempo límite real.
+
+`EntradaConTiempo.leer_linea(segundos)` espera una línea y devuelve None
+si vence el plazo. No hace sondeo: el proceso queda dormido hasta que
+llega la entrada o hasta el instante exacto del vencimiento.
+
+    - Si stdin es una terminal POSIX, se espera con `selectors` sobre su
+      descriptor. En modo canónico la terminal sólo lo marca como legible
+      cuando hay una línea completa, así que `readline()` no bloquea.
+    - En Windows (la consola no admite select), con tuberías o archivos,
+      un hilo lee la línea y la deja en una cola; se espera con
+      `Queue.get(timeout=...)`. Si el plazo vence, la lectura pendiente no
+      se pierde: la recibe la siguiente llamada.
+"""
+import os
+import queue
+import selectors
+import sys
+import threading
+import time
+from typing import Optional, TextIO
+
+try:
+    import termios
+except ImportError:  # Windows
+    termios = None
+
+
+class EntradaConTiempo:
+    """Lee líneas de `flujo` (stdin por defecto) con un plazo opcional."""
+    def __init__(self, flujo: Optional[TextIO] = None) -> None:
+        self.flujo = flujo or sys.stdin
+        self._cola: "queue.Queue[str]" = queue.Queue()
+        self._leyendo = False  # Hay un hilo bloqueado en readline()
+
+    def _usa_selector(self) -> bool:
+        if os.name == "nt" or self._leyendo:
+            return False
+        try:
+            return self.flujo.isatty() and self.flujo.fileno() >= 0
+        except (AttributeError, ValueError, OSError):
+            return False
+
+    def leer_linea(self, segundos: Optional[float] = None) -> Optional[str]:
+        """
+        Devuelve la siguiente línea sin el salto final, o None si pasan
+        `segundos` sin que se complete. Lanza EOFError si stdin se cerró,
+        igual que `input()`.
+        """
+        if self._usa_selector():
+            linea = self._con_selector(segundos)
+        else:
+            linea = self._con_hilo(segundos)
+        if linea is None:
+            return None
+        if not linea:
+            raise EOFError
+        return linea.rstrip("\r\n")
+
+    def _con_selector(self, segundos: Optional[float]) -> Optional[str]:
+        limite = None if segundos is None else time.monotonic() + segundos
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.flujo, selectors.EVENT_READ)
+            while True:
+                restante = None if limite is None else max(0.0, limite - time.monotonic())
+                if selector.select(restante):
+                    return self.flujo.readline()
+                if limite is not None and time.monotonic() >= limite:
+                    if termios is not None:
+                        # Descarta lo que quedó escrito a medias antes del vencimiento
+                        termios.tcflush(self.flujo.fileno(), termios.TCIFLUSH)
+                    return None
+
+    def _leer_en_hilo(self) -> None:
+        try:
+            linea = self.flujo.readline()
+        except (OSError, ValueError):
+            linea = ""
+        self._cola.put(linea)
+
+    def _con_hilo(self, segundos: Optional[float]) -> Optional[str]:
+        if not self._leyendo:
+            self._leyendo = True
+            threading.Thread(target=self._leer_en_hilo, name="entrada-teclado", daemon=True).start()
+        try:
+            linea = self._cola.get(timeout=segundos)
+        except queue.Empty:
+            return None
+        self._leyendo = False
+        return linea
+
+    def input(self, mensaje: str = "", segundos: Optional[float] = None) -> Optional[str]:
+        """Como `input(mensaje)`, pero con plazo y compatible con una lectura pendiente."""
+        print(mensaje, end="", flush=True)
+        return self.leer_linea(segundos)
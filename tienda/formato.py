@@ -0,0 +1,79 @@
+"""
+Formato de las líneas de los reportes de ventas.
+
+Cada venta se guarda como:
+    [AAAA-MM-DD]: vendedor,producto,cantidad,precio_unitario,subtotal
+"""
+import re
+import unicodedata
+from typing import NamedTuple, Optional
+
+SEPARADOR_FECHA = "]: "
+# Caracteres que partirían una línea del reporte (str.splitlines también corta en \x1c-\x1e, \x85...)
+CARACTERES_CONTROL = re.compile("[\x00-\x1f\x7f\x85\u2028\u2029]")
+
+
+class LineaVenta(NamedTuple):
+    """Una línea de reporte ya interpretada."""
+    fecha: str
+    vendedor: str
+    producto: str
+    cantidad: float
+    precio: float
+    subtotal: float
+
+
+def fecha_de_linea(linea: str) -> Optional[str]:
+    """Devuelve la fecha 'AAAA-MM-DD' de una línea, o None si no tiene."""
+    if len(linea) < 14 or linea[0] != "[" or linea[11:14] != SEPARADOR_FECHA:
+        return None
+    return linea[1:11]
+
+
+def parsear_linea(linea: str) -> Optional[LineaVenta]:
+    """Interpreta una línea de reporte; devuelve None si está mal formada."""
+    fecha = fecha_de_linea(linea)
+    if fecha is None:
+        return None
+    campos = linea[14:].rstrip("\r\n").split(",")
+    if len(campos) < 5:
+        return None
+    try:
+        return LineaVenta(
+            fecha=fecha,
+            vendedor=campos[0],
+            producto=",".join(campos[1:-3]),
+            cantidad=float(campos[-3]),
+            precio=float(campos[-2]),
+            subtotal=float(campos[-1]),
+        )
+    except ValueError:
+        return None
+
+
+def normalizar_nombre(nombre: str) -> str:
+    """Normaliza un nombre para buscarlo: minúsculas, sin acentos ni espacios extra."""
+    if nombre.isascii():
+        return " ".join(nombre.lower().split())
+    sin_acentos = unicodedata.normalize("NFKD", nombre.casefold())
+    return " ".join("".join(c for c in sin_acentos if not unicodedata.combining(c)).split())
+
+
+def validar_campos_venta(vendedor: str, producto: str) -> None:
+    """
+    ValueError si el vendedor o el producto no caben en una línea de reporte:
+    vacíos, con saltos de línea o caracteres de control, o un vendedor con
+    comas (el producto sí puede tenerlas: se lee entre el primer campo y
+    los tres últimos).
+    """
+    if not vendedor or not producto:
+        raise ValueError("vendedor o producto vacío")
+    if "," in vendedor:
+        raise ValueError("el vendedor no puede tener comas")
+    if CARACTERES_CONTROL.search(vendedor) or CARACTERES_CONTROL.search(producto):
+        raise ValueError("vendedor o producto con saltos de línea o caracteres de control")
+
+
+def formatear_venta(vendedor: str, producto: str, cantidad: float, precio: float) -> str:
+    """Cuerpo de una línea de reporte (sin la fecha), tal como lo escribe `Venta`."""
+    return f"{vendedor},{producto},{cantidad},{precio:.2f},{cantidad * precio:.2f}"
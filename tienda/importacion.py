@@ -0,0 +1,194 @@
+"""
+Importación masiva de ventas sin pasar por los menús.
+
+Lee un CSV (con encabezado) o un JSONL con los campos
+
+    fecha,vendedor,producto,cantidad,precio
+
+(fecha como aaaa-mm-dd o dd/mm/aaaa) y agrega cada venta al reporte
+`ventas_AAAA-MM.txt` de su mes, creándolo si no existe. Las filas se validan
+por bloques y cada bloque se agrega a su reporte con una sola escritura con
+buffer grande, con el bloqueo del reporte tomado (el mismo del archivado,
+ver `segmentos.bloqueo_reporte`); los índices y el manifiesto se ponen al
+día una sola vez al final. No descuenta inventario: está pensada para
+cargar ventas pasadas. Las filas de meses ya archivados (ver
+`archivado.py`) se rechazan.
+
+Uso:
+    python "proyecto final manager de tienda.py" importar ventas.csv [otro.jsonl ...]
+"""
+import csv
+import json
+import logging
+import math
+import time
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .formato import formatear_venta, validar_campos_venta
+from .segmentos import bloqueo_reporte, esta_archivado
+
+TAMANO_BLOQUE = 50_000
+BUFFER_ESCRITURA = 1024 * 1024
+CAMPOS = ("fecha", "vendedor", "producto", "cantidad", "precio")
+ERRORES_MOSTRADOS = 10
+
+
+class ResumenImportacion:
+    """Conteo de filas y velocidad de una importación."""
+    def __init__(self, origen: Path) -> None:
+        self.origen = origen
+        self.leidas = 0
+        self.importadas = 0
+        self.errores: List[str] = []
+        self.rechazadas = 0
+        self.por_reporte: Dict[str, int] = {}
+        self.segundos = 0.0
+
+    def __str__(self) -> str:
+        filas_min = self.leidas / self.segundos * 60 if self.segundos else 0
+        lineas = [f"--- Importación de {self.origen.name} ---",
+                  f"Filas leídas: {self.leidas} | importadas: {self.importadas} | "
+                  f"rechazadas: {self.rechazadas}",
+                  f"Tiempo: {self.segundos:.2f} s ({filas_min:,.0f} filas/minuto)"]
+        for nombre, cantidad in sorted(self.por_reporte.items()):
+            lineas.append(f"  {nombre}: {cantidad} ventas")
+        for error in self.errores:
+            lineas.append(f"  {error}")
+        if self.rechazadas > len(self.errores):
+            lineas.append(f"  ... y {self.rechazadas - len(self.errores)} filas rechazadas más")
+        return "\n".join(lineas)
+
+
+def _filas_csv(f: TextIO) -> Iterator[Tuple]:
+    lector = csv.reader(f)
+    encabezado = [c.strip().lower() for c in next(lector, [])]
+    faltan = [c for c in CAMPOS if c not in encabezado]
+    if faltan:
+        raise ValueError(f"ERROR: Al CSV le faltan las columnas: {', '.join(faltan)}.")
+    posiciones = [encabezado.index(c) for c in CAMPOS]
+    for fila in lector:
+        try:
+            yield tuple(fila[p] for p in posiciones)
+        except IndexError:
+            yield (None,) + tuple(fila)
+
+
+def _filas_jsonl(f: TextIO) -> Iterator[Tuple]:
+    for linea in f:
+        if not linea.strip():
+            continue
+        try:
+            registro = json.loads(linea)
+            yield tuple(registro[c] for c in CAMPOS)
+        except (json.JSONDecodeError, KeyError, TypeError):
+            yield (None, linea.strip())
+
+
+class ImportadorVentas:
+    """Valida filas por bloques y las escribe en el reporte de su mes."""
+    def __init__(self, gestor) -> None:
+        self.gestor = gestor
+        self._fechas: Dict[str, Optional[Tuple[str, str]]] = {}
+        self._archivados: Dict[str, bool] = {}
+
+    def _fecha(self, texto: str) -> Optional[Tuple[str, str]]:
+        """(fecha ISO, nombre del reporte) de un texto de fecha; se memoriza."""
+        if texto not in self._fechas:
+            resultado = None
+            for formato in ("%Y-%m-%d", "%d/%m/%Y"):
+                try:
+                    dt = datetime.strptime(texto.strip(), formato)
+                    resultado = (dt.strftime("%Y-%m-%d"), f"ventas_{dt.year:04d}-{dt.month:02d}.txt")
+                    break
+                except ValueError:
+                    continue
+            self._fechas[texto] = resultado
+        return self._fechas[texto]
+
+    def _escribir(self, nombre_reporte: str, lineas: List[str]) -> None:
+        """Agrega las líneas de un bloque a su reporte con el bloqueo del reporte tomado."""
+        if not (self.gestor.base_dir / nombre_reporte).exists():
+            anio, mes = nombre_reporte[7:11], nombre_reporte[12:14]
+            try:
+                self.gestor.crear_reporte_mensual(int(anio), int(mes))
+            except FileExistsError:
+                pass
+        with bloqueo_reporte(self.gestor.base_dir, nombre_reporte):
+            # path_destino vuelve a comprobar, ya con el bloqueo, que el mes no se archivó
+            with self.gestor.path_destino(nombre_reporte).open(
+                    "a", encoding="utf-8", buffering=BUFFER_ESCRITURA) as f:
+                f.writelines(lineas)
+
+    def _validar_bloque(self, bloque: List[Tuple], primera_fila: int,
+                        resumen: ResumenImportacion) -> Dict[str, List[str]]:
+        lineas: Dict[str, List[str]] = {}
+        for numero, fila in enumerate(bloque, primera_fila):
+            try:
+                fecha_txt, vendedor, producto, cantidad_txt, precio_txt = fila
+                fecha = self._fecha(str(fecha_txt))
+                vendedor, producto = str(vendedor).strip(), str(producto).strip()
+                cantidad, precio = float(cantidad_txt), float(precio_txt)
+                if fecha is None:
+                    raise ValueError(f"fecha inválida '{fecha_txt}'")
+                validar_campos_venta(vendedor, producto)
+                if not (math.isfinite(cantidad) and math.isfinite(precio)):
+                    raise ValueError("cantidad o precio no es un número finito")
+            except (ValueError, TypeError) as e:
+                resumen.rechazadas += 1
+                if len(resumen.errores) < ERRORES_MOSTRADOS:
+                    resumen.errores.append(f"Fila {numero}: {e if fila[0] is not None else 'mal formada'}")
+                continue
+            fecha_iso, nombre_reporte = fecha
+            if nombre_reporte not in self._archivados:
+                self._archivados[nombre_reporte] = esta_archivado(self.gestor.base_dir, nombre_reporte)
+            if self._archivados[nombre_reporte]:
+                resumen.rechazadas += 1
+                if len(resumen.errores) < ERRORES_MOSTRADOS:
+                    resumen.errores.append(f"Fila {numero}: el reporte {nombre_reporte} está archivado")
+                continue
+            lineas.setdefault(nombre_reporte, []).append(
+                f"[{fecha_iso}]: {formatear_venta(vendedor, producto, cantidad, precio)}\n")
+        return lineas
+
+    def importar(self, path: Path, formato: Optional[str] = None) -> ResumenImportacion:
+        formato = formato or ("jsonl" if path.suffix.lower() in (".jsonl", ".json") else "csv")
+        if not path.exists():
+            raise FileNotFoundError(f"ERROR: El archivo '{path}' no existe.")
+        resumen = ResumenImportacion(path)
+        inicio = time.perf_counter()
+
+        with path.open(encoding="utf-8", newline="") as f:
+            filas = _filas_jsonl(f) if formato == "jsonl" else _filas_csv(f)
+            while True:
+                bloque = list(islice(filas, TAMANO_BLOQUE))
+                if not bloque:
+                    break
+                validas = self._validar_bloque(bloque, resumen.leidas + 1, resumen)
+                resumen.leidas += len(bloque)
+                for nombre_reporte, lineas in validas.items():
+                    try:
+                        self._escribir(nombre_reporte, lineas)
+                    except ValueError as e:
+                        # El mes se archivó mientras se importaba
+                        self._archivados[nombre_reporte] = True
+                        resumen.rechazadas += len(lineas)
+                        if len(resumen.errores) < ERRORES_MOSTRADOS:
+                            resumen.errores.append(str(e))
+                        continue
+                    resumen.importadas += len(lineas)
+                    resumen.por_reporte[nombre_reporte] = (
+                        resumen.por_reporte.get(nombre_reporte, 0) + len(lineas))
+
+        for nombre_reporte in resumen.por_reporte:
+            self.gestor.actualizar_derivados(nombre_reporte)
+            logging.info(f"Importación: {resumen.por_reporte[nombre_reporte]} ventas en {nombre_reporte}")
+        resumen.segundos = time.perf_counter() - inicio
+        return resumen
+
+
+def importar_ventas(gestor, path: Path, formato: Optional[str] = None) -> ResumenImportacion:
+    """Importa un archivo CSV o JSONL de ventas con el gestor dado."""
+    return ImportadorVentas(gestor).importar(path, formato)
@@ -0,0 +1,175 @@
+"""
+Índice disperso de fechas para los reportes de ventas.
+
+Por cada reporte se guarda, junto a `data/indices/`, un archivo `.idx` de
+solo-agregar con entradas `fecha -> byte offset`:
+
+    P 2025-09-10 1234   -> primera línea de una fecha nueva (orden creciente)
+    S 2025-09-02 5678   -> línea con fecha atrasada (capturada con pedir_fecha)
+
+Las entradas `P` forman el índice primario: como las fechas sólo crecen,
+se puede buscar con bisect y leer el archivo desde ese punto. Las ventas
+registradas con una fecha anterior a la última vista van al índice
+secundario `S`, que se mantiene ordenado por fecha.
+
+Si el reporte está archivado (.gz por bloques) los offsets son posiciones
+del texto descomprimido.
+"""
+import bisect
+import logging
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from .bloques_gzip import abrir_binario, tamano as tamano_texto
+from .formato import fecha_de_linea
+
+
+class IndiceFechas:
+    """Índice fecha -> byte offset de un único archivo de reporte."""
+    def __init__(self, path_reporte: Path, path_indice: Path) -> None:
+        self.path_reporte = path_reporte
+        self.path_indice = path_indice
+        self.primario: List[Tuple[str, int]] = []
+        self.secundario: List[Tuple[str, int]] = []
+        self._offsets_secundarios: Set[int] = set()
+        self.cubierto = 0  # Byte a partir del cual aún no se ha indexado
+        self._cargado = False
+
+    # --- Carga y mantenimiento ---
+    def _cargar(self) -> None:
+        """Lee el archivo .idx y se pone al día con lo agregado después."""
+        self._cargado = True
+        if self.path_indice.exists():
+            for linea in self.path_indice.read_text(encoding="utf-8").splitlines():
+                try:
+                    tipo, fecha, offset_str = linea.split()
+                    offset = int(offset_str)
+                except ValueError:
+                    continue
+                if tipo == "P":
+                    # Dos procesos pueden haber anotado la misma entrada: sólo crece
+                    if not self.primario or (fecha, offset) > self.primario[-1]:
+                        self.primario.append((fecha, offset))
+                elif tipo == "S" and offset not in self._offsets_secundarios:
+                    bisect.insort(self.secundario, (fecha, offset))
+                    self._offsets_secundarios.add(offset)
+                self.cubierto = max(self.cubierto, offset)
+        self.actualizar()
+
+    def _reiniciar(self) -> None:
+        """Descarta el índice y lo reconstruye desde el inicio del reporte."""
+        logging.warning(f"Índice de fechas reconstruido: {self.path_reporte.name}")
+        self.primario.clear()
+        self.secundario.clear()
+        self._offsets_secundarios.clear()
+        self.cubierto = 0
+        self.path_indice.unlink(missing_ok=True)
+
+    def actualizar(self) -> None:
+        """Indexa las líneas agregadas al reporte desde la última vez."""
+        if not self._cargado:
+            self._cargar()
+            return
+        if not self.path_reporte.exists():
+            return
+        tamano = tamano_texto(self.path_reporte)
+        if tamano < self.cubierto:
+            self._reiniciar()
+        if tamano == self.cubierto:
+            return
+
+        # Al ponerse al día pueden aparecer muchas entradas (p. ej. tras una
+        # importación masiva): se acumulan y se escriben/ordenan una sola vez
+        nuevas: List[Tuple[str, str, int]] = []
+        with abrir_binario(self.path_reporte) as f:
+            f.seek(self.cubierto)
+            offset = self.cubierto
+            for linea_bytes in f:
+                if not linea_bytes.endswith(b"\n"):
+                    break  # Línea a medio escribir; se indexará después
+                fin = offset + len(linea_bytes)
+                if linea_bytes[11:14] == b"]: ":
+                    fecha = fecha_de_linea(linea_bytes[:14].decode("ascii", errors="replace"))
+                    if fecha is not None:
+                        entrada = self._indexar(fecha, offset, ordenar=False)
+                        if entrada:
+                            nuevas.append(entrada)
+                offset = fin
+                self.cubierto = fin
+        if any(tipo == "S" for tipo, _, _ in nuevas):
+            self.secundario.sort()
+        self._persistir(nuevas)
+
+    def _indexar(self, fecha: str, offset: int, ordenar: bool = True) -> Optional[Tuple[str, str, int]]:
+        """Clasifica una línea; devuelve la entrada que hay que guardar, si la hay."""
+        if offset in self._offsets_secundarios:
+            return None
+        if self.primario and self.primario[-1][1] == offset:
+            return None
+        if not self.primario or fecha > self.primario[-1][0]:
+            self.primario.append((fecha, offset))
+            return ("P", fecha, offset)
+        if fecha < self.primario[-1][0]:
+            if ordenar:
+                bisect.insort(self.secundario, (fecha, offset))
+            else:
+                self.secundario.append((fecha, offset))
+            self._offsets_secundarios.add(offset)
+            return ("S", fecha, offset)
+        return None
+
+    def _persistir(self, entradas: List[Tuple[str, str, int]]) -> None:
+        if not entradas:
+            return
+        self.path_indice.parent.mkdir(parents=True, exist_ok=True)
+        with self.path_indice.open("a", encoding="utf-8") as f:
+            f.write("".join(f"{tipo} {fecha} {offset}\n" for tipo, fecha, offset in entradas))
+
+    def registrar(self, fecha: str, offset: int, fin: int) -> None:
+        """Agrega al índice una línea recién escrita en [offset, fin)."""
+        if not self._cargado or offset != self.cubierto:
+            # Alguien más escribió en el reporte: ponerse al día leyendo la cola
+            self.actualizar()
+            return
+        entrada = self._indexar(fecha, offset)
+        if entrada:
+            self._persistir([entrada])
+        self.cubierto = fin
+
+    # --- Consultas ---
+    def rango(self, desde: str, hasta: str) -> List[str]:
+        """Devuelve las líneas con fecha entre `desde` y `hasta` (inclusive)."""
+        self.actualizar()
+        encontradas: List[Tuple[str, int, str]] = []
+
+        with abrir_binario(self.path_reporte) as f:
+            # Índice primario: saltar a la primera fecha >= desde y leer en orden
+            i = bisect.bisect_left(self.primario, (desde, -1))
+            if i < len(self.primario):
+                f.seek(self.primario[i][1])
+                offset = self.primario[i][1]
+                while offset < self.cubierto:
+                    linea_bytes = f.readline()
+                    if not linea_bytes:
+                        break
+                    linea = linea_bytes.decode("utf-8", errors="replace").rstrip("\r\n")
+                    fecha = fecha_de_linea(linea)
+                    if fecha is not None:
+                        if fecha > hasta:
+                            # Toda línea primaria posterior tiene fecha aún mayor
+                            break
+                        if fecha >= desde and offset not in self._offsets_secundarios:
+                            encontradas.append((fecha, offset, linea))
+                    offset += len(linea_bytes)
+
+            # Índice secundario: fechas atrasadas, ya ordenadas
+            j = bisect.bisect_left(self.secundario, (desde, -1))
+            while j < len(self.secundario) and self.secundario[j][0] <= hasta:
+                fecha, offset = self.secundario[j]
+                f.seek(offset)
+                linea = f.readline().decode("utf-8", errors="replace").rstrip("\r\n")
+                encontradas.append((fecha, offset, linea))
+                j += 1
+
+        encontradas.sort()
+        return [linea for _, _, linea in encontradas]
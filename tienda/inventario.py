@@ -0,0 +1,275 @@
+"""
+Inventario de productos con descuento de stock en cada venta.
+
+Los registros SKU -> (nombre, stock, precio) viven en memoria en un
+diccionario. En disco se guardan así:
+
+    data/inventario.txt   snapshot legible:  sku,nombre,stock,precio
+    data/inventario.log   bitácora de solo-agregar con cada cambio (JSON por línea)
+
+Cada cambio lleva un número de secuencia; el snapshot guarda el último que
+incluye, de modo que al cargar sólo se reaplican los cambios posteriores.
+Cada `CAMBIOS_POR_SNAPSHOT` cambios se reescribe el snapshot y se vacía la
+bitácora.
+
+Varias terminales pueden compartir el inventario: cada escritura toma el
+bloqueo de `data/inventario.lock` (ver `bloqueo.py`), se pone al día con
+las líneas que otras agregaron a la bitácora y recién entonces valida el
+stock y asigna el siguiente número de secuencia. Las lecturas no bloquean:
+si la bitácora creció sólo leen lo nuevo; si el snapshot cambió, recargan.
+
+Para las consultas de poco stock se mantiene una lista ordenada de
+(stock, sku), consultada con bisect.
+"""
+import bisect
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .bloqueo import bloqueo_archivo
+from .formato import normalizar_nombre
+
+CAMBIOS_POR_SNAPSHOT = 100
+
+
+class RegistroInventario:
+    """Existencias y precio de un producto."""
+    def __init__(self, sku: str, nombre: str, stock: float, precio: float) -> None:
+        self.sku = sku
+        self.nombre = nombre
+        self.stock = stock
+        self.precio = precio
+
+    def to_linea(self) -> str:
+        return f"{self.sku},{self.nombre},{self.stock:g},{self.precio:.2f}"
+
+
+class Inventario:
+    """Índice en memoria de productos persistido con bitácora y snapshots."""
+    def __init__(self, path_snapshot: Path, path_bitacora: Path,
+                 cambios_por_snapshot: int = CAMBIOS_POR_SNAPSHOT) -> None:
+        self.path_snapshot = path_snapshot
+        self.path_bitacora = path_bitacora
+        self.path_bloqueo = path_bitacora.with_suffix(".lock")
+        self.cambios_por_snapshot = cambios_por_snapshot
+        self.registros: Dict[str, RegistroInventario] = {}
+        self._por_nombre: Dict[str, str] = {}
+        self._por_stock: List[Tuple[float, str]] = []
+        self._secuencia = 0
+        self._cambios_pendientes = 0
+        self._mtime_snapshot = -1
+        self._offset_bitacora = 0
+        self._bloqueos = 0
+        self._lock = threading.RLock()
+
+    @contextmanager
+    def _bloqueo(self) -> Iterator[None]:
+        """Bloqueo del hilo y del archivo `.lock`; reentrante dentro de este objeto."""
+        with self._lock:
+            if self._bloqueos:
+                self._bloqueos += 1
+                try:
+                    yield
+                finally:
+                    self._bloqueos -= 1
+                return
+            with bloqueo_archivo(self.path_bloqueo):
+                self._bloqueos = 1
+                try:
+                    yield
+                finally:
+                    self._bloqueos = 0
+
+    # --- Carga ---
+    def _vigente(self) -> None:
+        """
+        Carga el inventario si aún no se cargó o si el snapshot cambió por
+        fuera; si sólo creció la bitácora (otra terminal registró cambios),
+        aplica las líneas nuevas.
+        """
+        try:
+            mtime = self.path_snapshot.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        try:
+            tamano = self.path_bitacora.stat().st_size
+        except FileNotFoundError:
+            tamano = 0
+        if mtime != self._mtime_snapshot or tamano < self._offset_bitacora:
+            self._cargar()
+        elif tamano > self._offset_bitacora:
+            self._leer_bitacora()
+
+    def _cargar(self) -> None:
+        self.registros.clear()
+        self._por_nombre.clear()
+        self._por_stock.clear()
+        self._secuencia = 0
+        self._cambios_pendientes = 0
+        self._offset_bitacora = 0
+
+        if self.path_snapshot.exists():
+            for linea in self.path_snapshot.read_text(encoding="utf-8").splitlines():
+                if linea.startswith("# secuencia="):
+                    self._secuencia = int(linea.split("=", 1)[1])
+                    continue
+                campos = linea.split(",")
+                if linea.startswith("#") or len(campos) < 4:
+                    continue
+                try:
+                    registro = RegistroInventario(campos[0].strip(), ",".join(campos[1:-2]).strip(),
+                                                  float(campos[-2]), float(campos[-1]))
+                except ValueError:
+                    logging.warning(f"Línea de inventario ignorada: '{linea}'")
+                    continue
+                self._indexar(registro)
+            self._mtime_snapshot = self.path_snapshot.stat().st_mtime_ns
+        else:
+            self._mtime_snapshot = None
+        self._leer_bitacora()
+
+    def _leer_bitacora(self) -> None:
+        """Aplica los cambios de la bitácora escritos después del último byte leído."""
+        try:
+            with self.path_bitacora.open("rb") as f:
+                f.seek(self._offset_bitacora)
+                datos = f.read()
+        except FileNotFoundError:
+            return
+        # La última línea puede estar a medio escribir: se lee en la próxima
+        completas = datos[:datos.rfind(b"\n") + 1]
+        self._offset_bitacora += len(completas)
+        for linea in completas.decode("utf-8", errors="replace").splitlines():
+            try:
+                cambio = json.loads(linea)
+            except json.JSONDecodeError:
+                continue  # Línea cortada por una escritura interrumpida
+            if cambio["seq"] > self._secuencia:
+                self._aplicar(cambio)
+                self._secuencia = cambio["seq"]
+                self._cambios_pendientes += 1
+
+    # --- Índices en memoria ---
+    def _indexar(self, registro: RegistroInventario) -> None:
+        anterior = self.registros.get(registro.sku)
+        if anterior is not None:
+            self._desindexar(anterior)
+        self.registros[registro.sku] = registro
+        self._por_nombre[normalizar_nombre(registro.nombre)] = registro.sku
+        bisect.insort(self._por_stock, (registro.stock, registro.sku))
+
+    def _desindexar(self, registro: RegistroInventario) -> None:
+        i = bisect.bisect_left(self._por_stock, (registro.stock, registro.sku))
+        if i < len(self._por_stock) and self._por_stock[i] == (registro.stock, registro.sku):
+            del self._por_stock[i]
+        self._por_nombre.pop(normalizar_nombre(registro.nombre), None)
+
+    def _cambiar_stock(self, registro: RegistroInventario, stock: float) -> None:
+        self._desindexar(registro)
+        registro.stock = stock
+        self._indexar(registro)
+
+    def _aplicar(self, cambio: dict) -> None:
+        if cambio["op"] == "alta":
+            self._indexar(RegistroInventario(cambio["sku"], cambio["nombre"],
+                                             cambio["stock"], cambio["precio"]))
+        elif cambio["op"] == "stock" and cambio["sku"] in self.registros:
+            registro = self.registros[cambio["sku"]]
+            self._cambiar_stock(registro, registro.stock + cambio["delta"])
+
+    # --- Persistencia ---
+    def _registrar_cambio(self, cambio: dict) -> None:
+        """
+        Escribe el cambio en la bitácora y luego lo aplica en memoria. Se
+        llama con el bloqueo tomado y después de `_vigente()`, así la
+        secuencia es la siguiente a la última escrita por cualquier terminal.
+        """
+        cambio["seq"] = self._secuencia + 1
+        linea = (json.dumps(cambio, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.path_bitacora.open("ab") as f:
+            if f.tell() > self._offset_bitacora:
+                # Quedó una línea sin terminar (escritura cortada): no se le pega esta
+                linea = b"\n" + linea
+            f.write(linea)
+            self._offset_bitacora = f.tell()
+        self._secuencia += 1
+        self._aplicar(cambio)
+        self._cambios_pendientes += 1
+        if self._cambios_pendientes >= self.cambios_por_snapshot:
+            self.guardar_snapshot()
+
+    def guardar_snapshot(self) -> None:
+        """Reescribe inventario.txt con el estado actual y vacía la bitácora."""
+        with self._bloqueo():
+            self._vigente()
+            lineas = ["# Inventario: sku,nombre,stock,precio", f"# secuencia={self._secuencia}"]
+            lineas += [r.to_linea() for r in sorted(self.registros.values(), key=lambda r: r.sku)]
+            temporal = self.path_snapshot.with_suffix(".tmp")
+            temporal.write_text("\n".join(lineas) + "\n", encoding="utf-8")
+            os.replace(temporal, self.path_snapshot)
+            self._mtime_snapshot = self.path_snapshot.stat().st_mtime_ns
+            # Si se corta aquí, la secuencia del snapshot evita reaplicar cambios
+            self.path_bitacora.write_text("", encoding="utf-8")
+            self._offset_bitacora = 0
+            self._cambios_pendientes = 0
+            logging.info(f"Snapshot de inventario guardado ({len(self.registros)} productos)")
+
+    # --- Operaciones ---
+    def alta(self, sku: str, nombre: str, stock: float, precio: float) -> RegistroInventario:
+        """Crea o reemplaza un producto."""
+        sku, nombre = sku.strip(), nombre.strip()
+        if not sku or "," in sku or not nombre:
+            raise ValueError("ERROR: SKU y nombre son obligatorios (el SKU no puede tener comas).")
+        with self._bloqueo():
+            self._vigente()
+            self._registrar_cambio({"op": "alta", "sku": sku, "nombre": nombre,
+                                    "stock": stock, "precio": precio})
+            logging.info(f"Producto dado de alta en inventario: {sku}")
+            return self.registros[sku]
+
+    def ajustar_stock(self, sku: str, delta: float) -> RegistroInventario:
+        """Suma (o resta, si es negativo) unidades al stock de un SKU."""
+        with self._bloqueo():
+            self._vigente()
+            registro = self.registros.get(sku)
+            if registro is None:
+                raise KeyError(f"ERROR: El SKU '{sku}' no existe en el inventario.")
+            if registro.stock + delta < 0:
+                raise ValueError(f"ERROR: Stock insuficiente de '{registro.nombre}' "
+                                 f"(disponible: {registro.stock:g}).")
+            self._registrar_cambio({"op": "stock", "sku": sku, "delta": delta})
+            return registro
+
+    def buscar(self, sku_o_nombre: str) -> Optional[RegistroInventario]:
+        """Busca un producto por SKU o por nombre (sin importar mayúsculas ni acentos)."""
+        with self._lock:
+            self._vigente()
+            registro = self.registros.get(sku_o_nombre.strip())
+            if registro is None:
+                sku = self._por_nombre.get(normalizar_nombre(sku_o_nombre))
+                registro = self.registros.get(sku) if sku else None
+            return registro
+
+    def descontar_venta(self, producto: str, cantidad: float) -> Optional[RegistroInventario]:
+        """Descuenta de forma atómica lo vendido; None si el producto no se inventaría."""
+        with self._bloqueo():
+            registro = self.buscar(producto)
+            if registro is None:
+                return None
+            return self.ajustar_stock(registro.sku, -cantidad)
+
+    def bajo_stock(self, umbral: float) -> List[RegistroInventario]:
+        """Productos con stock menor o igual a `umbral`, de menor a mayor."""
+        with self._lock:
+            self._vigente()
+            fin = bisect.bisect_right(self._por_stock, (umbral, "\U0010ffff"))
+            return [self.registros[sku] for _, sku in self._por_stock[:fin]]
+
+    def listar(self) -> List[RegistroInventario]:
+        with self._lock:
+            self._vigente()
+            return sorted(self.registros.values(), key=lambda r: r.sku)
@@ -0,0 +1,208 @@
+"""
+Manifiesto (catálogo) de los archivos de `data/`.
+
+Guarda en `data/indices/manifiesto.json` el tamaño de cada archivo .txt y,
+para los reportes `ventas_*.txt`, el número de ventas, el total y la
+primera/última fecha de venta. Se actualiza en cada venta registrada y en
+cada archivo creado o escrito, de modo que los listados no necesitan abrir
+los reportes.
+
+Si la carpeta cambió por fuera del sistema (su mtime no coincide con el
+guardado) o algún archivo conocido tiene otro tamaño o mtime (se editó o
+se le agregaron líneas), el manifiesto se reconcilia con el disco antes de
+usarse.
+
+Un reporte puede estar repartido en varias partes (el archivo base y los
+segmentos de cada terminal, ver `segmentos.py`). Cada entrada recuerda el
+tamaño de sus partes; si otra terminal agregó ventas, al consultar el
+reporte sólo se leen los bytes nuevos de la parte que creció. Así varios
+procesos pueden reescribir el manifiesto sin bloquearse: lo que uno pierda
+se recupera en la siguiente consulta.
+
+Los reportes archivados (`ventas_AAAA-MM.txt.gz`) aparecen con su nombre
+`.txt` y la marca `archivado`; su tamaño es el del texto descomprimido.
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .formato import parsear_linea
+from .bloques_gzip import EXTENSION
+from .segmentos import lineas_nuevas, nombres_reportes, path_base, solo_crecieron, tamanos_partes
+
+PATRON_REPORTES = "ventas_*.txt"
+
+
+class ManifiestoReportes:
+    """Catálogo en disco con metadatos de los archivos de `data/`."""
+    def __init__(self, base_dir: Path, path_manifiesto: Path) -> None:
+        self.base_dir = base_dir
+        self.path_manifiesto = path_manifiesto
+        self.archivos: Dict[str, dict] = {}
+        self.dir_mtime_ns = -1
+        self._cargado = False
+
+    # --- Persistencia ---
+    def _cargar(self) -> None:
+        self._cargado = True
+        try:
+            datos = json.loads(self.path_manifiesto.read_text(encoding="utf-8"))
+            self.archivos = datos["archivos"]
+            self.dir_mtime_ns = datos["dir_mtime_ns"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            self.archivos = {}
+            self.dir_mtime_ns = -1
+
+    def _guardar(self) -> None:
+        self.path_manifiesto.parent.mkdir(parents=True, exist_ok=True)
+        self.dir_mtime_ns = self.base_dir.stat().st_mtime_ns
+        temporal = self.path_manifiesto.with_suffix(f".{os.getpid()}.tmp")
+        temporal.write_text(
+            json.dumps({"dir_mtime_ns": self.dir_mtime_ns, "archivos": self.archivos},
+                       ensure_ascii=False, indent=1),
+            encoding="utf-8",
+        )
+        os.replace(temporal, self.path_manifiesto)
+
+    def _vigente(self, revisar_archivos: bool = True) -> None:
+        """
+        Carga el manifiesto y lo reconcilia si la carpeta o alguno de sus
+        archivos cambió por fuera. Con `revisar_archivos=False` sólo se mira
+        la carpeta (quien lo usa comprueba su propio archivo).
+        """
+        if not self._cargado:
+            self._cargar()
+        if (self.base_dir.stat().st_mtime_ns != self.dir_mtime_ns
+                or (revisar_archivos and self._archivos_cambiaron())):
+            self.reconstruir()
+
+    def _archivos_cambiaron(self) -> bool:
+        """True si algún archivo del manifiesto tiene otro tamaño o mtime que el guardado."""
+        for nombre, previo in self.archivos.items():
+            path = path_base(self.base_dir, nombre)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                return True
+            if previo["mtime_ns"] != stat.st_mtime_ns or not self._sin_cambios(previo, path, stat):
+                return True
+        return False
+
+    # --- Cálculo de metadatos ---
+    @staticmethod
+    def _es_reporte(nombre: str) -> bool:
+        return Path(nombre).match(PATRON_REPORTES)
+
+    def _escanear(self, nombre: str, previo: Optional[dict] = None) -> dict:
+        """Calcula los metadatos de un archivo, leyendo sólo lo nuevo si creció."""
+        path = path_base(self.base_dir, nombre)
+        stat = path.stat()
+        entrada = {"tamano": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if not self._es_reporte(nombre):
+            return entrada
+        if path.name.endswith(EXTENSION):
+            entrada.update(archivado=True, comprimido=stat.st_size)
+
+        partes = tamanos_partes(self.base_dir, nombre)
+        partes_previas = (previo or {}).get("partes", {})
+        entrada.update(lineas=0, total=0.0, primera=None, ultima=None)
+        if "lineas" in (previo or {}) and solo_crecieron(partes_previas, partes):
+            entrada.update(lineas=previo["lineas"], total=previo["total"],
+                           primera=previo["primera"], ultima=previo["ultima"])
+        else:
+            partes_previas = {}
+
+        for linea in lineas_nuevas(self.base_dir, partes_previas, partes):
+            self._sumar(entrada, parsear_linea(linea))
+        entrada["partes"] = partes
+        entrada["tamano"] = sum(partes.values())
+        return entrada
+
+    @staticmethod
+    def _sumar(entrada: dict, venta) -> None:
+        if venta is None:
+            return
+        entrada["lineas"] += 1
+        entrada["total"] = round(entrada["total"] + venta.subtotal, 2)
+        if entrada["primera"] is None or venta.fecha < entrada["primera"]:
+            entrada["primera"] = venta.fecha
+        if entrada["ultima"] is None or venta.fecha > entrada["ultima"]:
+            entrada["ultima"] = venta.fecha
+
+    @staticmethod
+    def _sin_cambios(previo: dict, path: Path, stat: os.stat_result) -> bool:
+        if path.name.endswith(EXTENSION):
+            # Un archivado no se modifica: basta con que ya se haya escaneado como tal
+            return path.name in previo.get("partes", {})
+        return previo.get("partes", {}).get(path.name, previo["tamano"]) == stat.st_size
+
+    def reconstruir(self) -> None:
+        """Reconcilia el manifiesto con los archivos que hay en disco."""
+        if not self._cargado:
+            self._cargar()
+        nuevos: Dict[str, dict] = {}
+        nombres = {path.name for path in self.base_dir.glob("*.txt")}
+        nombres.update(nombres_reportes(self.base_dir, PATRON_REPORTES))
+        for nombre in nombres:
+            previo = self.archivos.get(nombre)
+            path = path_base(self.base_dir, nombre)
+            stat = path.stat()
+            if previo and previo["mtime_ns"] == stat.st_mtime_ns and self._sin_cambios(previo, path, stat):
+                nuevos[nombre] = previo
+            elif previo and previo.get("partes", {}).get(path.name, previo["tamano"]) < stat.st_size:
+                nuevos[nombre] = self._escanear(nombre, previo)
+            else:
+                # No creció pero cambió su mtime: se editó, se relee entero
+                nuevos[nombre] = self._escanear(nombre)
+        self.archivos = nuevos
+        self._guardar()
+        logging.info("Manifiesto de reportes reconstruido")
+
+    # --- Actualizaciones desde GestorArchivos ---
+    def actualizar_archivo(self, nombre: str) -> None:
+        """Vuelve a calcular la entrada de un archivo creado o sobrescrito."""
+        self._vigente()
+        self.archivos[nombre] = self._escanear(nombre)
+        self._guardar()
+
+    def registrar_linea(self, nombre: str, linea: str, parte: Path, offset: int, fin: int,
+                        guardar: bool = True) -> None:
+        """
+        Suma una línea recién agregada en [offset, fin) de `parte` a su reporte.
+
+        Con `guardar=False` sólo se actualiza la memoria; quien registra un lote
+        llama a `guardar()` una vez al final.
+        """
+        self._vigente(revisar_archivos=False)
+        entrada = self.archivos.get(nombre)
+        clave = parte.relative_to(self.base_dir).as_posix()
+        if entrada is None or entrada.get("partes", {}).get(clave, 0) != offset:
+            # El manifiesto no conocía lo escrito antes: releer sólo lo necesario
+            self.archivos[nombre] = self._escanear(nombre, entrada)
+        else:
+            self._sumar(entrada, parsear_linea(linea))
+            entrada["partes"][clave] = fin
+            entrada["tamano"] = sum(entrada["partes"].values())
+            entrada["mtime_ns"] = (self.base_dir / nombre).stat().st_mtime_ns
+        if guardar:
+            self._guardar()
+
+    def guardar(self) -> None:
+        if self._cargado:
+            self._guardar()
+
+    # --- Consultas ---
+    def listar(self, solo_reportes: bool = False) -> List[str]:
+        self._vigente()
+        return sorted(n for n in self.archivos if not solo_reportes or self._es_reporte(n))
+
+    def entrada(self, nombre: str) -> Optional[dict]:
+        self._vigente()
+        entrada = self.archivos.get(nombre)
+        if entrada is not None and self._es_reporte(nombre) and entrada.get("partes") != tamanos_partes(self.base_dir, nombre):
+            # Otra terminal (u otro proceso) agregó ventas a alguna parte
+            entrada = self.archivos[nombre] = self._escanear(nombre, entrada)
+            self._guardar()
+        return entrada
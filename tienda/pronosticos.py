@@ -0,0 +1,220 @@
+"""
+Pronóstico de demanda por producto a partir de los rollups diarios.
+
+No vuelve a leer los reportes: arma una matriz productos x días con las
+cantidades de `RollupsVentas.cantidades_por_dia` para las últimas
+`DIAS_HISTORIA` fechas (hasta el último día con ventas) y calcula todo con
+NumPy sobre la matriz completa, sin un ciclo por producto:
+
+    media_7, media_28   promedio diario de los últimos 7 y 28 días
+    estacionalidad      índice por día de la semana: promedio de ese día
+                        entre el promedio general (1.0 = día normal)
+    nivel               suavizado exponencial simple (ALFA) de la serie sin
+                        estacionalidad, como producto con pesos ya calculados
+    demanda             nivel x índice de cada uno de los próximos
+                        `DIAS_PRONOSTICO` días
+
+Los resultados se guardan en `data/indices/pronosticos.json` con una huella
+de cada producto: su serie en la ventana y el día de la semana del corte.
+Al regenerar sólo se recalculan los productos cuya huella cambió (o todos,
+si cambiaron los parámetros). La fecha de corte no invalida el caché
+entero: cuando avanza, la ventana de cada producto se desplaza y cambia su
+huella, pero un producto cuya serie alineada quedó igual conserva su
+pronóstico.
+
+NumPy se importa recién al calcular: sin él, el resto del sistema funciona
+y `generar` lanza ImportError con un mensaje "ERROR: ...".
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+from .archivado import mes_de_reporte
+from .rollups import RollupsVentas
+from .segmentos import nombres_reportes
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DIAS_HISTORIA = 56  # 8 semanas completas: cada día de la semana aparece 8 veces
+DIAS_PRONOSTICO = 7
+ALFA = 0.3
+DIAS_SEMANA = ("lun", "mar", "mié", "jue", "vie", "sáb", "dom")
+
+
+def _inicio_ventana(hasta: date) -> date:
+    return hasta - timedelta(days=DIAS_HISTORIA - 1)
+
+
+def _mes(dia: date) -> Tuple[int, int]:
+    return dia.year, dia.month
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("ERROR: El pronóstico de demanda requiere numpy (pip install numpy).") from None
+    return numpy
+
+
+class PronosticoProducto(NamedTuple):
+    """Demanda esperada de un producto."""
+    producto: str
+    media_7: float
+    media_28: float
+    nivel: float
+    demanda: float  # Unidades en los próximos DIAS_PRONOSTICO días
+    dia_fuerte: str  # Día de la semana con más ventas
+
+
+def calcular(cantidades: "np.ndarray", hasta: date, alfa: float = ALFA,
+             dias_pronostico: int = DIAS_PRONOSTICO) -> "np.ndarray":
+    """
+    Pronósticos de una matriz productos x días que termina en `hasta`.
+
+    Devuelve una matriz con una fila por producto y las columnas
+    media_7, media_28, nivel, demanda y día fuerte (0 = lunes).
+    """
+    np = _numpy()
+    productos, dias = cantidades.shape
+    dia_semana = (np.arange(dias) + (hasta.weekday() - dias + 1)) % 7
+    una_caliente = np.eye(7)[dia_semana]  # días x 7
+
+    media = cantidades.mean(axis=1)
+    media_por_dia = (cantidades @ una_caliente) / np.maximum(una_caliente.sum(axis=0), 1)
+    indices = np.divide(media_por_dia, media[:, None], out=np.ones_like(media_por_dia),
+                        where=media[:, None] > 0)
+
+    # Sin estacionalidad; donde el índice es 0 las cantidades también lo son
+    indice_diario = indices[:, dia_semana]
+    desestacionalizada = np.divide(cantidades, indice_diario, out=np.zeros_like(cantidades),
+                                   where=indice_diario > 0)
+    # Nivel del suavizado exponencial: L = sum(w_t * x_t), con w_0 = (1-a)^(n-1)
+    # y w_t = a * (1-a)^(n-1-t); equivale a aplicar la recurrencia día por día
+    pesos = alfa * (1 - alfa) ** np.arange(dias - 1, -1, -1, dtype=np.float64)
+    pesos[0] = (1 - alfa) ** (dias - 1)
+    nivel = desestacionalizada @ pesos
+
+    proximos = (hasta.weekday() + 1 + np.arange(dias_pronostico)) % 7
+    demanda = nivel * indices[:, proximos].sum(axis=1)
+
+    resultado = np.empty((productos, 5))
+    resultado[:, 0] = cantidades[:, -7:].mean(axis=1)
+    resultado[:, 1] = cantidades[:, -28:].mean(axis=1)
+    resultado[:, 2] = nivel
+    resultado[:, 3] = demanda
+    resultado[:, 4] = media_por_dia.argmax(axis=1)
+    return resultado
+
+
+class PronosticoDemanda:
+    """Pronósticos por producto con caché de los que no cambiaron."""
+    def __init__(self, base_dir: Path, rollups: RollupsVentas, path_cache: Path) -> None:
+        self.base_dir = base_dir
+        self.rollups = rollups
+        self.path_cache = path_cache
+
+    # --- Series diarias ---
+    def _cantidades_recientes(self, hasta: Optional[date]) -> Tuple[Optional[date], Dict[str, Dict[str, float]]]:
+        """Fecha de corte y fecha -> {producto: cantidad} de los reportes que la cubren."""
+        nombres = nombres_reportes(self.base_dir)
+        por_fecha: Dict[str, Dict[str, float]] = {}
+
+        def sumar(nombre_reporte: str) -> List[str]:
+            dias = self.rollups.cantidades_por_dia(nombre_reporte)
+            for fecha, del_dia in dias.items():
+                acumulado = por_fecha.setdefault(fecha, {})
+                for producto, cantidad in del_dia.items():
+                    acumulado[producto] = acumulado.get(producto, 0) + cantidad
+            return list(dias)
+
+        # Reportes con otro nombre: se leen siempre (no se sabe de qué mes son)
+        fechas = [f for nombre in nombres if mes_de_reporte(nombre) is None for f in sumar(nombre)]
+        mensuales = sorted((n for n in nombres if mes_de_reporte(n)), key=mes_de_reporte, reverse=True)
+        for nombre in mensuales:
+            if hasta is not None and mes_de_reporte(nombre) < _mes(_inicio_ventana(hasta)):
+                break  # Este y los anteriores quedan fuera de la ventana
+            fechas_reporte = sumar(nombre)
+            if hasta is None and (fechas or fechas_reporte):
+                hasta = date.fromisoformat(max(fechas + fechas_reporte))
+        return hasta, por_fecha
+
+    def _matriz(self, hasta: date, por_fecha: Dict[str, Dict[str, float]]) -> Tuple[List[str], "np.ndarray"]:
+        np = _numpy()
+        inicio = _inicio_ventana(hasta)
+        codigos: Dict[str, int] = {}
+        filas: List[int] = []
+        columnas: List[int] = []
+        valores: List[float] = []
+        for fecha, del_dia in por_fecha.items():
+            columna = (date.fromisoformat(fecha) - inicio).days
+            if not 0 <= columna < DIAS_HISTORIA:
+                continue
+            for producto, cantidad in del_dia.items():
+                filas.append(codigos.setdefault(producto, len(codigos)))
+                columnas.append(columna)
+                valores.append(cantidad)
+        cantidades = np.zeros((len(codigos), DIAS_HISTORIA))
+        np.add.at(cantidades, (np.array(filas, dtype=np.intp), np.array(columnas, dtype=np.intp)),
+                  np.array(valores, dtype=np.float64))
+        return list(codigos), cantidades
+
+    # --- Caché ---
+    def _cargar_cache(self) -> dict:
+        try:
+            return json.loads(self.path_cache.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _guardar_cache(self, cache: dict) -> None:
+        self.path_cache.parent.mkdir(parents=True, exist_ok=True)
+        temporal = self.path_cache.with_suffix(f".{os.getpid()}.tmp")
+        temporal.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporal, self.path_cache)
+
+    # --- Pronóstico ---
+    def generar(self, hasta: Optional[date] = None) -> Tuple[Optional[date], List[PronosticoProducto], int]:
+        """
+        (fecha de corte, pronósticos de mayor a menor demanda, productos recalculados).
+
+        Sin `hasta` se usa el último día con ventas.
+        """
+        _numpy()  # Antes de leer nada: sin numpy no hay pronóstico
+        inicio = time.perf_counter()
+        hasta, por_fecha = self._cantidades_recientes(hasta)
+        if hasta is None:
+            return None, [], 0
+        productos, cantidades = self._matriz(hasta, por_fecha)
+
+        # La fecha de corte no va en el contexto: cada huella incluye el día de
+        # la semana del corte, y la serie ya está alineada a la ventana
+        contexto = {"dias": DIAS_HISTORIA, "pronostico": DIAS_PRONOSTICO, "alfa": ALFA}
+        cache = self._cargar_cache()
+        anteriores = cache.get("productos", {}) if cache.get("contexto") == contexto else {}
+        fase = bytes([hasta.weekday()])
+        huellas = [hashlib.blake2b(fase + fila.tobytes(), digest_size=8).hexdigest() for fila in cantidades]
+        cambiados = [i for i, (producto, huella) in enumerate(zip(productos, huellas))
+                     if anteriores.get(producto, {}).get("huella") != huella]
+
+        vigentes = {producto: anteriores[producto] for producto in productos if producto in anteriores}
+        if cambiados:
+            calculados = calcular(cantidades[cambiados], hasta)
+            for i, fila in zip(cambiados, calculados.tolist()):
+                vigentes[productos[i]] = {"huella": huellas[i], "valores": fila}
+        if cambiados or len(vigentes) != len(anteriores):
+            self._guardar_cache({"contexto": contexto, "productos": vigentes})
+
+        pronosticos = [
+            PronosticoProducto(producto, media_7, media_28, nivel, demanda, DIAS_SEMANA[int(dia)])
+            for producto, (media_7, media_28, nivel, demanda, dia)
+            in ((p, vigentes[p]["valores"]) for p in productos)]
+        pronosticos.sort(key=lambda p: p.demanda, reverse=True)
+        logging.info(f"Pronóstico de demanda al {hasta}: {len(cambiados)} de {len(productos)} "
+                     f"productos recalculados en {time.perf_counter() - inicio:.3f} s")
+        return hasta, pronosticos, len(cambiados)
@@ -0,0 +1,86 @@
+"""
+Prueba de carga del servidor POS con miles de cajeros simulados.
+
+Cada cajero abre su propia conexión y registra ventas una tras otra,
+midiendo cuánto tarda cada respuesta. Sin --puerto se levanta un servidor
+en este mismo proceso sobre una carpeta temporal.
+
+Uso:
+    python -m tienda.prueba_carga_pos [--cajeros 2000] [--ventas 20] [--host H --puerto P]
+"""
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from tienda import cargar_sistema_ventas
+from tienda.servidor_pos import HOST, ClientePOS, ServidorPOS
+
+REPORTE = "ventas_2025-09.txt"
+
+
+async def cajero(numero: int, ventas: int, host: str, puerto: int,
+                 latencias: List[float], errores: List[str]) -> None:
+    async with ClientePOS(host, puerto) as cliente:
+        for i in range(ventas):
+            inicio = time.perf_counter()
+            respuesta = await cliente.venta(REPORTE, f"cajero{numero}", f"producto {i % 25}",
+                                            1 + i % 3, 12.5, f"2025-09-{1 + i % 28:02d}")
+            latencias.append(time.perf_counter() - inicio)
+            if not respuesta["ok"]:
+                errores.append(respuesta["error"])
+
+
+def percentil(valores: List[float], p: float) -> float:
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+
+async def ejecutar(args) -> None:
+    servidor = None
+    if args.puerto is None:
+        sistema = cargar_sistema_ventas()
+        logging.disable(logging.CRITICAL)
+        base_dir = Path(tempfile.mkdtemp(prefix="pos_"))
+        gestor = sistema.GestorArchivos(base_dir)
+        gestor.crear_reporte_mensual(2025, 9)
+        servidor = ServidorPOS(gestor, sistema.Venta, sistema.Usuario, HOST, 0)
+        await servidor.iniciar()
+        args.puerto = servidor.puerto
+
+    latencias: List[float] = []
+    errores: List[str] = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cajero(n, args.ventas, args.host, args.puerto, latencias, errores)
+                           for n in range(args.cajeros)))
+    duracion = time.perf_counter() - inicio
+
+    if servidor is not None:
+        await servidor.detener()
+        _, total = await asyncio.to_thread(servidor.gestor.leer_reporte, REPORTE)
+        print(f"Reporte en {servidor.gestor.base_dir}: total ${total:.2f}")
+
+    latencias.sort()
+    print(f"{args.cajeros} cajeros x {args.ventas} ventas = {len(latencias)} ventas en {duracion:.2f} s "
+          f"({len(latencias) / duracion:.0f} ventas/s)")
+    print(f"Latencia p50: {percentil(latencias, 0.50) * 1000:.1f} ms | "
+          f"p99: {percentil(latencias, 0.99) * 1000:.1f} ms | "
+          f"máx: {latencias[-1] * 1000:.1f} ms")
+    if errores:
+        print(f"Errores: {len(errores)} (primero: {errores[0]})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor POS.")
+    parser.add_argument("--cajeros", type=int, default=2000)
+    parser.add_argument("--ventas", type=int, default=20, help="ventas por cajero")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=None,
+                        help="servidor ya en marcha (si se omite, se levanta uno temporal)")
+    asyncio.run(ejecutar(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Prueba de estrés: muchas terminales registrando ventas a la vez.
+
+Lanza varios procesos, cada uno con su propio TIENDA_TERMINAL, que intentan
+crear el mismo reporte mensual y luego registran ventas en él. Al final se
+comprueba, sobre la vista consolidada de `leer_reporte`, que:
+
+    - sólo un proceso logró crear el reporte,
+    - no se perdió ni se duplicó ninguna venta,
+    - ninguna línea quedó corrupta o mezclada con otra,
+    - el manifiesto, los rollups y la consulta por rango cuentan lo mismo.
+
+Uso:
+    python -m tienda.prueba_concurrencia [procesos] [ventas_por_proceso]
+"""
+import logging
+import multiprocessing
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from tienda import cargar_sistema_ventas
+from tienda.formato import parsear_linea
+
+
+def escritor(base_dir: str, numero: int, ventas: int, creados) -> None:
+    sistema = cargar_sistema_ventas()
+    logging.disable(logging.CRITICAL)
+    gestor = sistema.GestorArchivos(Path(base_dir), terminal=f"caja{numero}")
+    try:
+        gestor.crear_reporte_mensual(2025, 9)
+        creados.put(numero)
+    except FileExistsError:
+        pass
+    while not (Path(base_dir) / "ventas_2025-09.txt").exists():
+        time.sleep(0.001)
+
+    usuario = sistema.Usuario(f"cajero{numero}")
+    for i in range(ventas):
+        venta = sistema.Venta(f"p{numero}-{i}", 1, 1.0, usuario)
+        gestor.registrar_venta("ventas_2025-09.txt", venta, (1 + i * 28 // ventas, 9, 2025))
+
+
+def main() -> None:
+    procesos = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    ventas = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    with tempfile.TemporaryDirectory() as base_dir:
+        creados = multiprocessing.Queue()
+        inicio = time.perf_counter()
+        trabajadores = [multiprocessing.Process(target=escritor, args=(base_dir, n, ventas, creados))
+                        for n in range(procesos)]
+        for proceso in trabajadores:
+            proceso.start()
+        for proceso in trabajadores:
+            proceso.join()
+        duracion = time.perf_counter() - inicio
+        errores = []
+
+        if any(p.exitcode != 0 for p in trabajadores):
+            errores.append("algún proceso escritor terminó con error")
+        ganadores = []
+        while not creados.empty():
+            ganadores.append(creados.get())
+        if len(ganadores) != 1:
+            errores.append(f"el reporte se creó {len(ganadores)} veces")
+
+        gestor = cargar_sistema_ventas().GestorArchivos(Path(base_dir))
+        logging.disable(logging.CRITICAL)
+        contenido, total = gestor.leer_reporte("ventas_2025-09.txt")
+        lineas = contenido.splitlines()
+        esperadas = Counter(f"p{n}-{i}" for n in range(procesos) for i in range(ventas))
+        vistas = Counter()
+        for linea in lineas:
+            venta = parsear_linea(linea)
+            if venta is None or venta.vendedor != f"cajero{venta.producto[1:].split('-')[0]}":
+                errores.append(f"línea corrupta: {linea!r}")
+                continue
+            vistas[venta.producto] += 1
+        if vistas != esperadas:
+            faltan = sum((esperadas - vistas).values())
+            sobran = sum((vistas - esperadas).values())
+            errores.append(f"ventas perdidas: {faltan}, duplicadas: {sobran}")
+        fechas = [linea[1:11] for linea in lineas]
+        if fechas != sorted(fechas):
+            errores.append("la vista consolidada no está ordenada por fecha")
+        if round(total) != procesos * ventas:
+            errores.append(f"total {total} distinto de {procesos * ventas}")
+
+        info = gestor.info_archivo("ventas_2025-09.txt")
+        if info["lineas"] != procesos * ventas:
+            errores.append(f"el manifiesto cuenta {info['lineas']} ventas")
+        ventas_rollup, total_rollup, _ = gestor.resumen_reporte("ventas_2025-09.txt")
+        if ventas_rollup != procesos * ventas or round(total_rollup) != procesos * ventas:
+            errores.append(f"el rollup cuenta {ventas_rollup} ventas y ${total_rollup:.2f}")
+        en_rango, _ = gestor.ventas_por_rango("ventas_2025-09.txt", datetime(2025, 9, 1), datetime(2025, 9, 28))
+        if len(en_rango) != procesos * ventas:
+            errores.append(f"la consulta por rango devolvió {len(en_rango)} ventas")
+
+    print(f"{procesos} terminales x {ventas} ventas en {duracion:.2f} s "
+          f"({procesos * ventas / duracion:.0f} ventas/s)")
+    if errores:
+        print("FALLÓ:")
+        for error in errores[:20]:
+            print(f"  - {error}")
+        sys.exit(1)
+    print("OK: ninguna venta perdida ni corrupta.")
+
+
+if __name__ == "__main__":
+    main()
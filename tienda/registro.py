@@ -0,0 +1,84 @@
+"""
+Configuración del logging del sistema de ventas.
+
+Los registros no se escriben en el hilo que los emite: `QueueHandler` los
+deja en una cola y un `QueueListener` en segundo plano los escribe en disco,
+así una venta nunca espera al disco. El archivo rota por tamaño (o por
+tiempo, si se indica `cuando`) y los respaldos rotados pueden comprimirse
+con gzip.
+"""
+import atexit
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+from pathlib import Path
+from typing import Optional
+
+FORMATO = "%(asctime)s [%(levelname)s] - %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _nombre_gzip(nombre: str) -> str:
+    return nombre + ".gz"
+
+
+def _rotar_gzip(origen: str, destino: str) -> None:
+    """Comprime el archivo rotado en lugar de sólo renombrarlo."""
+    with open(origen, "rb") as f_origen, gzip.open(destino, "wb") as f_destino:
+        shutil.copyfileobj(f_origen, f_destino)
+    os.remove(origen)
+
+
+def configurar_logging(path_log: Path, nivel: int = logging.INFO,
+                       max_bytes: int = 5 * 1024 * 1024, respaldos: int = 5,
+                       cuando: Optional[str] = None, comprimir: bool = False) -> logging.handlers.QueueListener:
+    """
+    Envía el logging raíz a `path_log` a través de una cola.
+
+    Args:
+        max_bytes: Tamaño a partir del cual se rota (si no se usa `cuando`).
+        respaldos: Cuántos archivos rotados se conservan.
+        cuando: Rotación por tiempo ('midnight', 'H', 'D'...), ver TimedRotatingFileHandler.
+        comprimir: Si los archivos rotados se guardan como .gz.
+    """
+    global _listener
+    detener_logging()
+
+    if cuando:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            path_log, when=cuando, backupCount=respaldos, encoding="utf-8", delay=True)
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            path_log, maxBytes=max_bytes, backupCount=respaldos, encoding="utf-8", delay=True)
+    if comprimir:
+        handler.namer = _nombre_gzip
+        handler.rotator = _rotar_gzip
+    handler.setFormatter(logging.Formatter(FORMATO))
+
+    cola: queue.SimpleQueue = queue.SimpleQueue()
+    raiz = logging.getLogger()
+    for anterior in raiz.handlers[:]:
+        raiz.removeHandler(anterior)
+    raiz.addHandler(logging.handlers.QueueHandler(cola))
+    raiz.setLevel(nivel)
+
+    _listener = logging.handlers.QueueListener(cola, handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def detener_logging() -> None:
+    """Vacía la cola pendiente y cierra el archivo de log."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(detener_logging)
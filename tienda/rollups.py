@@ -0,0 +1,158 @@
+"""
+Totales materializados (rollups) de los reportes de ventas.
+
+Por cada reporte se guarda en `data/indices/rollups/<reporte>.json`:
+
+    dias       fecha -> [ventas, centavos]
+    productos  fecha -> {producto: [cantidad, centavos]}
+    mes        [ventas, centavos]
+
+Los montos van en centavos enteros para que sumar miles de ventas no
+acumule errores de redondeo. `GestorArchivos.registrar_ventas` suma cada
+línea nueva al escribirla, así que consultar el total de un mes, de un día
+o de un producto no vuelve a leer el reporte.
+
+Igual que el manifiesto, cada rollup recuerda el tamaño de las partes del
+reporte que ya sumó (ver `segmentos.py`). Si otra terminal agregó ventas
+sólo se leen los bytes nuevos; si una parte se achicó o desapareció (el
+reporte se editó a mano) se reconstruye desde cero.
+
+Reconstruir todos desde los reportes:
+    python "proyecto final manager de tienda.py" rollups
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .formato import parsear_linea
+from .segmentos import lineas_nuevas, solo_crecieron, tamanos_partes
+
+
+def _centavos(monto: float) -> int:
+    return int(round(monto * 100))
+
+
+class RollupsVentas:
+    """Totales por día, por producto y día, y por mes de cada reporte."""
+    def __init__(self, base_dir: Path, dir_rollups: Path) -> None:
+        self.base_dir = base_dir
+        self.dir_rollups = dir_rollups
+        self._rollups: Dict[str, dict] = {}
+
+    # --- Persistencia ---
+    def _path(self, nombre_reporte: str) -> Path:
+        return self.dir_rollups / (Path(nombre_reporte).stem + ".json")
+
+    @staticmethod
+    def _vacio() -> dict:
+        return {"partes": {}, "mes": [0, 0], "dias": {}, "productos": {}}
+
+    def _cargar(self, nombre_reporte: str) -> dict:
+        if nombre_reporte not in self._rollups:
+            try:
+                rollup = json.loads(self._path(nombre_reporte).read_text(encoding="utf-8"))
+                if not all(clave in rollup for clave in ("partes", "mes", "dias", "productos")):
+                    raise KeyError("rollup incompleto")
+            except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+                rollup = self._vacio()
+            self._rollups[nombre_reporte] = rollup
+        return self._rollups[nombre_reporte]
+
+    def guardar(self, nombre_reporte: str) -> None:
+        rollup = self._rollups.get(nombre_reporte)
+        if rollup is None:
+            return
+        self.dir_rollups.mkdir(parents=True, exist_ok=True)
+        path = self._path(nombre_reporte)
+        temporal = path.with_suffix(f".{os.getpid()}.tmp")
+        temporal.write_text(json.dumps(rollup, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporal, path)
+
+    # --- Mantenimiento ---
+    @staticmethod
+    def _sumar(rollup: dict, linea: str) -> None:
+        venta = parsear_linea(linea)
+        if venta is None:
+            return
+        centavos = _centavos(venta.subtotal)
+        rollup["mes"][0] += 1
+        rollup["mes"][1] += centavos
+        dia = rollup["dias"].setdefault(venta.fecha, [0, 0])
+        dia[0] += 1
+        dia[1] += centavos
+        producto = rollup["productos"].setdefault(venta.fecha, {}).setdefault(venta.producto, [0, 0])
+        producto[0] += venta.cantidad
+        producto[1] += centavos
+
+    def _sincronizar(self, nombre_reporte: str) -> dict:
+        """Suma lo agregado al reporte desde la última vez (o lo rehace si cambió)."""
+        rollup = self._cargar(nombre_reporte)
+        partes = tamanos_partes(self.base_dir, nombre_reporte)
+        if partes == rollup["partes"]:
+            return rollup
+        if not solo_crecieron(rollup["partes"], partes):
+            logging.warning(f"Rollup reconstruido: {nombre_reporte}")
+            rollup = self._rollups[nombre_reporte] = self._vacio()
+        for linea in lineas_nuevas(self.base_dir, rollup["partes"], partes):
+            self._sumar(rollup, linea)
+        rollup["partes"] = partes
+        self.guardar(nombre_reporte)
+        return rollup
+
+    def registrar_linea(self, nombre_reporte: str, linea: str, parte: Path,
+                        offset: int, fin: int) -> None:
+        """
+        Suma una línea recién agregada en [offset, fin) de `parte`.
+
+        Sólo actualiza la memoria; quien registra llama a `guardar()` al final
+        del lote.
+        """
+        rollup = self._cargar(nombre_reporte)
+        clave = parte.relative_to(self.base_dir).as_posix()
+        if rollup["partes"].get(clave, 0) != offset:
+            # Hay ventas que el rollup no vio (de otra terminal o de antes)
+            self._sincronizar(nombre_reporte)
+            return
+        self._sumar(rollup, linea)
+        rollup["partes"][clave] = fin
+
+    def reconstruir(self, nombre_reporte: str) -> None:
+        """Descarta el rollup de un reporte y lo vuelve a calcular desde las líneas."""
+        self._rollups[nombre_reporte] = self._vacio()
+        self._path(nombre_reporte).unlink(missing_ok=True)
+        self._sincronizar(nombre_reporte)
+        self.guardar(nombre_reporte)
+
+    # --- Consultas ---
+    def mensual(self, nombre_reporte: str) -> Tuple[int, float]:
+        """(número de ventas, total) del reporte."""
+        ventas, centavos = self._sincronizar(nombre_reporte)["mes"]
+        return ventas, centavos / 100
+
+    def por_dia(self, nombre_reporte: str) -> List[Tuple[str, int, float]]:
+        """(fecha, ventas, total) de cada día con ventas, en orden."""
+        dias = self._sincronizar(nombre_reporte)["dias"]
+        return [(fecha, ventas, centavos / 100) for fecha, (ventas, centavos) in sorted(dias.items())]
+
+    def por_producto(self, nombre_reporte: str, desde: Optional[str] = None,
+                     hasta: Optional[str] = None) -> List[Tuple[str, float, float]]:
+        """(producto, cantidad, total) entre dos fechas ISO, de mayor a menor total."""
+        productos = self._sincronizar(nombre_reporte)["productos"]
+        acumulado: Dict[str, List[float]] = {}
+        for fecha, del_dia in productos.items():
+            if (desde and fecha < desde) or (hasta and fecha > hasta):
+                continue
+            for producto, (cantidad, centavos) in del_dia.items():
+                suma = acumulado.setdefault(producto, [0, 0])
+                suma[0] += cantidad
+                suma[1] += centavos
+        return sorted(((p, c, cent / 100) for p, (c, cent) in acumulado.items()),
+                      key=lambda fila: fila[2], reverse=True)
+
+    def cantidades_por_dia(self, nombre_reporte: str) -> Dict[str, Dict[str, float]]:
+        """fecha -> {producto: cantidad vendida} del reporte."""
+        productos = self._sincronizar(nombre_reporte)["productos"]
+        return {fecha: {producto: cantidad for producto, (cantidad, _) in del_dia.items()}
+                for fecha, del_dia in productos.items()}
@@ -0,0 +1,150 @@
+"""
+Segmentos por terminal de los reportes de ventas.
+
+Cuando varias cajas usan la misma carpeta `data/`, cada una escribe sus
+ventas en su propio archivo en lugar de en `ventas_AAAA-MM.txt`:
+
+    data/segmentos/ventas_2025-09/caja1.txt
+    data/segmentos/ventas_2025-09/equipo-4321.txt
+
+El nombre es el de la variable de entorno TIENDA_TERMINAL o, si no está
+definida, `<equipo>-<pid>` (ver `terminal_actual`), así ningún archivo
+tiene dos escritores. Al leer, el reporte base y sus segmentos se combinan
+ordenados por la fecha de cada línea.
+
+El único bloqueo es el de `bloqueo_reporte`
+(`data/segmentos/ventas_AAAA-MM.lock`): quien escribe lo toma para
+comprobar que el mes no está archivado y agregar sus líneas, y el
+archivado lo toma mientras comprime y borra las partes. Así nadie recrea
+un `.txt` o un segmento de un mes que se está archivando.
+
+Cada parte está en orden de escritura, que casi siempre es el de fecha; una
+venta con fecha atrasada queda fuera de orden. `mezclar_lineas` (mezcla
+k-way en streaming) supone partes ordenadas y deja esa venta donde fue
+escrita; `ordenar_lineas` ordena de verdad y es la que usan la vista
+consolidada de un reporte y el archivado.
+
+Un reporte de un mes cerrado puede estar archivado como
+`ventas_AAAA-MM.txt.gz` (ver `archivado.py`); en ese caso esa es su parte
+base y se lee descomprimiendo por bloques (ver `bloques_gzip.py`).
+"""
+import heapq
+import itertools
+import os
+import re
+import socket
+from pathlib import Path
+from typing import ContextManager, Dict, Iterable, Iterator, List, Optional
+
+from .bloqueo import bloqueo_archivo
+from .bloques_gzip import EXTENSION, abrir_binario, tamano
+from .formato import fecha_de_linea
+
+DIR_SEGMENTOS = "segmentos"
+PATRON_TERMINAL = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+def validar_terminal(terminal: str) -> str:
+    """Comprueba que el identificador sirva como nombre de archivo."""
+    if not PATRON_TERMINAL.match(terminal):
+        raise ValueError(f"ERROR: Identificador de terminal inválido: '{terminal}' "
+                         "(usa letras, números, '-' o '_').")
+    return terminal
+
+
+def terminal_actual() -> str:
+    """
+    Identificador de esta terminal: TIENDA_TERMINAL si está definida o, si
+    no, `<equipo>-<pid>`, de modo que dos procesos nunca comparten segmento.
+    """
+    terminal = os.environ.get("TIENDA_TERMINAL")
+    if terminal:
+        return validar_terminal(terminal)
+    equipo = re.sub(r"[^A-Za-z0-9_-]", "_", socket.gethostname())[:40] or "terminal"
+    return f"{equipo}-{os.getpid()}"
+
+
+def path_segmento(base_dir: Path, nombre_reporte: str, terminal: str) -> Path:
+    return base_dir / DIR_SEGMENTOS / Path(nombre_reporte).stem / f"{terminal}.txt"
+
+
+def bloqueo_reporte(base_dir: Path, nombre_reporte: str) -> ContextManager[None]:
+    """Bloqueo entre procesos para escribir en un reporte o archivarlo."""
+    return bloqueo_archivo(base_dir / DIR_SEGMENTOS / f"{Path(nombre_reporte).stem}.lock")
+
+
+def path_base(base_dir: Path, nombre_reporte: str) -> Path:
+    """El `.txt` del reporte o, si no existe y está archivado, su `.txt.gz`."""
+    path = base_dir / nombre_reporte
+    archivado = base_dir / (nombre_reporte + EXTENSION)
+    return archivado if not path.exists() and archivado.exists() else path
+
+
+def nombres_reportes(base_dir: Path, patron: str = "ventas_*.txt") -> List[str]:
+    """Nombres `.txt` de los reportes en disco, incluidos los archivados."""
+    nombres = {path.name for path in base_dir.glob(patron)}
+    nombres.update(path.name[:-len(EXTENSION)] for path in base_dir.glob(patron + EXTENSION))
+    return sorted(nombres)
+
+
+def esta_archivado(base_dir: Path, nombre_reporte: str) -> bool:
+    return path_base(base_dir, nombre_reporte).name.endswith(EXTENSION)
+
+
+def partes_reporte(base_dir: Path, nombre_reporte: str) -> List[Path]:
+    """El archivo base de un reporte seguido de sus segmentos existentes."""
+    partes = [path_base(base_dir, nombre_reporte)]
+    dir_segmentos = base_dir / DIR_SEGMENTOS / Path(nombre_reporte).stem
+    if dir_segmentos.is_dir():
+        partes += sorted(dir_segmentos.glob("*.txt"))
+    return partes
+
+
+def terminal_de_parte(path: Path) -> Optional[str]:
+    """Terminal dueña de un segmento, o None si es el archivo base."""
+    return path.stem if path.parent.parent.name == DIR_SEGMENTOS else None
+
+
+def _clave_fecha(linea: str) -> str:
+    # Las líneas sin fecha (comentarios) van al inicio
+    return fecha_de_linea(linea) or ""
+
+
+def mezclar_lineas(fuentes: Iterable[Iterable[str]]) -> Iterator[str]:
+    """
+    Mezcla k-way de varias secuencias de líneas ordenadas por fecha. Una
+    línea fuera de orden dentro de su fuente no se reubica.
+    """
+    return heapq.merge(*fuentes, key=_clave_fecha)
+
+
+def ordenar_lineas(fuentes: Iterable[Iterable[str]]) -> List[str]:
+    """
+    Líneas de todas las fuentes ordenadas por fecha, aunque alguna venta
+    tenga fecha atrasada. El orden es estable y, como las partes ya vienen
+    casi ordenadas, `sorted` (Timsort) trabaja en tiempo casi lineal.
+    """
+    return sorted(itertools.chain.from_iterable(fuentes), key=_clave_fecha)
+
+
+def tamanos_partes(base_dir: Path, nombre_reporte: str) -> Dict[str, int]:
+    """Tamaño actual de cada parte, con su ruta relativa a `base_dir` como clave."""
+    return {path.relative_to(base_dir).as_posix(): tamano(path)
+            for path in partes_reporte(base_dir, nombre_reporte) if path.exists()}
+
+
+def solo_crecieron(previas: Dict[str, int], actuales: Dict[str, int]) -> bool:
+    """True si ninguna parte conocida desapareció ni se achicó (sólo se agregó)."""
+    return all(actuales.get(parte, -1) >= tamano_previo for parte, tamano_previo in previas.items())
+
+
+def lineas_nuevas(base_dir: Path, previas: Dict[str, int], actuales: Dict[str, int]) -> Iterator[str]:
+    """Líneas escritas en cada parte entre los tamaños `previas` y `actuales`."""
+    for parte, tamano_actual in actuales.items():
+        desde = previas.get(parte, 0)
+        if tamano_actual <= desde:
+            continue
+        with abrir_binario(base_dir / parte) as f:
+            f.seek(desde)
+            for linea_bytes in f:
+                yield linea_bytes.decode("utf-8", errors="replace")
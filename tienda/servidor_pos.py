@@ -0,0 +1,262 @@
+"""
+Servidor asyncio para que las cajas envíen ventas a una sola tienda.
+
+Protocolo: JSON por línea sobre TCP (por defecto 127.0.0.1:8765). Cada
+petición lleva un `id` que se repite en su respuesta, así el cliente puede
+enviar varias sin esperar (las respuestas pueden llegar en otro orden).
+
+    -> {"id": 1, "op": "venta", "reporte": "ventas_2025-09.txt", "vendedor": "ana",
+        "producto": "Café", "cantidad": 2, "precio": 50.0, "fecha": "2025-09-10"}
+    <- {"id": 1, "ok": true, "subtotal": 100.0}
+
+    -> {"id": 2, "op": "leer", "reporte": "ventas_2025-09.txt"}
+    <- {"id": 2, "ok": true, "total": 100.0, "contenido": "..."}
+
+    <- {"id": ..., "ok": false, "error": "ERROR: ..."}
+
+`reporte` tiene que ser un nombre `ventas_AAAA-MM.txt`; cualquier otro se
+rechaza antes de tocar el disco.
+
+Las ventas aceptadas entran a una cola acotada. Una tarea escritora la
+vacía por lotes, agrupa por reporte y escribe cada grupo con una sola
+llamada a `GestorArchivos.vender_lote` (en un hilo, para no frenar el
+bucle). Si la cola se llena, las conexiones dejan de leer del socket hasta
+que haya lugar: el cliente nota la contrapresión en su `drain()`. Además,
+cada conexión tiene a lo sumo `PENDIENTES_POR_CONEXION` peticiones en curso.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from .archivado import PATRON_MES
+from .formato import validar_campos_venta
+
+HOST = "127.0.0.1"
+PUERTO = 8765
+TAMANO_COLA = 10_000
+TAMANO_LOTE = 500
+PENDIENTES_POR_CONEXION = 1_000
+LIMITE_LINEA = 1024 * 1024
+
+
+class ServidorPOS:
+    """Recibe ventas por TCP y las escribe en lotes con un GestorArchivos."""
+    def __init__(self, gestor, clase_venta, clase_usuario,
+                 host: str = HOST, puerto: int = PUERTO,
+                 tamano_cola: int = TAMANO_COLA, tamano_lote: int = TAMANO_LOTE) -> None:
+        self.gestor = gestor
+        self.clase_venta = clase_venta
+        self.clase_usuario = clase_usuario
+        self.host = host
+        self.puerto = puerto
+        self.tamano_lote = tamano_lote
+        self.cola: "asyncio.Queue[Tuple[str, Any, Tuple[int, int, int], asyncio.Future]]" = \
+            asyncio.Queue(maxsize=tamano_cola)
+        self._usuarios: Dict[str, Any] = {}
+        self._con_lugar = asyncio.Event()
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        self._escritor: Optional[asyncio.Task] = None
+
+    # --- Ciclo de vida ---
+    async def iniciar(self) -> None:
+        self._escritor = asyncio.create_task(self._escribir_lotes())
+        self._servidor = await asyncio.start_server(
+            self._atender, self.host, self.puerto, limit=LIMITE_LINEA)
+        self.puerto = self._servidor.sockets[0].getsockname()[1]
+        logging.info(f"Servidor POS escuchando en {self.host}:{self.puerto}")
+
+    async def detener(self) -> None:
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        await self.cola.join()
+        if self._escritor is not None:
+            self._escritor.cancel()
+
+    async def servir(self) -> None:
+        await self.iniciar()
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    # --- Conexiones ---
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        pendientes = asyncio.Semaphore(PENDIENTES_POR_CONEXION)
+        tareas = set()
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not linea:
+                    break
+                while self.cola.full():  # Contrapresión: no se lee más hasta que haya lugar
+                    self._con_lugar.clear()
+                    await self._con_lugar.wait()
+                await pendientes.acquire()
+                tarea = asyncio.create_task(self._responder(linea, escritor))
+                tareas.add(tarea)
+                tarea.add_done_callback(lambda t: (tareas.discard(t), pendientes.release()))
+            if tareas:
+                await asyncio.gather(*tareas, return_exceptions=True)
+        finally:
+            escritor.close()
+
+    async def _responder(self, linea: bytes, escritor: asyncio.StreamWriter) -> None:
+        peticion_id = None
+        try:
+            peticion = json.loads(linea)
+            peticion_id = peticion.get("id")
+            respuesta = await self._procesar(peticion)
+        except (json.JSONDecodeError, AttributeError):
+            respuesta = {"ok": False, "error": "ERROR: Petición no es JSON válido."}
+        except (KeyError, TypeError, ValueError) as e:
+            mensaje = str(e) if str(e).startswith("ERROR") else f"ERROR: Petición inválida ({e})."
+            respuesta = {"ok": False, "error": mensaje}
+        except OSError as e:
+            respuesta = {"ok": False, "error": str(e)}
+        except Exception as e:
+            # Cualquier otro fallo también se responde: el cliente no queda esperando
+            logging.error(f"Error inesperado en el servidor POS: {type(e).__name__}: {e}")
+            respuesta = {"ok": False, "error": "ERROR: Error interno del servidor."}
+        respuesta["id"] = peticion_id
+        escritor.write(json.dumps(respuesta, ensure_ascii=False).encode("utf-8") + b"\n")
+        try:
+            await escritor.drain()
+        except ConnectionError:
+            pass
+
+    @staticmethod
+    def _nombre_reporte(peticion: dict) -> str:
+        """El reporte pedido, sólo si es un `ventas_AAAA-MM.txt` (nunca una ruta)."""
+        nombre = peticion["reporte"]
+        if not isinstance(nombre, str) or not PATRON_MES.match(nombre):
+            raise ValueError("ERROR: Reporte inválido (se espera un nombre ventas_AAAA-MM.txt).")
+        return nombre
+
+    async def _procesar(self, peticion: dict) -> dict:
+        operacion = peticion.get("op", "venta")
+        if operacion == "leer":
+            nombre_reporte = self._nombre_reporte(peticion)
+            contenido, total = await asyncio.to_thread(self.gestor.leer_reporte, nombre_reporte)
+            return {"ok": True, "total": total, "contenido": contenido}
+        if operacion != "venta":
+            raise ValueError(f"operación desconocida '{operacion}'")
+
+        nombre_reporte, venta, fecha = self._crear_venta(peticion)
+        resultado = asyncio.get_running_loop().create_future()
+        await self.cola.put((nombre_reporte, venta, fecha, resultado))  # Contrapresión
+        await resultado
+        return {"ok": True, "subtotal": round(venta.subtotal, 2)}
+
+    def _crear_venta(self, peticion: dict):
+        nombre_reporte = self._nombre_reporte(peticion)
+        vendedor = str(peticion["vendedor"]).strip()
+        producto = str(peticion["producto"]).strip()
+        validar_campos_venta(vendedor, producto)
+        dt = datetime.strptime(peticion["fecha"], "%Y-%m-%d")
+        if vendedor not in self._usuarios:
+            self._usuarios[vendedor] = self.clase_usuario(vendedor)
+        venta = self.clase_venta(producto, float(peticion["cantidad"]),
+                                 float(peticion["precio"]), self._usuarios[vendedor])
+        return nombre_reporte, venta, (dt.day, dt.month, dt.year)
+
+    # --- Escritura por lotes ---
+    async def _escribir_lotes(self) -> None:
+        while True:
+            lote = [await self.cola.get()]
+            while len(lote) < self.tamano_lote and not self.cola.empty():
+                lote.append(self.cola.get_nowait())
+            self._con_lugar.set()
+
+            por_reporte = defaultdict(list)
+            for nombre_reporte, venta, fecha, resultado in lote:
+                por_reporte[nombre_reporte].append((venta, fecha, resultado))
+            for nombre_reporte, grupo in por_reporte.items():
+                try:
+                    errores = await asyncio.to_thread(
+                        self.gestor.vender_lote, nombre_reporte, [(v, f) for v, f, _ in grupo])
+                except Exception as e:
+                    logging.error(f"Fallo al escribir lote en '{nombre_reporte}': {e}")
+                    errores = [e] * len(grupo)
+                for (_, _, resultado), error in zip(grupo, errores):
+                    if resultado.done():
+                        continue
+                    if error is None:
+                        resultado.set_result(None)
+                    else:
+                        resultado.set_exception(error)
+            for _ in lote:
+                self.cola.task_done()
+
+
+class ClientePOS:
+    """Cliente asyncio del ServidorPOS; permite varias peticiones en vuelo."""
+    def __init__(self, host: str = HOST, puerto: int = PUERTO) -> None:
+        self.host = host
+        self.puerto = puerto
+        self._lector: Optional[asyncio.StreamReader] = None
+        self._escritor: Optional[asyncio.StreamWriter] = None
+        self._esperando: Dict[int, asyncio.Future] = {}
+        self._siguiente_id = 0
+        self._receptor: Optional[asyncio.Task] = None
+
+    async def conectar(self) -> "ClientePOS":
+        self._lector, self._escritor = await asyncio.open_connection(
+            self.host, self.puerto, limit=LIMITE_LINEA)
+        self._receptor = asyncio.create_task(self._recibir())
+        return self
+
+    async def cerrar(self) -> None:
+        if self._escritor is not None:
+            self._escritor.close()
+            try:
+                await self._escritor.wait_closed()
+            except ConnectionError:
+                pass
+        if self._receptor is not None:
+            self._receptor.cancel()
+
+    async def __aenter__(self) -> "ClientePOS":
+        return await self.conectar()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.cerrar()
+
+    async def _recibir(self) -> None:
+        try:
+            while True:
+                linea = await self._lector.readline()
+                if not linea:
+                    break
+                respuesta = json.loads(linea)
+                futuro = self._esperando.pop(respuesta.get("id"), None)
+                if futuro is not None and not futuro.done():
+                    futuro.set_result(respuesta)
+        finally:
+            for futuro in self._esperando.values():
+                if not futuro.done():
+                    futuro.set_exception(ConnectionError("ERROR: Conexión cerrada por el servidor."))
+            self._esperando.clear()
+
+    async def enviar(self, peticion: dict) -> dict:
+        """Envía una petición y espera su respuesta."""
+        self._siguiente_id += 1
+        peticion = dict(peticion, id=self._siguiente_id)
+        futuro = asyncio.get_running_loop().create_future()
+        self._esperando[self._siguiente_id] = futuro
+        self._escritor.write(json.dumps(peticion, ensure_ascii=False).encode("utf-8") + b"\n")
+        await self._escritor.drain()
+        return await futuro
+
+    async def venta(self, reporte: str, vendedor: str, producto: str,
+                    cantidad: float, precio: float, fecha: str) -> dict:
+        return await self.enviar({"op": "venta", "reporte": reporte, "vendedor": vendedor,
+                                  "producto": producto, "cantidad": cantidad,
+                                  "precio": precio, "fecha": fecha})
+
+    async def leer(self, reporte: str) -> dict:
+        return await self.enviar({"op": "leer", "reporte": reporte})
@@ -0,0 +1,14 @@
+"""
+Seguimiento del tiempo de juego de cuentas de Steam.
+
+Los datos viven en `data/`:
+
+    data/raw/         respuestas de la Web API de Steam tal como llegan
+                      (`instantaneas/`: deduplicadas y como diferencias)
+    data/processed/   series de tiempo y resúmenes derivados
+"""
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+DIR_RAW = DATA_DIR / "raw"
+DIR_PROCESSED = DATA_DIR / "processed"
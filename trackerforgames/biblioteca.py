@@ -0,0 +1,148 @@
+"""
+Estadísticas de bibliotecas de Steam calculadas por columnas.
+
+Carga la lista `games` de `steam_data.json` (o de una respuesta de
+GetOwnedGames) en arreglos de NumPy, uno por campo, en vez de recorrer un
+dict por juego:
+
+    cuentas             int32   índice de la cuenta (ver `steamids`)
+    appids              int64
+    minutos             int64   playtime_forever
+    plataformas         int64   minutos en windows, mac, linux y deck (n x 4)
+    minutos_2semanas    int64   playtime_2weeks (de `games` o de `recent_games`)
+    ultima_vez          int64   rtime_last_played (segundos Unix, 0 = nunca)
+
+`analizar()` calcula todas las secciones del reporte de una pasada para
+todas las cuentas: los totales con `np.bincount` por cuenta y los top N con
+`argpartition` (sólo se ordenan los N elegidos), así que el mismo código
+sirve para una biblioteca de 400 juegos, de 50 mil o para cientos de
+cuentas juntas.
+
+Uso:
+    python -m trackerforgames.biblioteca steam_data.json [OTRO.json ...] [--top 10]
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+PLATAFORMAS = ("windows", "mac", "linux", "deck")
+
+
+def top_n(valores: np.ndarray, grupos: np.ndarray, cantidad_grupos: int, n: int) -> List[np.ndarray]:
+    """
+    Índices de los `n` mayores `valores` (> 0) de cada grupo, de mayor a
+    menor. Con un solo grupo usa `argpartition`; con varios, un único
+    ordenamiento por (grupo, valor).
+    """
+    candidatos = np.flatnonzero(valores > 0)
+    if cantidad_grupos == 1:
+        if len(candidatos) > n:
+            candidatos = candidatos[np.argpartition(-valores[candidatos], n - 1)[:n]]
+        return [candidatos[np.argsort(-valores[candidatos], kind="stable")]]
+    orden = candidatos[np.lexsort((-valores[candidatos], grupos[candidatos]))]
+    inicios = np.searchsorted(grupos[orden], np.arange(cantidad_grupos + 1))
+    return [orden[inicios[g]:min(inicios[g] + n, inicios[g + 1])] for g in range(cantidad_grupos)]
+
+
+class Biblioteca:
+    """Juegos de una o varias cuentas, por columnas."""
+    def __init__(self, cuentas: np.ndarray, appids: np.ndarray, minutos: np.ndarray,
+                 plataformas: np.ndarray, minutos_2semanas: np.ndarray, ultima_vez: np.ndarray,
+                 nombres: List[str], steamids: List[str]) -> None:
+        self.cuentas = cuentas.astype(np.int32, copy=False)
+        self.appids = appids.astype(np.int64, copy=False)
+        self.minutos = minutos.astype(np.int64, copy=False)
+        self.plataformas = plataformas.astype(np.int64, copy=False).reshape(-1, len(PLATAFORMAS))
+        self.minutos_2semanas = minutos_2semanas.astype(np.int64, copy=False)
+        self.ultima_vez = ultima_vez.astype(np.int64, copy=False)
+        self.nombres = nombres
+        self.steamids = steamids
+
+    def __len__(self) -> int:
+        return len(self.appids)
+
+    # --- Construcción ---
+    @classmethod
+    def desde_datos(cls, lista_datos: Sequence[dict]) -> "Biblioteca":
+        """Una cuenta por elemento: dicts con la forma de `steam_data.json` o de GetOwnedGames."""
+        cuentas: List[int] = []
+        filas: List[tuple] = []
+        nombres: List[str] = []
+        steamids: List[str] = []
+        for cuenta, datos in enumerate(lista_datos):
+            juegos = datos.get("games") or datos.get("response", {}).get("games", [])
+            recientes = {juego["appid"]: juego.get("playtime_2weeks", 0)
+                         for juego in datos.get("recent_games", [])}
+            steamids.append(str(datos.get("profile", {}).get("steamid", cuenta)))
+            for juego in juegos:
+                appid = juego["appid"]
+                filas.append((appid, juego.get("playtime_forever", 0),
+                              *(juego.get(f"playtime_{p}_forever", 0) for p in PLATAFORMAS),
+                              juego.get("playtime_2weeks", recientes.get(appid, 0)),
+                              juego.get("rtime_last_played", 0)))
+                nombres.append(juego.get("name", str(appid)))
+            cuentas.extend([cuenta] * len(juegos))
+        columnas = np.array(filas, dtype=np.int64).reshape(len(filas), 8)
+        return cls(np.array(cuentas, dtype=np.int32), columnas[:, 0], columnas[:, 1], columnas[:, 2:6],
+                   columnas[:, 6], columnas[:, 7], nombres, steamids)
+
+    @classmethod
+    def desde_archivos(cls, paths: Sequence[Path]) -> "Biblioteca":
+        return cls.desde_datos([json.loads(Path(p).read_text(encoding="utf-8")) for p in paths])
+
+    # --- Análisis ---
+    def analizar(self, top: int = 10, cuentas: Optional[int] = None) -> List[dict]:
+        """
+        Secciones del reporte de cada cuenta (minutos enteros; los top son
+        listas de índices de juego, ver `juego()`).
+        """
+        cantidad = cuentas if cuentas is not None else len(self.steamids)
+
+        def por_cuenta(pesos: np.ndarray) -> np.ndarray:
+            return np.bincount(self.cuentas, weights=pesos, minlength=cantidad).astype(np.int64)
+
+        juegos = np.bincount(self.cuentas, minlength=cantidad)
+        jugados = por_cuenta(self.minutos > 0)
+        minutos = por_cuenta(self.minutos)
+        minutos_2semanas = por_cuenta(self.minutos_2semanas)
+        activos = por_cuenta(self.minutos_2semanas > 0)
+        plataformas = np.stack([por_cuenta(self.plataformas[:, i]) for i in range(len(PLATAFORMAS))], axis=1)
+        top_total = top_n(self.minutos, self.cuentas, cantidad, top)
+        top_2semanas = top_n(self.minutos_2semanas, self.cuentas, cantidad, top)
+        recientes = top_n(self.ultima_vez, self.cuentas, cantidad, top)
+
+        return [{
+            "steamid": self.steamids[c] if c < len(self.steamids) else str(c),
+            "juegos": int(juegos[c]),
+            "minutos": int(minutos[c]),
+            "jugados": int(jugados[c]),
+            "nunca_jugados": int(juegos[c] - jugados[c]),
+            "minutos_2semanas": int(minutos_2semanas[c]),
+            "activos_2semanas": int(activos[c]),
+            "plataformas": dict(zip(PLATAFORMAS, plataformas[c].tolist())),
+            "top_total": top_total[c].tolist(),
+            "top_2semanas": top_2semanas[c].tolist(),
+            "recientes": recientes[c].tolist(),
+        } for c in range(cantidad)]
+
+    def juego(self, indice: int) -> dict:
+        return {"appid": int(self.appids[indice]), "nombre": self.nombres[indice],
+                "minutos": int(self.minutos[indice]),
+                "minutos_2semanas": int(self.minutos_2semanas[indice]),
+                "ultima_vez": int(self.ultima_vez[indice])}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estadísticas de bibliotecas de Steam")
+    parser.add_argument("archivos", nargs="+", type=Path)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    biblioteca = Biblioteca.desde_archivos(args.archivos)
+    for seccion in biblioteca.analizar(args.top):
+        for clave in ("top_total", "top_2semanas", "recientes"):
+            seccion[clave] = [biblioteca.juego(i) for i in seccion[clave]]
+        print(json.dumps(seccion, ensure_ascii=False, indent=2))
@@ -0,0 +1,229 @@
+"""
+Cliente de la Web API de Steam con conexiones persistentes y caché en disco.
+
+    GetOwnedGames           IPlayerService/GetOwnedGames/v0001
+    GetRecentlyPlayedGames  IPlayerService/GetRecentlyPlayedGames/v0001
+    GetPlayerSummaries      ISteamUser/GetPlayerSummaries/v0002
+
+- Conexiones: un pool de `http.client` por host. Cada conexión se devuelve
+  al pool después de leer la respuesta completa, así las peticiones
+  siguientes reutilizan el mismo socket (HTTP/1.1 keep-alive) en lugar de
+  abrir uno nuevo con su handshake TLS.
+- Caché: cada respuesta se guarda en `data/cache_api/<hash>.json` (la URL
+  sin la clave de la API) con su ETag / Last-Modified. Mientras no vence el
+  TTL de su endpoint se responde desde el disco; vencida, se revalida con
+  If-None-Match / If-Modified-Since y un 304 sólo renueva la fecha.
+- Reintentos: errores de red, 429 y 5xx se reintentan con espera
+  exponencial con jitter completo (o lo que pida Retry-After). Si se agotan
+  y hay una copia vencida en caché, se usa esa.
+- Límite de velocidad: si se asigna `limitador` (una función sin
+  argumentos que bloquea hasta que se pueda seguir), se llama antes de cada
+  petición que sale a la red, reintentos incluidos; las respuestas de la
+  caché no pasan por él.
+
+Para probar sin conexión, `servidor_falso.py` reproduce los JSON grabados:
+    python -m trackerforgames.servidor_falso
+    STEAM_API_URL=http://127.0.0.1:8780 python -m trackerforgames.trackerforgames
+"""
+import hashlib
+import http.client
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from . import DATA_DIR
+
+URL_API = "https://api.steampowered.com"
+ENDPOINTS = {
+    "GetOwnedGames": "/IPlayerService/GetOwnedGames/v0001/",
+    "GetRecentlyPlayedGames": "/IPlayerService/GetRecentlyPlayedGames/v0001/",
+    "GetPlayerSummaries": "/ISteamUser/GetPlayerSummaries/v0002/",
+}
+# Segundos que una respuesta se usa sin preguntar a Steam
+TTL_ENDPOINT = {
+    "GetOwnedGames": 3600,
+    "GetRecentlyPlayedGames": 600,
+    "GetPlayerSummaries": 86400,
+}
+REINTENTOS = 4
+ESPERA_BASE = 0.5
+ESPERA_MAXIMA = 30.0
+TIEMPO_LIMITE = 15.0
+CONEXIONES_POR_HOST = 8
+
+
+class ClienteSteam:
+    """Llamadas a la Web API de Steam con caché, revalidación y reintentos."""
+    def __init__(self, clave: Optional[str] = None, url_base: Optional[str] = None,
+                 dir_cache: Path = DATA_DIR / "cache_api", reintentos: int = REINTENTOS,
+                 ttl: Optional[Dict[str, float]] = None, conexiones: int = CONEXIONES_POR_HOST,
+                 limitador: Optional[Callable[[], None]] = None) -> None:
+        self.clave = clave if clave is not None else os.environ.get("STEAM_API_KEY", "")
+        partes = urlsplit(url_base or os.environ.get("STEAM_API_URL", URL_API))
+        self.esquema, self.host = partes.scheme, partes.netloc
+        self.dir_cache = dir_cache
+        self.reintentos = reintentos
+        self.ttl = {**TTL_ENDPOINT, **(ttl or {})}
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(conexiones)
+        self.estadisticas = {"cache": 0, "revalidadas": 0, "descargadas": 0, "reintentos": 0, "vencidas": 0}
+        self._lock_estadisticas = threading.Lock()  # Se llama desde varios hilos a la vez
+        self.limitador = limitador
+
+    # --- Conexiones ---
+    def _conexion(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """(conexión, si es reutilizada del pool)."""
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            clase = http.client.HTTPSConnection if self.esquema == "https" else http.client.HTTPConnection
+            return clase(self.host, timeout=TIEMPO_LIMITE), False
+
+    def _devolver(self, conexion: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conexion)
+        except queue.Full:
+            conexion.close()
+
+    def cerrar(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _pedir(self, ruta: str, cabeceras: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        if self.limitador is not None:
+            self.limitador()
+        conexion, reutilizada = self._conexion()
+        try:
+            conexion.request("GET", ruta, headers={"Accept-Encoding": "identity", **cabeceras})
+            respuesta = conexion.getresponse()
+            cuerpo = respuesta.read()
+        except (ConnectionError, http.client.RemoteDisconnected):
+            conexion.close()
+            if not reutilizada:
+                raise
+            # El servidor cerró la conexión inactiva: se repite con una nueva
+            return self._pedir(ruta, cabeceras)
+        except (OSError, http.client.HTTPException):
+            conexion.close()
+            raise
+        if respuesta.will_close:
+            conexion.close()
+        else:
+            self._devolver(conexion)
+        return respuesta.status, {k.lower(): v for k, v in respuesta.getheaders()}, cuerpo
+
+    # --- Caché ---
+    def _path_cache(self, ruta_sin_clave: str) -> Path:
+        return self.dir_cache / (hashlib.sha256(ruta_sin_clave.encode("utf-8")).hexdigest()[:32] + ".json")
+
+    def _leer_cache(self, path: Path) -> Optional[dict]:
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _guardar_cache(self, path: Path, entrada: dict) -> None:
+        self.dir_cache.mkdir(parents=True, exist_ok=True)
+        temporal = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temporal.write_text(json.dumps(entrada, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporal, path)
+
+    # --- Llamadas ---
+    def _contar(self, clave: str) -> None:
+        with self._lock_estadisticas:
+            self.estadisticas[clave] += 1
+
+    def _espera(self, intento: int, cabeceras: Dict[str, str]) -> float:
+        reintentar_en = cabeceras.get("retry-after", "")
+        if reintentar_en.isdigit():
+            return min(float(reintentar_en), ESPERA_MAXIMA)
+        # Jitter completo: evita que muchos clientes reintenten a la vez
+        return random.uniform(0, min(ESPERA_MAXIMA, ESPERA_BASE * 2 ** intento))
+
+    def llamar(self, endpoint: str, **parametros) -> dict:
+        """Respuesta JSON de un endpoint, desde la caché si sigue vigente."""
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"ERROR: Endpoint desconocido '{endpoint}'.")
+        consulta = urlencode(sorted({**parametros, "format": "json"}.items()))
+        ruta_sin_clave = f"{ENDPOINTS[endpoint]}?{consulta}"
+        ruta = f"{ENDPOINTS[endpoint]}?{urlencode({'key': self.clave})}&{consulta}"
+        path = self._path_cache(ruta_sin_clave)
+        entrada = self._leer_cache(path)
+        if entrada is not None and time.time() - entrada["guardado"] < self.ttl.get(endpoint, 0):
+            self._contar("cache")
+            return entrada["datos"]
+
+        cabeceras = {}
+        if entrada is not None:
+            if entrada.get("etag"):
+                cabeceras["If-None-Match"] = entrada["etag"]
+            if entrada.get("last_modified"):
+                cabeceras["If-Modified-Since"] = entrada["last_modified"]
+
+        ultimo_error = ""
+        for intento in range(self.reintentos + 1):
+            if intento:
+                self._contar("reintentos")
+            try:
+                estado, cabeceras_respuesta, cuerpo = self._pedir(ruta, cabeceras)
+            except (OSError, http.client.HTTPException) as e:
+                ultimo_error = f"{type(e).__name__}: {e}"
+                time.sleep(self._espera(intento, {}))
+                continue
+
+            if estado == 304 and entrada is not None:
+                entrada["guardado"] = time.time()
+                self._guardar_cache(path, entrada)
+                self._contar("revalidadas")
+                return entrada["datos"]
+            if estado == 200:
+                datos = json.loads(cuerpo)
+                self._guardar_cache(path, {
+                    "ruta": ruta_sin_clave, "guardado": time.time(), "datos": datos,
+                    "etag": cabeceras_respuesta.get("etag"),
+                    "last_modified": cabeceras_respuesta.get("last-modified"),
+                })
+                self._contar("descargadas")
+                return datos
+            if estado == 429 or estado >= 500:
+                ultimo_error = f"HTTP {estado}"
+                time.sleep(self._espera(intento, cabeceras_respuesta))
+                continue
+            raise ValueError(f"ERROR: Steam respondió HTTP {estado} a {endpoint}.")
+
+        if entrada is not None:
+            logging.warning(f"Steam no responde ({ultimo_error}); se usa la copia vencida de {endpoint}")
+            self._contar("vencidas")
+            return entrada["datos"]
+        raise ConnectionError(f"ERROR: No se pudo llamar a {endpoint} tras {self.reintentos + 1} "
+                              f"intentos ({ultimo_error}).")
+
+    # --- Endpoints ---
+    def juegos(self, steamid: str) -> dict:
+        return self.llamar("GetOwnedGames", steamid=steamid, include_appinfo=1,
+                           include_played_free_games=1)
+
+    def recientes(self, steamid: str) -> dict:
+        return self.llamar("GetRecentlyPlayedGames", steamid=steamid)
+
+    def perfiles(self, *steamids: str) -> dict:
+        return self.llamar("GetPlayerSummaries", steamids=",".join(steamids))
+
+    def instantanea(self, steamid: str) -> dict:
+        """Perfil, juegos y recientes de una cuenta con la forma de `steam_data.json`."""
+        jugadores = self.perfiles(steamid).get("response", {}).get("players", [])
+        return {
+            "profile": jugadores[0] if jugadores else {"steamid": steamid},
+            "games": self.juegos(steamid).get("response", {}).get("games", []),
+            "recent_games": self.recientes(steamid).get("response", {}).get("games", []),
+            "last_update": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
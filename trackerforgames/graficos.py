@@ -0,0 +1,256 @@
+"""
+Gráficos de la semana de juego (PNG y SVG) con caché por hash de la serie.
+
+`data/processed/semana.png` era una imagen de 3571x2964 en color completo
+(339 KB) que se rehacía en cada corrida. Aquí cada gráfico de barras de los
+últimos 7 días se dibuja sin interfaz ni dependencias:
+
+    - PNG con paleta de 5 colores (1 byte por píxel, zlib nivel 9), en
+      varios tamaños de una vez; los rótulos usan una fuente de mapa de
+      bits de 3x5 píxeles.
+    - SVG con los mismos datos y el título, que escala a cualquier tamaño.
+
+La clave de cada gráfico es el hash de sus minutos diarios, fechas y
+título; `graficos/indice.json` la guarda y, si no cambió y los archivos
+existen, no se vuelve a dibujar. En lote (muchas cuentas o juegos) los que
+cambiaron se reparten en un `ProcessPoolExecutor`.
+
+Uso:
+    python -m trackerforgames.graficos [--juegos N] [--procesos N]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from . import DIR_PROCESSED
+
+VERSION = 1  # Cambiarla invalida la caché cuando cambia el dibujo
+TAMANOS = {"": (640, 360), "@2x": (1280, 720)}  # Sufijo del archivo -> (ancho, alto)
+INICIALES = "LMXJVSD"  # Lunes a domingo
+
+# Paleta: fondo, ejes, barras, texto, cuadrícula
+PALETA = bytes([255, 255, 255, 120, 120, 120, 52, 120, 200, 40, 40, 40, 228, 228, 228])
+FONDO, EJE, BARRA, TEXTO, CUADRICULA = range(5)
+
+# Fuente de 3x5: cada glifo son 5 filas de 3 bits
+FUENTE = {
+    "0": (7, 5, 5, 5, 7), "1": (2, 6, 2, 2, 7), "2": (7, 1, 7, 4, 7), "3": (7, 1, 7, 1, 7),
+    "4": (5, 5, 7, 1, 1), "5": (7, 4, 7, 1, 7), "6": (7, 4, 7, 5, 7), "7": (7, 1, 1, 2, 2),
+    "8": (7, 5, 7, 5, 7), "9": (7, 5, 7, 1, 7), ".": (0, 0, 0, 0, 2), "h": (4, 4, 7, 5, 5),
+    "m": (0, 0, 7, 7, 5), "L": (4, 4, 4, 4, 7), "M": (5, 7, 7, 5, 5), "X": (5, 5, 2, 5, 5),
+    "J": (1, 1, 1, 5, 7), "V": (5, 5, 5, 5, 2), "S": (7, 4, 7, 1, 7), "D": (6, 5, 5, 5, 6),
+    " ": (0, 0, 0, 0, 0),
+}
+
+
+class Grafico(NamedTuple):
+    """Datos de un gráfico: `nombre` da los archivos `<nombre>.svg` y `<nombre><sufijo>.png`."""
+    nombre: str
+    titulo: str
+    hasta: date  # Último día de la semana
+    minutos: Tuple[int, ...]  # 7 valores, del más antiguo a `hasta`
+
+
+def huella(grafico: Grafico) -> str:
+    contenido = json.dumps([VERSION, sorted(TAMANOS.items()), grafico.titulo,
+                            grafico.hasta.isoformat(), list(grafico.minutos)], ensure_ascii=False)
+    return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+
+
+def _rotulo(minutos: int) -> str:
+    return f"{minutos}m" if minutos < 60 else f"{minutos / 60:.1f}h"
+
+
+def _dias(grafico: Grafico) -> List[date]:
+    return [grafico.hasta - timedelta(days=6 - i) for i in range(7)]
+
+
+# --- PNG ---
+def _texto(lienzo: np.ndarray, texto: str, x: int, y: int, escala: int) -> None:
+    """Escribe `texto` centrado en x, con la base en y."""
+    ancho = (len(texto) * 4 - 1) * escala
+    izquierda, arriba = x - ancho // 2, y - 5 * escala
+    for i, caracter in enumerate(texto):
+        for fila, bits in enumerate(FUENTE.get(caracter, FUENTE[" "])):
+            for columna in range(3):
+                if bits & (4 >> columna):
+                    x0 = izquierda + (i * 4 + columna) * escala
+                    y0 = arriba + fila * escala
+                    lienzo[max(y0, 0):y0 + escala, max(x0, 0):x0 + escala] = TEXTO
+
+
+def dibujar(grafico: Grafico, ancho: int, alto: int) -> np.ndarray:
+    """Índices de la paleta de cada píxel (alto x ancho)."""
+    escala = max(1, round(ancho / 320))
+    lienzo = np.full((alto, ancho), FONDO, dtype=np.uint8)
+    izquierda, derecha = 10 * escala, ancho - 10 * escala
+    arriba, abajo = 16 * escala, alto - 14 * escala
+    minutos = np.array(grafico.minutos, dtype=np.int64)
+    maximo = max(int(minutos.max()), 1)
+
+    for nivel in (0.25, 0.5, 0.75, 1.0):
+        y = abajo - round((abajo - arriba) * nivel)
+        lienzo[y, izquierda:derecha] = CUADRICULA
+    ancho_columna = (derecha - izquierda) / 7
+    for i, (dia, valor) in enumerate(zip(_dias(grafico), minutos.tolist())):
+        centro = round(izquierda + ancho_columna * (i + 0.5))
+        mitad = round(ancho_columna * 0.35)
+        tope = abajo - round((abajo - arriba) * valor / maximo)
+        lienzo[tope:abajo, centro - mitad:centro + mitad] = BARRA
+        _texto(lienzo, INICIALES[dia.weekday()], centro, alto - 4 * escala, escala)
+        if valor:
+            _texto(lienzo, _rotulo(valor), centro, tope - 3 * escala, escala)
+    lienzo[abajo, izquierda:derecha] = EJE
+    return lienzo
+
+
+def codificar_png(lienzo: np.ndarray) -> bytes:
+    """PNG con paleta (tipo de color 3, 8 bits) de una matriz de índices."""
+    alto, ancho = lienzo.shape
+
+    def bloque(tipo: bytes, datos: bytes) -> bytes:
+        return struct.pack(">I", len(datos)) + tipo + datos + struct.pack(">I", zlib.crc32(tipo + datos))
+
+    filas = np.hstack([np.zeros((alto, 1), dtype=np.uint8), lienzo])  # Filtro 0 en cada fila
+    return (b"\x89PNG\r\n\x1a\n"
+            + bloque(b"IHDR", struct.pack(">IIBBBBB", ancho, alto, 8, 3, 0, 0, 0))
+            + bloque(b"PLTE", PALETA)
+            + bloque(b"IDAT", zlib.compress(filas.tobytes(), 9))
+            + bloque(b"IEND", b""))
+
+
+# --- SVG ---
+def dibujar_svg(grafico: Grafico, ancho: int = 640, alto: int = 360) -> str:
+    izquierda, derecha, arriba, abajo = 40, ancho - 20, 50, alto - 40
+    maximo = max(max(grafico.minutos), 1)
+    ancho_columna = (derecha - izquierda) / 7
+    partes = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {ancho} {alto}" '
+              f'font-family="sans-serif" font-size="13">',
+              f'<rect width="{ancho}" height="{alto}" fill="#fff"/>',
+              f'<text x="{ancho / 2}" y="28" text-anchor="middle" font-size="17">{escape(grafico.titulo)}</text>']
+    for nivel in (0.25, 0.5, 0.75, 1.0):
+        y = abajo - (abajo - arriba) * nivel
+        partes.append(f'<line x1="{izquierda}" x2="{derecha}" y1="{y:.1f}" y2="{y:.1f}" stroke="#e4e4e4"/>')
+    for i, (dia, valor) in enumerate(zip(_dias(grafico), grafico.minutos)):
+        x = izquierda + ancho_columna * (i + 0.15)
+        alto_barra = (abajo - arriba) * valor / maximo
+        centro = izquierda + ancho_columna * (i + 0.5)
+        partes.append(f'<rect x="{x:.1f}" y="{abajo - alto_barra:.1f}" width="{ancho_columna * 0.7:.1f}" '
+                      f'height="{alto_barra:.1f}" fill="#3478c8"><title>{dia:%d/%m}: {_rotulo(valor)}</title></rect>')
+        partes.append(f'<text x="{centro:.1f}" y="{abajo + 18}" text-anchor="middle">{INICIALES[dia.weekday()]} {dia:%d/%m}</text>')
+        if valor:
+            partes.append(f'<text x="{centro:.1f}" y="{abajo - alto_barra - 6:.1f}" '
+                          f'text-anchor="middle" fill="#282828">{_rotulo(valor)}</text>')
+    partes.append(f'<line x1="{izquierda}" x2="{derecha}" y1="{abajo}" y2="{abajo}" stroke="#787878"/>')
+    partes.append("</svg>")
+    return "\n".join(partes) + "\n"
+
+
+def renderizar(grafico: Grafico, dir_salida: str) -> List[str]:
+    """Escribe el SVG y un PNG por tamaño; devuelve los nombres de archivo."""
+    salidas = []
+    # El nombre puede traer subcarpetas (p. ej. "graficos/semana_<appid>")
+    (Path(dir_salida) / grafico.nombre).parent.mkdir(parents=True, exist_ok=True)
+    for sufijo, (ancho, alto) in TAMANOS.items():
+        nombre = f"{grafico.nombre}{sufijo}.png"
+        (Path(dir_salida) / nombre).write_bytes(codificar_png(dibujar(grafico, ancho, alto)))
+        salidas.append(nombre)
+    nombre = f"{grafico.nombre}.svg"
+    (Path(dir_salida) / nombre).write_text(dibujar_svg(grafico), encoding="utf-8")
+    salidas.append(nombre)
+    return salidas
+
+
+class GeneradorGraficos:
+    """Dibuja sólo los gráficos cuya serie cambió desde la última vez."""
+    def __init__(self, dir_salida: Path = DIR_PROCESSED, procesos: Optional[int] = None) -> None:
+        self.dir_salida = dir_salida
+        self.procesos = procesos or os.cpu_count() or 1
+        self.path_indice = dir_salida / "graficos" / "indice.json"
+
+    def _cargar_indice(self) -> Dict[str, dict]:
+        try:
+            return json.loads(self.path_indice.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def generar(self, graficos: Sequence[Grafico]) -> dict:
+        inicio = time.perf_counter()
+        self.dir_salida.mkdir(parents=True, exist_ok=True)
+        indice = self._cargar_indice()
+        huellas = [huella(grafico) for grafico in graficos]
+        pendientes = [(grafico, h) for grafico, h in zip(graficos, huellas)
+                      if indice.get(grafico.nombre, {}).get("hash") != h
+                      or not all((self.dir_salida / n).exists() for n in indice[grafico.nombre]["salidas"])]
+
+        if pendientes:
+            lista = [grafico for grafico, _ in pendientes]
+            if self.procesos > 1 and len(lista) > 1:
+                with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+                    salidas = list(pool.map(renderizar, lista, [str(self.dir_salida)] * len(lista),
+                                            chunksize=max(1, len(lista) // (self.procesos * 4))))
+            else:
+                salidas = [renderizar(grafico, str(self.dir_salida)) for grafico in lista]
+            for (grafico, h), archivos in zip(pendientes, salidas):
+                indice[grafico.nombre] = {"hash": h, "salidas": archivos}
+            self.path_indice.parent.mkdir(parents=True, exist_ok=True)
+            temporal = self.path_indice.with_suffix(f".{os.getpid()}.tmp")
+            temporal.write_text(json.dumps(indice, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(temporal, self.path_indice)
+
+        resultado = {"dibujados": len(pendientes), "omitidos": len(graficos) - len(pendientes),
+                     "segundos": round(time.perf_counter() - inicio, 3)}
+        logging.info(f"Gráficos: {resultado['dibujados']} dibujados, {resultado['omitidos']} sin cambios")
+        return resultado
+
+
+def graficos_de_resumen(resumen, nombres: Optional[Dict[int, str]] = None, juegos: int = 0) -> List[Grafico]:
+    """Gráfico de la semana total y de los `juegos` más jugados en ella, desde un `ResumenDiario`."""
+    from .series import fecha_de_dia
+
+    nombres = nombres or {}
+    jugados = resumen.jugados_por_dia()[:, -7:]
+    if jugados.shape[1] < 7:
+        jugados = np.hstack([np.zeros((len(jugados), 7 - jugados.shape[1]), dtype=np.int64), jugados])
+    hasta = fecha_de_dia(resumen.fin)
+    graficos = [Grafico("semana", "Tiempo jugado en la semana", hasta, tuple(jugados.sum(axis=0).tolist()))]
+    semana = jugados.sum(axis=1)
+    for fila in np.argsort(-semana, kind="stable")[:juegos].tolist():
+        if semana[fila]:
+            appid = int(resumen.appids[fila])
+            graficos.append(Grafico(f"graficos/semana_{appid}", nombres.get(appid, str(appid)),
+                                    hasta, tuple(jugados[fila].tolist())))
+    return graficos
+
+
+if __name__ == "__main__":
+    from .resumen import ResumenDiario, nombres_de_biblioteca
+    from .series import AlmacenSeries
+
+    parser = argparse.ArgumentParser(description="Gráficos de la semana de juego")
+    parser.add_argument("--juegos", type=int, default=0, help="también un gráfico por cada uno de los N más jugados")
+    parser.add_argument("--nombres", type=Path, default=DIR_PROCESSED.parent.parent / "steam_data.json")
+    parser.add_argument("--procesos", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    resumen_diario = ResumenDiario(AlmacenSeries())
+    resumen_diario.actualizar()
+    if resumen_diario.minutos.size == 0:
+        print("No hay series. Importa instantáneas con: python -m trackerforgames.series")
+    else:
+        nombres = nombres_de_biblioteca(args.nombres) if args.nombres.exists() else None
+        generador = GeneradorGraficos(DIR_PROCESSED, args.procesos)
+        print(generador.generar(graficos_de_resumen(resumen_diario, nombres, args.juegos)))
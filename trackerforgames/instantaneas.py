@@ -0,0 +1,340 @@
+"""
+Instantáneas crudas de Steam direccionadas por contenido y comprimidas.
+
+`data/raw/raw_AAAAMMDD.json` se escribía completo cada día aunque nada
+hubiera cambiado. Aquí cada instantánea se guarda una sola vez, con el
+hash de su contenido como nombre:
+
+    data/raw/instantaneas/objetos/ab/cdef....z    objeto comprimido con zlib
+    data/raw/instantaneas/indices/<cuenta>.json   {AAAAMMDD: hash}
+
+    - El hash (SHA-256) se calcula sobre el JSON canónico (claves
+      ordenadas, sin espacios): si un día es igual a otro ya guardado, el
+      índice apunta al mismo objeto y no se escribe nada más.
+    - Un objeto es la instantánea completa o su diferencia con la del día
+      anterior: sólo los campos que cambiaron y, en las listas de juegos,
+      sólo los juegos nuevos, quitados o con otro tiempo (por appid).
+    - Cada `INTERVALO_COMPLETA` objetos de una cadena se guarda uno
+      completo, así leer cualquier día aplica como mucho
+      `INTERVALO_COMPLETA - 1` diferencias. También se guarda completo
+      cuando la diferencia no ahorra al menos la mitad.
+    - Las últimas instantáneas reconstruidas quedan en memoria: leer o
+      guardar días seguidos no vuelve a recorrer la cadena.
+
+Uso:
+    python -m trackerforgames.instantaneas importar data/raw/raw_*.json [--cuenta ID] [--borrar]
+    python -m trackerforgames.instantaneas leer AAAAMMDD --cuenta ID [--salida archivo.json]
+    python -m trackerforgames.instantaneas dias --cuenta ID
+    python -m trackerforgames.instantaneas estado
+"""
+import argparse
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import DIR_RAW
+from .series import Dia, dia_epoca, fecha_de_dia
+
+INTERVALO_COMPLETA = 7
+NIVEL_ZLIB = 9
+TAMANO_CACHE = 16
+PATRON_RAW = re.compile(r"raw_(\d{8})(?:_(\d+))?\.json$")
+
+
+def canonico(datos: Any) -> bytes:
+    return json.dumps(datos, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def huella(datos: Any) -> str:
+    return hashlib.sha256(canonico(datos)).hexdigest()
+
+
+# --- Diferencias ---
+def _es_lista_juegos(valor: Any) -> bool:
+    """Lista de objetos con appid distinto cada uno (juegos de la API)."""
+    return (isinstance(valor, list) and all(isinstance(j, dict) and "appid" in j for j in valor)
+            and len({j["appid"] for j in valor}) == len(valor))
+
+
+def diferencia(anterior: Any, actual: Any) -> Optional[dict]:
+    """
+    Cómo pasar de `anterior` a `actual`, o None si son iguales:
+    {"valor": v} reemplaza, {"campos": {...}, "quitados": [...]} cambia un
+    objeto y {"juegos": {appid: ...}, "quitados": [...], "orden": [...]}
+    cambia una lista de juegos.
+    """
+    if anterior == actual:
+        return None
+    if isinstance(anterior, dict) and isinstance(actual, dict):
+        campos = {}
+        for clave, valor in actual.items():
+            cambio = diferencia(anterior[clave], valor) if clave in anterior else {"valor": valor}
+            if cambio is not None:
+                campos[clave] = cambio
+        resultado: dict = {"campos": campos}
+        quitados = [clave for clave in anterior if clave not in actual]
+        if quitados:
+            resultado["quitados"] = quitados
+        return resultado
+    if _es_lista_juegos(anterior) and _es_lista_juegos(actual):
+        previos = {str(j["appid"]): j for j in anterior}
+        juegos = {}
+        for juego in actual:
+            clave = str(juego["appid"])
+            cambio = diferencia(previos[clave], juego) if clave in previos else {"valor": juego}
+            if cambio is not None:
+                juegos[clave] = cambio
+        orden = [str(j["appid"]) for j in actual]
+        presentes = set(orden)
+        quitados = [clave for clave in previos if clave not in presentes]
+        resultado = {"juegos": juegos}
+        if quitados:
+            resultado["quitados"] = quitados
+        # Sin "orden", `aplicar` deja los de antes en su lugar y los nuevos al final
+        if orden != [c for c in previos if c in presentes] + [c for c in juegos if c not in previos]:
+            resultado["orden"] = orden
+        return resultado
+    return {"valor": actual}
+
+
+def aplicar(base: Any, cambio: dict) -> Any:
+    """Resultado de aplicar una diferencia a `base`, sin modificarla."""
+    if "valor" in cambio:
+        return cambio["valor"]
+    quitados = set(cambio.get("quitados", ()))
+    if "campos" in cambio:
+        resultado = {clave: valor for clave, valor in base.items() if clave not in quitados}
+        for clave, sub in cambio["campos"].items():
+            resultado[clave] = aplicar(resultado.get(clave), sub)
+        return resultado
+    juegos = {str(j["appid"]): j for j in base if str(j["appid"]) not in quitados}
+    for clave, sub in cambio["juegos"].items():
+        juegos[clave] = aplicar(juegos.get(clave), sub)
+    return [juegos[clave] for clave in cambio.get("orden", juegos)]
+
+
+class AlmacenInstantaneas:
+    """Instantáneas diarias por cuenta, deduplicadas y guardadas como diferencias."""
+    def __init__(self, directorio: Path = DIR_RAW / "instantaneas") -> None:
+        self.directorio = directorio
+        self.dir_objetos = directorio / "objetos"
+        self.dir_indices = directorio / "indices"
+        self._cache: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()  # multicuenta guarda desde varios hilos
+
+    # --- Objetos ---
+    def _path_objeto(self, hash_: str) -> Path:
+        return self.dir_objetos / hash_[:2] / f"{hash_[2:]}.z"
+
+    def _leer_objeto(self, hash_: str) -> dict:
+        try:
+            return json.loads(zlib.decompress(self._path_objeto(hash_).read_bytes()))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"ERROR: Falta el objeto {hash_} en {self.dir_objetos}.") from None
+
+    def _escribir_objeto(self, hash_: str, objeto: dict) -> int:
+        path = self._path_objeto(hash_)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        contenido = zlib.compress(json.dumps(objeto, ensure_ascii=False, separators=(",", ":"))
+                                  .encode("utf-8"), NIVEL_ZLIB)
+        temporal = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temporal.write_bytes(contenido)
+        os.replace(temporal, path)
+        return len(contenido)
+
+    def _recordar(self, hash_: str, datos: Any, profundidad: int) -> None:
+        with self._lock:
+            self._cache[hash_] = (datos, profundidad)
+            self._cache.move_to_end(hash_)
+            while len(self._cache) > TAMANO_CACHE:
+                self._cache.popitem(last=False)
+
+    def _reconstruir(self, hash_: str) -> Tuple[Any, int]:
+        """(instantánea, cuántas diferencias hay desde el último objeto completo)."""
+        cadena: List[Tuple[str, dict]] = []
+        actual = hash_
+        while True:
+            with self._lock:
+                recordado = self._cache.get(actual)
+            if recordado is not None:
+                datos, profundidad = recordado
+                break
+            objeto = self._leer_objeto(actual)
+            if objeto["base"] is None:
+                datos, profundidad = objeto["datos"], 0
+                self._recordar(actual, datos, profundidad)
+                break
+            cadena.append((actual, objeto["cambio"]))
+            actual = objeto["base"]
+        for hash_cambio, cambio in reversed(cadena):
+            datos, profundidad = aplicar(datos, cambio), profundidad + 1
+            self._recordar(hash_cambio, datos, profundidad)
+        return datos, profundidad
+
+    # --- Índices ---
+    def _path_indice(self, cuenta: str) -> Path:
+        return self.dir_indices / f"{cuenta}.json"
+
+    def dias(self, cuenta: str) -> Dict[str, str]:
+        """{AAAAMMDD: hash} de una cuenta, en orden de fecha."""
+        try:
+            indice = json.loads(self._path_indice(cuenta).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return dict(sorted(indice.items()))
+
+    def cuentas(self) -> List[str]:
+        return sorted(path.stem for path in self.dir_indices.glob("*.json"))
+
+    def _guardar_indice(self, cuenta: str, indice: Dict[str, str]) -> None:
+        self.dir_indices.mkdir(parents=True, exist_ok=True)
+        path = self._path_indice(cuenta)
+        temporal = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        temporal.write_text(json.dumps(dict(sorted(indice.items())), indent=1), encoding="utf-8")
+        os.replace(temporal, path)
+
+    # --- Guardar y leer ---
+    def guardar(self, dia: Dia, datos: Any, cuenta: str) -> dict:
+        """
+        Guarda la instantánea de `cuenta` del día `dia` (si ya había una ese
+        día, la reemplaza). Devuelve su hash, el tipo de objeto escrito
+        ("completa", "diferencia" o "repetida" si ya existía) y sus bytes.
+        """
+        clave = f"{fecha_de_dia(dia_epoca(dia)):%Y%m%d}"
+        hash_ = huella(datos)
+        indice = self.dias(cuenta)
+        tipo, escritos = "repetida", 0
+        if not self._path_objeto(hash_).exists():
+            objeto = {"base": None, "datos": datos}
+            anteriores = [d for d in indice if d < clave]
+            if anteriores:
+                hash_base = indice[anteriores[-1]]
+                base, profundidad = self._reconstruir(hash_base)
+                cambio = diferencia(base, datos) if profundidad + 1 < INTERVALO_COMPLETA else None
+                # La comprobación con el hash evita diferencias que no reproducen
+                # el original (p. ej. True == 1 al comparar)
+                if (cambio is not None and len(canonico(cambio)) * 2 < len(canonico(datos))
+                        and huella(aplicar(base, cambio)) == hash_):
+                    objeto = {"base": hash_base, "cambio": cambio}
+            tipo = "completa" if objeto["base"] is None else "diferencia"
+            escritos = self._escribir_objeto(hash_, objeto)
+            self._recordar(hash_, copy.deepcopy(datos), 0 if objeto["base"] is None else profundidad + 1)
+        indice[clave] = hash_
+        self._guardar_indice(cuenta, indice)
+        return {"dia": clave, "hash": hash_, "tipo": tipo, "bytes": escritos}
+
+    def leer(self, dia: Dia, cuenta: str) -> Any:
+        """Instantánea de `cuenta` del día `dia`, tal como se guardó."""
+        clave = f"{fecha_de_dia(dia_epoca(dia)):%Y%m%d}"
+        hash_ = self.dias(cuenta).get(clave)
+        if hash_ is None:
+            raise ValueError(f"ERROR: No hay instantánea de la cuenta {cuenta} del día {clave}.")
+        return copy.deepcopy(self._reconstruir(hash_)[0])
+
+    def verificar(self, cuenta: str) -> List[str]:
+        """Días cuya reconstrucción no coincide con su hash (debería estar vacía)."""
+        return [dia for dia, hash_ in self.dias(cuenta).items() if huella(self._reconstruir(hash_)[0]) != hash_]
+
+    def estado(self) -> dict:
+        """Cuentas, días, objetos de cada tipo y bytes en disco."""
+        resultado = {"cuentas": 0, "dias": 0, "completas": 0, "diferencias": 0, "bytes": 0}
+        for cuenta in self.cuentas():
+            resultado["cuentas"] += 1
+            resultado["dias"] += len(self.dias(cuenta))
+        for path in self.dir_objetos.glob("*/*.z"):
+            objeto = json.loads(zlib.decompress(path.read_bytes()))
+            resultado["completas" if objeto["base"] is None else "diferencias"] += 1
+            resultado["bytes"] += path.stat().st_size
+        return resultado
+
+    def importar(self, paths: Sequence[Path], cuenta: Optional[str] = None, borrar: bool = False) -> dict:
+        """
+        Guarda archivos `raw_AAAAMMDD[_steamid].json` en orden de fecha. La
+        cuenta sale del nombre o de `cuenta`. Con `borrar`, cada archivo se
+        elimina después de comprobar que se reconstruye igual leyendo los
+        objetos del disco (con otro almacén, sin la caché de lo recién
+        guardado); si no se puede, se deja el archivo.
+        """
+        archivos = []
+        for path in paths:
+            coincidencia = PATRON_RAW.search(path.name)
+            if coincidencia is None:
+                raise ValueError(f"ERROR: '{path.name}' no tiene la forma raw_AAAAMMDD[_steamid].json.")
+            dueno = coincidencia.group(2) or cuenta
+            if not dueno:
+                raise ValueError(f"ERROR: '{path.name}' no dice de qué cuenta es; indica --cuenta.")
+            archivos.append((coincidencia.group(1), dueno, path))
+
+        resultado = {"importados": 0, "completas": 0, "diferencias": 0, "repetidas": 0,
+                     "bytes_originales": 0, "bytes_guardados": 0, "borrados": 0}
+        desde_disco = AlmacenInstantaneas(self.directorio) if borrar else None
+        for dia, dueno, path in sorted(archivos):
+            contenido = path.read_bytes()
+            datos = json.loads(contenido)
+            guardado = self.guardar(dia, datos, dueno)
+            resultado["importados"] += 1
+            resultado[{"completa": "completas", "diferencia": "diferencias",
+                       "repetida": "repetidas"}[guardado["tipo"]]] += 1
+            resultado["bytes_originales"] += len(contenido)
+            resultado["bytes_guardados"] += guardado["bytes"]
+            if desde_disco is not None:
+                try:
+                    igual = huella(desde_disco.leer(dia, dueno)) == guardado["hash"]
+                except (FileNotFoundError, ValueError, zlib.error) as e:
+                    logging.warning(f"{path.name} no se borra: no se pudo reconstruir desde el disco ({e})")
+                    continue
+                if igual:
+                    path.unlink()
+                    resultado["borrados"] += 1
+                else:
+                    logging.warning(f"{path.name} no se borra: el almacén no lo reconstruye igual")
+        logging.info(f"Instantáneas: {resultado['importados']} importadas, {resultado['bytes_originales']} "
+                     f"bytes -> {resultado['bytes_guardados']} bytes")
+        return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Instantáneas crudas de Steam deduplicadas y comprimidas")
+    parser.add_argument("--directorio", type=Path, default=DIR_RAW / "instantaneas")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p_importar = sub.add_parser("importar", help="guarda archivos raw_AAAAMMDD[_steamid].json")
+    p_importar.add_argument("archivos", nargs="+", type=Path)
+    p_importar.add_argument("--cuenta", help="steamid de los archivos sin steamid en el nombre")
+    p_importar.add_argument("--borrar", action="store_true", help="borra cada archivo ya importado")
+    p_leer = sub.add_parser("leer", help="reconstruye la instantánea de un día")
+    p_leer.add_argument("dia")
+    p_leer.add_argument("--cuenta", required=True)
+    p_leer.add_argument("--salida", type=Path)
+    p_dias = sub.add_parser("dias", help="días guardados de una cuenta")
+    p_dias.add_argument("--cuenta", required=True)
+    sub.add_parser("estado", help="cuentas, días y espacio usado")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    almacen = AlmacenInstantaneas(args.directorio)
+    try:
+        if args.comando == "importar":
+            print(almacen.importar(args.archivos, args.cuenta, args.borrar))
+        elif args.comando == "leer":
+            texto = json.dumps(almacen.leer(args.dia, args.cuenta), ensure_ascii=False, indent=2)
+            if args.salida:
+                args.salida.write_text(texto, encoding="utf-8")
+            else:
+                print(texto)
+        elif args.comando == "dias":
+            for dia, hash_ in almacen.dias(args.cuenta).items():
+                print(f"{dia}  {hash_[:12]}")
+        else:
+            print(almacen.estado())
+    except (FileNotFoundError, ValueError) as e:
+        print(e)
+    except zlib.error as e:
+        print(f"ERROR: Hay un objeto dañado en {almacen.dir_objetos} ({e}).")
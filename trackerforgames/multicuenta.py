@@ -0,0 +1,212 @@
+"""
+Descarga concurrente de muchas cuentas de Steam con límite de velocidad.
+
+Cada cuenta necesita tres llamadas (perfil, juegos y recientes). Las
+cuentas se procesan con asyncio:
+
+    - Un cubo de tokens global (`CuboTokens`) limita las peticiones HTTP
+      por segundo de todas las cuentas juntas. Es el `limitador` del
+      cliente: cuenta cada petición que sale a la red, también los
+      reintentos por 429/5xx, y no gasta tokens en respuestas de la caché.
+      Quien no tiene token duerme exactamente hasta que se repone uno, sin
+      sondeo.
+    - Un semáforo limita cuántas cuentas están en curso a la vez.
+    - Cada llamada corre en un hilo con `ClienteSteam` (conexiones
+      persistentes, caché, reintentos), así el bucle nunca se bloquea.
+
+La instantánea de cada cuenta se guarda en
+`data/raw/cuentas/raw_AAAAMMDD_<steamid>.json`, o con `--almacen` en el
+almacén de instantáneas (`instantaneas.py`): deduplicada, comprimida y
+como diferencia con el día anterior de la misma cuenta. Cada cuenta terminada se
+agrega a `data/raw/cuentas/progreso_AAAAMMDD.txt`; si la corrida se corta
+o alguna cuenta falla, la siguiente corrida del mismo día sólo procesa las
+que faltan.
+
+Uso:
+    python -m trackerforgames.multicuenta cuentas.txt [--concurrencia 16] [--tasa 20] [--almacen]
+    # Sin red: levanta el servidor falso con N cuentas inventadas
+    python -m trackerforgames.multicuenta --prueba 500 [--fallas 20]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import List, Optional, Sequence, Set
+
+from . import DIR_RAW
+from .cliente_steam import ClienteSteam
+from .instantaneas import AlmacenInstantaneas
+
+CONCURRENCIA = 16
+TASA = 20.0  # Peticiones por segundo a la API
+RAFAGA = 10
+
+
+class CuboTokens:
+    """
+    Limitador de velocidad: `tasa` tokens por segundo, hasta `capacidad`
+    acumulados. Se llama desde los hilos de `ClienteSteam`, por eso usa un
+    lock de hilos y `time.sleep`.
+    """
+    def __init__(self, tasa: float, capacidad: float = RAFAGA) -> None:
+        self.tasa = tasa
+        self.capacidad = capacidad
+        self._tokens = capacidad
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def adquirir(self) -> None:
+        # El lock hace que los que esperan salgan de a uno, al ritmo de la tasa
+        with self._lock:
+            ahora = time.monotonic()
+            self._tokens = min(self.capacidad, self._tokens + (ahora - self._ultimo) * self.tasa)
+            self._ultimo = ahora
+            if self._tokens < 1:
+                time.sleep((1 - self._tokens) / self.tasa)
+                self._tokens = 1.0
+                self._ultimo = time.monotonic()
+            self._tokens -= 1
+
+
+class RastreadorCuentas:
+    """Baja las instantáneas de varias cuentas respetando un límite global de llamadas."""
+    def __init__(self, cliente: ClienteSteam, dir_salida: Path = DIR_RAW / "cuentas",
+                 concurrencia: int = CONCURRENCIA, tasa: float = TASA,
+                 dia: Optional[date] = None, almacen: Optional[AlmacenInstantaneas] = None) -> None:
+        self.cliente = cliente
+        self.dir_salida = dir_salida
+        self.concurrencia = concurrencia
+        self.tasa = tasa
+        self.dia = dia or date.today()
+        self.almacen = almacen
+        self.path_progreso = dir_salida / f"progreso_{self.dia:%Y%m%d}.txt"
+
+    # --- Progreso ---
+    def completadas(self) -> Set[str]:
+        try:
+            return set(self.path_progreso.read_text(encoding="utf-8").split())
+        except FileNotFoundError:
+            return set()
+
+    def _marcar(self, steamid: str) -> None:
+        with self.path_progreso.open("a", encoding="utf-8") as f:
+            f.write(steamid + "\n")
+
+    def _guardar(self, steamid: str, datos: dict) -> int:
+        if self.almacen is not None:
+            return self.almacen.guardar(self.dia, datos, steamid)["bytes"]
+        path = self.dir_salida / f"raw_{self.dia:%Y%m%d}_{steamid}.json"
+        contenido = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+        temporal = path.with_suffix(f".{os.getpid()}.tmp")
+        temporal.write_bytes(contenido)
+        os.replace(temporal, path)
+        return len(contenido)
+
+    # --- Descarga ---
+    async def _cuenta(self, steamid: str, semaforo: asyncio.Semaphore, resultado: dict) -> None:
+        async with semaforo:
+            inicio = time.perf_counter()
+            try:
+                respuestas = []
+                for metodo in (self.cliente.perfiles, self.cliente.juegos, self.cliente.recientes):
+                    respuestas.append(await asyncio.to_thread(metodo, steamid))
+                    resultado["llamadas"] += 1
+                perfiles, juegos, recientes = (r.get("response", {}) for r in respuestas)
+                datos = {
+                    "profile": (perfiles.get("players") or [{"steamid": steamid}])[0],
+                    "games": juegos.get("games", []),
+                    "recent_games": recientes.get("games", []),
+                    "last_update": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+                resultado["bytes"] += await asyncio.to_thread(self._guardar, steamid, datos)
+                self._marcar(steamid)
+                resultado["completadas"] += 1
+                resultado["latencias"].append(time.perf_counter() - inicio)
+            except (ConnectionError, ValueError, OSError) as e:
+                logging.warning(f"Cuenta {steamid} no descargada: {e}")
+                resultado["fallidas"].append(steamid)
+
+    async def rastrear(self, steamids: Sequence[str]) -> dict:
+        """
+        Descarga las cuentas que falten hoy. Devuelve cuentas completadas,
+        fallidas, omitidas (ya hechas), llamadas, bytes y rendimiento.
+        """
+        self.dir_salida.mkdir(parents=True, exist_ok=True)
+        hechas = self.completadas()
+        pendientes = list(dict.fromkeys(s for s in steamids if s not in hechas))
+        resultado: dict = {"completadas": 0, "fallidas": [], "omitidas": len(set(steamids) & hechas),
+                           "llamadas": 0, "bytes": 0, "latencias": []}
+        semaforo = asyncio.Semaphore(self.concurrencia)
+        limitador_previo = self.cliente.limitador
+        self.cliente.limitador = CuboTokens(self.tasa).adquirir
+        inicio = time.perf_counter()
+        try:
+            await asyncio.gather(*(self._cuenta(s, semaforo, resultado) for s in pendientes))
+        finally:
+            self.cliente.limitador = limitador_previo
+        segundos = time.perf_counter() - inicio
+
+        latencias = sorted(resultado.pop("latencias"))
+        resultado.update({
+            "segundos": round(segundos, 3),
+            "cuentas_por_segundo": round(resultado["completadas"] / segundos, 2) if segundos else 0.0,
+            "llamadas_por_segundo": round(resultado["llamadas"] / segundos, 2) if segundos else 0.0,
+            "latencia_p50": round(latencias[len(latencias) // 2], 3) if latencias else 0.0,
+            "latencia_p95": round(latencias[int(len(latencias) * 0.95)], 3) if latencias else 0.0,
+            "cliente": dict(self.cliente.estadisticas),
+        })
+        logging.info(f"Rastreo: {resultado['completadas']} cuentas en {segundos:.2f} s "
+                     f"({resultado['cuentas_por_segundo']} cuentas/s), "
+                     f"{len(resultado['fallidas'])} fallidas, {resultado['omitidas']} ya hechas")
+        return resultado
+
+
+def leer_cuentas(path: Path) -> List[str]:
+    """Un steamid por línea; se ignoran las vacías y las que empiezan con #."""
+    lineas = path.read_text(encoding="utf-8").splitlines()
+    return [linea.strip() for linea in lineas if linea.strip() and not linea.startswith("#")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Descarga concurrente de cuentas de Steam")
+    parser.add_argument("cuentas", nargs="?", type=Path, help="archivo con un steamid por línea")
+    parser.add_argument("--concurrencia", type=int, default=CONCURRENCIA)
+    parser.add_argument("--tasa", type=float, default=TASA, help="peticiones HTTP por segundo")
+    parser.add_argument("--prueba", type=int, metavar="N",
+                        help="usa el servidor falso con N cuentas inventadas y una carpeta temporal")
+    parser.add_argument("--fallas", type=int, default=0, help="con --prueba: primeras N peticiones con 503")
+    parser.add_argument("--almacen", action="store_true",
+                        help="guarda en el almacén de instantáneas en lugar de un JSON por cuenta")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    servidor = None
+    if args.prueba:
+        from .servidor_falso import ServidorFalso
+        servidor = ServidorFalso(fallas=args.fallas).iniciar()
+        steamids = [str(76561190000000000 + i) for i in range(args.prueba)]
+        cliente = ClienteSteam("prueba", servidor.url, Path(tempfile.mkdtemp()) / "cache",
+                               conexiones=args.concurrencia)
+        temporal = Path(tempfile.mkdtemp())
+        almacen = AlmacenInstantaneas(temporal / "instantaneas") if args.almacen else None
+        rastreador = RastreadorCuentas(cliente, temporal, args.concurrencia, args.tasa, almacen=almacen)
+    elif args.cuentas:
+        steamids = leer_cuentas(args.cuentas)
+        cliente = ClienteSteam(conexiones=args.concurrencia)
+        rastreador = RastreadorCuentas(cliente, concurrencia=args.concurrencia, tasa=args.tasa,
+                                       almacen=AlmacenInstantaneas() if args.almacen else None)
+    else:
+        parser.error("indica el archivo de cuentas o --prueba N")
+
+    try:
+        print(json.dumps(asyncio.run(rastreador.rastrear(steamids)), indent=2))
+    finally:
+        cliente.cerrar()
+        if servidor is not None:
+            servidor.detener()
@@ -0,0 +1,247 @@
+"""
+Reportes de cuentas de Steam en texto, Markdown y JSON, en paralelo.
+
+Cada instantánea (`steam_data.json` o `data/raw/cuentas/raw_*.json`) se
+convierte en `data/processed/reportes/<steamid>.{txt,md,json}` con las
+secciones de `steam_report_*.txt`, calculadas con `biblioteca.py`.
+
+    - De cada cuenta se usa sólo la instantánea más nueva (por la fecha
+      de `raw_AAAAMMDD_<steamid>.json` o por `last_update`): los reportes
+      se nombran por steamid y dos instantáneas de la misma cuenta se
+      pisarían.
+    - Las cuentas se reparten entre procesos (`ProcessPoolExecutor`, uno
+      por núcleo); cada proceso lee su instantánea y escribe sus archivos
+      (en un temporal que después reemplaza al anterior), así al proceso
+      principal sólo vuelven los nombres.
+    - `reportes/indice.json` guarda el hash de la instantánea con la que
+      se hizo cada reporte: si no cambió (y los archivos siguen ahí), la
+      cuenta se omite sin abrir el pool.
+    - `formatear_duracion` guarda en caché los textos "59h 32m": en una
+      corrida se repiten los mismos valores de minutos muchas veces.
+
+Uso:
+    python -m trackerforgames.reportes steam_data.json data/raw/cuentas/raw_*.json
+                                       [--formatos txt,md,json] [--procesos N] [--forzar]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import DIR_PROCESSED
+from .biblioteca import Biblioteca
+
+FORMATOS = ("txt", "md", "json")
+TOP = 10
+PATRON_RAW = re.compile(r"^raw_(\d{8})_(\d+)\.json$")
+
+
+@lru_cache(maxsize=65536)
+def formatear_duracion(minutos: int) -> str:
+    """Minutos como en los reportes: '55 minutos' o '59h 32m'."""
+    if minutos < 60:
+        return f"{minutos} minutos"
+    return f"{minutos // 60}h {minutos % 60}m"
+
+
+def _fecha(segundos: int) -> str:
+    return datetime.fromtimestamp(segundos).strftime("%d/%m/%Y") if segundos else "N/A"
+
+
+def secciones(datos: dict, top: int = TOP) -> dict:
+    """Contenido del reporte de una cuenta, independiente del formato."""
+    biblioteca = Biblioteca.desde_datos([datos])
+    analisis = biblioteca.analizar(top)[0]
+    perfil = datos.get("profile", {})
+    return {
+        "generado": datetime.now().strftime("%d/%m/%Y %H:%M:%S"),
+        "perfil": {"nombre": perfil.get("personaname", "N/A"), "steamid": str(perfil.get("steamid", "N/A")),
+                   "miembro_desde": _fecha(perfil.get("timecreated", 0)),
+                   "pais": perfil.get("loccountrycode", "N/A")},
+        "estadisticas": {clave: analisis[clave] for clave in
+                         ("juegos", "minutos", "jugados", "nunca_jugados",
+                          "minutos_2semanas", "activos_2semanas", "plataformas")},
+        "top_total": [biblioteca.juego(i) for i in analisis["top_total"]],
+        "top_2semanas": [biblioteca.juego(i) for i in analisis["top_2semanas"]],
+        "recientes": [biblioteca.juego(i) for i in analisis["recientes"]],
+    }
+
+
+# --- Formatos ---
+def renderizar_texto(s: dict) -> str:
+    e, p = s["estadisticas"], s["perfil"]
+    lineas = [
+        "🎮 REPORTE COMPLETO DE CUENTA STEAM", "=" * 60, f"📅 Generado el: {s['generado']}", "",
+        "👤 INFORMACIÓN DEL PERFIL", "-" * 30,
+        f"Nombre: {p['nombre']}", f"Steam ID: {p['steamid']}",
+        f"Miembro desde: {p['miembro_desde']}", f"País: {p['pais']}", "",
+        "📊 ESTADÍSTICAS DE JUEGOS", "-" * 30,
+        f"Total de juegos: {e['juegos']}", f"Tiempo total jugado: {formatear_duracion(e['minutos'])}",
+        f"Juegos jugados: {e['jugados']}", f"Juegos nunca jugados: {e['nunca_jugados']}", "",
+        "📅 ESTADÍSTICAS DE TIEMPO POR PERÍODO", "-" * 30,
+        f"Últimas 2 semanas: {formatear_duracion(e['minutos_2semanas'])}",
+        f"Juegos activos recientemente: {e['activos_2semanas']}", "",
+        f"🏆 TOP {len(s['top_total'])} JUEGOS MÁS JUGADOS (TOTAL)", "-" * 30,
+    ]
+    lineas += [f"{i:2d}. {j['nombre']} - {formatear_duracion(j['minutos'])}"
+               for i, j in enumerate(s["top_total"], 1)]
+    lineas += ["", "🔥 TOP JUEGOS DE LAS ÚLTIMAS 2 SEMANAS", "-" * 30]
+    lineas += [f"{i:2d}. {j['nombre']} - {formatear_duracion(j['minutos_2semanas'])} "
+               f"(Total: {formatear_duracion(j['minutos'])})" for i, j in enumerate(s["top_2semanas"], 1)]
+    lineas += ["", "🕒 JUEGOS RECIENTES", "-" * 30]
+    lineas += [f"{i:2d}. {j['nombre']} - jugado el {_fecha(j['ultima_vez'])}"
+               for i, j in enumerate(s["recientes"], 1)]
+    return "\n".join(lineas) + "\n"
+
+
+def renderizar_markdown(s: dict) -> str:
+    e, p = s["estadisticas"], s["perfil"]
+    lineas = [
+        f"# Reporte de Steam: {p['nombre']}", "", f"_Generado el {s['generado']}_", "",
+        "## Perfil", "", f"- **Steam ID:** {p['steamid']}", f"- **Miembro desde:** {p['miembro_desde']}",
+        f"- **País:** {p['pais']}", "",
+        "## Estadísticas", "", "| Dato | Valor |", "|---|---|",
+        f"| Total de juegos | {e['juegos']} |", f"| Tiempo total jugado | {formatear_duracion(e['minutos'])} |",
+        f"| Juegos jugados | {e['jugados']} |", f"| Juegos nunca jugados | {e['nunca_jugados']} |",
+        f"| Últimas 2 semanas | {formatear_duracion(e['minutos_2semanas'])} |",
+        f"| Juegos activos recientemente | {e['activos_2semanas']} |", "",
+        "## Más jugados (total)", "", "| # | Juego | Tiempo |", "|---|---|---|",
+    ]
+    lineas += [f"| {i} | {j['nombre']} | {formatear_duracion(j['minutos'])} |"
+               for i, j in enumerate(s["top_total"], 1)]
+    lineas += ["", "## Últimas 2 semanas", "", "| # | Juego | 2 semanas | Total |", "|---|---|---|---|"]
+    lineas += [f"| {i} | {j['nombre']} | {formatear_duracion(j['minutos_2semanas'])} | "
+               f"{formatear_duracion(j['minutos'])} |" for i, j in enumerate(s["top_2semanas"], 1)]
+    lineas += ["", "## Recientes", "", "| # | Juego | Última vez |", "|---|---|---|"]
+    lineas += [f"| {i} | {j['nombre']} | {_fecha(j['ultima_vez'])} |" for i, j in enumerate(s["recientes"], 1)]
+    return "\n".join(lineas) + "\n"
+
+
+def renderizar_json(s: dict) -> str:
+    return json.dumps(s, ensure_ascii=False, indent=2)
+
+
+RENDERIZADORES = {"txt": renderizar_texto, "md": renderizar_markdown, "json": renderizar_json}
+
+
+def _renderizar_cuenta(path_instantanea: str, dir_salida: str, formatos: Tuple[str, ...]) -> Tuple[str, List[str]]:
+    """Trabajo de cada proceso: lee una instantánea y escribe sus reportes."""
+    datos = json.loads(Path(path_instantanea).read_text(encoding="utf-8"))
+    contenido = secciones(datos)
+    steamid = contenido["perfil"]["steamid"]
+    salidas = []
+    for formato in formatos:
+        path = Path(dir_salida) / f"{steamid}.{formato}"
+        temporal = path.with_suffix(f".{formato}.{os.getpid()}.tmp")
+        temporal.write_text(RENDERIZADORES[formato](contenido), encoding="utf-8")
+        os.replace(temporal, path)
+        salidas.append(path.name)
+    return steamid, salidas
+
+
+class GeneradorReportes:
+    """Genera reportes de muchas cuentas, omitiendo los que no cambiaron."""
+    def __init__(self, dir_salida: Path = DIR_PROCESSED / "reportes", formatos: Sequence[str] = FORMATOS,
+                 procesos: Optional[int] = None) -> None:
+        desconocidos = set(formatos) - set(RENDERIZADORES)
+        if desconocidos:
+            raise ValueError(f"ERROR: Formatos desconocidos: {', '.join(sorted(desconocidos))}.")
+        self.dir_salida = dir_salida
+        self.formatos = tuple(formatos)
+        self.procesos = procesos or os.cpu_count() or 1
+        self.path_indice = dir_salida / "indice.json"
+
+    def _cargar_indice(self) -> Dict[str, dict]:
+        try:
+            return json.loads(self.path_indice.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _cuenta_y_fecha(path: Path, contenido: bytes) -> Tuple[str, str]:
+        """(steamid, AAAAMMDD) de una instantánea: del nombre `raw_*` o, si no, de su contenido."""
+        coincidencia = PATRON_RAW.match(path.name)
+        if coincidencia:
+            return coincidencia.group(2), coincidencia.group(1)
+        datos = json.loads(contenido)
+        return (str(datos.get("profile", {}).get("steamid", "N/A")),
+                datos.get("last_update", "")[:10].replace("-", ""))
+
+    def _mas_nuevas(self, instantaneas: Sequence[Path]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Hash de la instantánea más nueva de cada cuenta, y steamid de cada una de ellas."""
+        elegidas: Dict[str, Tuple[str, str, str]] = {}  # steamid -> (fecha, path, hash)
+        for path in instantaneas:
+            contenido = path.read_bytes()
+            steamid, fecha = self._cuenta_y_fecha(path, contenido)
+            if steamid not in elegidas or fecha >= elegidas[steamid][0]:
+                elegidas[steamid] = (fecha, str(path), hashlib.sha256(contenido).hexdigest())
+        huellas = {path: huella for _, path, huella in elegidas.values()}
+        cuentas = {path: steamid for steamid, (_, path, _) in elegidas.items()}
+        return huellas, cuentas
+
+    def _vigente(self, anterior: Optional[dict], huella: str) -> bool:
+        return (anterior is not None and anterior["hash"] == huella
+                and set(self.formatos) <= set(anterior["formatos"])
+                and all((self.dir_salida / nombre).exists() for nombre in anterior["salidas"]))
+
+    def generar(self, instantaneas: Sequence[Path], forzar: bool = False) -> dict:
+        """Devuelve cuántos reportes se generaron y omitieron, cuántas instantáneas viejas se descartaron y el tiempo total."""
+        inicio = time.perf_counter()
+        self.dir_salida.mkdir(parents=True, exist_ok=True)
+        indice = self._cargar_indice()
+        huellas, cuentas = self._mas_nuevas(instantaneas)
+        # Una cuenta con instantánea más nueva deja de estar al día con la vieja
+        elegidas = set(cuentas.values())
+        entradas_previas = len(indice)
+        indice = {path: entrada for path, entrada in indice.items()
+                  if path in huellas or entrada.get("steamid") not in elegidas}
+        pendientes = [path for path, huella in huellas.items()
+                      if forzar or not self._vigente(indice.get(path), huella)]
+
+        if pendientes:
+            argumentos = (list(pendientes), [str(self.dir_salida)] * len(pendientes),
+                          [self.formatos] * len(pendientes))
+            if self.procesos > 1 and len(pendientes) > 1:
+                with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+                    lote = max(1, len(pendientes) // (self.procesos * 4))
+                    resultados = list(pool.map(_renderizar_cuenta, *argumentos, chunksize=lote))
+            else:
+                resultados = list(map(_renderizar_cuenta, *argumentos))
+            for path, (steamid, salidas) in zip(pendientes, resultados):
+                indice[path] = {"hash": huellas[path], "steamid": steamid,
+                                "formatos": list(self.formatos), "salidas": salidas}
+        if pendientes or len(indice) != entradas_previas:
+            temporal = self.path_indice.with_suffix(f".{os.getpid()}.tmp")
+            temporal.write_text(json.dumps(indice, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(temporal, self.path_indice)
+
+        resultado = {"generados": len(pendientes), "omitidos": len(huellas) - len(pendientes),
+                     "reemplazadas": len(instantaneas) - len(huellas),
+                     "segundos": round(time.perf_counter() - inicio, 3)}
+        logging.info(f"Reportes: {resultado['generados']} generados, {resultado['omitidos']} sin cambios, "
+                     f"{resultado['segundos']} s con {self.procesos} procesos")
+        return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reportes de cuentas de Steam en paralelo")
+    parser.add_argument("instantaneas", nargs="+", type=Path)
+    parser.add_argument("--salida", type=Path, default=DIR_PROCESSED / "reportes")
+    parser.add_argument("--formatos", default=",".join(FORMATOS))
+    parser.add_argument("--procesos", type=int)
+    parser.add_argument("--forzar", action="store_true", help="regenera aunque la instantánea no cambió")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        generador = GeneradorReportes(args.salida, args.formatos.split(","), args.procesos)
+        print(generador.generar(args.instantaneas, args.forzar))
+    except (FileNotFoundError, ValueError) as e:
+        print(e)
@@ -0,0 +1,260 @@
+"""
+Resumen diario de tiempo jugado: minutos por día y ventanas móviles.
+
+`data/processed/resumen_diario.json` daba como "tiempo_hoy" el total
+histórico del juego, y el reporte de Steam estimaba el último mes como el
+doble de las últimas dos semanas. Aquí los minutos de cada día salen de la
+diferencia entre instantáneas consecutivas de `playtime_forever` (ver
+`series.py`), y cada ventana de 7/14/30/90 días es exacta.
+
+Para todos los juegos a la vez se mantiene una matriz juegos x días con el
+acumulado de minutos jugados (suma prefija de las diferencias). El total
+de una ventana de n días que termina en el día j es
+`acumulado[:, j] - acumulado[:, j - n]`, para todos los juegos y todos los
+días de una sola vez.
+
+La matriz se guarda en `data/processed/resumen_diario.npz` junto con la
+cabecera de cada serie. Al actualizar sólo se vuelven a leer las series
+cuya cabecera cambió, y sólo se recalculan sus columnas desde el primer
+día afectado por la instantánea nueva; los días nuevos de las demás series
+repiten el último valor.
+
+El tiempo que un juego ya tenía la primera vez que aparece no se cuenta
+como jugado ese día (no se sabe cuándo se jugó). Las bajadas de
+`playtime_forever` (correcciones de Steam) cuentan como 0.
+
+Uso:
+    python -m trackerforgames.resumen [--nombres steam_data.json]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from . import DIR_PROCESSED
+from .series import AlmacenSeries, fecha_de_dia
+
+VENTANAS = (7, 14, 30, 90)
+
+
+class ResumenDiario:
+    """Minutos jugados por día y por ventana para todos los juegos del almacén."""
+    def __init__(self, almacen: AlmacenSeries,
+                 path_cache: Path = DIR_PROCESSED / "resumen_diario.npz") -> None:
+        self.almacen = almacen
+        self.path_cache = path_cache
+        self.appids = np.zeros(0, dtype=np.int64)
+        self.estados = np.zeros((0, 4), dtype=np.int64)  # Cabecera de cada serie
+        self.inicio = 0  # Día (desde 1970-01-01) de la primera columna
+        self.minutos = np.zeros((0, 0), dtype=np.int64)  # Total de cada juego cada día
+        self.acumulado = np.zeros((0, 0), dtype=np.int64)  # Suma prefija de minutos jugados
+        self._cargar()
+
+    # --- Persistencia ---
+    def _cargar(self) -> None:
+        try:
+            with np.load(self.path_cache) as datos:
+                self.appids = datos["appids"]
+                self.estados = datos["estados"]
+                self.inicio = int(datos["inicio"])
+                self.minutos = datos["minutos"]
+                self.acumulado = datos["acumulado"]
+        except (FileNotFoundError, KeyError, ValueError, OSError):
+            pass
+
+    def _guardar(self) -> None:
+        self.path_cache.parent.mkdir(parents=True, exist_ok=True)
+        temporal = self.path_cache.with_suffix(f".{os.getpid()}.tmp")
+        with temporal.open("wb") as f:
+            np.savez(f, appids=self.appids, estados=self.estados, inicio=self.inicio,
+                     minutos=self.minutos, acumulado=self.acumulado)
+        os.replace(temporal, self.path_cache)
+
+    # --- Actualización ---
+    @property
+    def fin(self) -> int:
+        """Día de la última columna."""
+        return self.inicio + self.minutos.shape[1] - 1
+
+    def _fila(self, appid: int, inicio: int, fin: int) -> np.ndarray:
+        dias, minutos, _ = self.almacen.registros(appid)
+        todos = np.arange(inicio, fin + 1, dtype=np.int64)
+        if len(dias) == 0:
+            return np.zeros(len(todos), dtype=np.int64)
+        return minutos[np.maximum(np.searchsorted(dias, todos, side="right") - 1, 0)]
+
+    def _reconstruir(self, appids: np.ndarray, estados: np.ndarray) -> None:
+        primeros = [self.almacen.registros(appid)[0][:1] for appid in appids.tolist()]
+        self.inicio = int(min(dias[0] for dias in primeros if len(dias)))
+        fin = int(estados[:, 3].max())
+        self.appids, self.estados = appids, estados
+        self.minutos = np.array([self._fila(appid, self.inicio, fin) for appid in appids.tolist()],
+                                dtype=np.int64).reshape(len(appids), fin - self.inicio + 1)
+        self.acumulado = np.zeros_like(self.minutos)
+        self._recalcular(np.arange(len(appids)), 0)
+
+    def _recalcular(self, filas: np.ndarray, desde: int) -> None:
+        """Vuelve a sumar el acumulado de `filas` a partir de la columna `desde`."""
+        if len(filas) == 0:
+            return
+        bloque = self.minutos[filas, max(desde - 1, 0):]
+        jugados = np.maximum(np.diff(bloque, axis=1), 0)
+        if desde == 0:
+            jugados = np.concatenate([np.zeros((len(filas), 1), dtype=np.int64), jugados], axis=1)
+            base = np.zeros(len(filas), dtype=np.int64)
+        else:
+            base = self.acumulado[filas, desde - 1]
+        self.acumulado[filas, desde:] = base[:, None] + np.cumsum(jugados, axis=1)
+
+    def actualizar(self) -> Optional[int]:
+        """
+        Incorpora las instantáneas nuevas del almacén. Devuelve el primer día
+        recalculado, o None si no había nada nuevo.
+        """
+        inicio_reloj = time.perf_counter()
+        appids = np.array(self.almacen.appids(), dtype=np.int64)
+        if len(appids) == 0:
+            return None
+        estados = np.array([self.almacen.estado(appid) for appid in appids.tolist()], dtype=np.int64)
+
+        conocidos = np.isin(appids, self.appids)
+        if self.minutos.size == 0 or not np.isin(self.appids, appids).all():
+            self._reconstruir(appids, estados)
+            desde = self.inicio
+        else:
+            # Filas de la caché más las de juegos nuevos, en el orden de `appids`
+            nuevas = appids[~conocidos]
+            self.appids = np.concatenate([self.appids, nuevas])
+            orden = np.argsort(self.appids)
+            self.appids = self.appids[orden]
+            anteriores = np.zeros((len(self.appids), 4), dtype=np.int64)
+            anteriores[:len(self.estados)] = self.estados
+            anteriores = anteriores[orden]
+            # Si sólo avanzó "visto hasta", los días nuevos repiten el último valor
+            cambiadas = np.flatnonzero((anteriores[:, :3] != estados[:, :3]).any(axis=1))
+            if len(cambiadas) == 0 and (estados == anteriores).all():
+                return None
+
+            fin = max(int(estados[:, 3].max()), self.fin)
+            conocidas = [fila for fila in cambiadas.tolist() if anteriores[fila, 0]]
+            sin_historia = [fila for fila in cambiadas.tolist() if not anteriores[fila, 0]]
+            primeros_nuevos = [int(self.almacen.registros(int(self.appids[fila]))[0][0])
+                               for fila in sin_historia]
+            # Si se corrigió el primer registro de un juego (era el único día),
+            # también cambian las columnas anteriores, que repiten su valor
+            desde_conocidas = [int(anteriores[fila, 1]) for fila in conocidas]
+            primer_registro = [fila for fila in conocidas
+                               if int(self.almacen.registros(int(self.appids[fila]))[0][0]) >= anteriores[fila, 1]]
+            conocidas = [fila for fila in conocidas if fila not in primer_registro]
+            if min(primeros_nuevos, default=fin) < self.inicio:
+                # Un juego nuevo con historia anterior al resumen
+                self._reconstruir(appids, estados)
+                desde = self.inicio
+            else:
+                # Filas de los juegos nuevos y columnas de los días nuevos, que
+                # repiten el último valor de cada juego
+                agregadas = fin - self.fin
+                ceros = np.zeros((len(nuevas), self.minutos.shape[1]), dtype=np.int64)
+                self.minutos = np.vstack([self.minutos, ceros])[orden]
+                self.acumulado = np.vstack([self.acumulado, ceros])[orden]
+                if agregadas:
+                    self.minutos = np.hstack([self.minutos, np.repeat(self.minutos[:, -1:], agregadas, axis=1)])
+                    self.acumulado = np.hstack([self.acumulado,
+                                                np.repeat(self.acumulado[:, -1:], agregadas, axis=1)])
+
+                for fila in sin_historia + primer_registro:
+                    self.minutos[fila] = self._fila(int(self.appids[fila]), self.inicio, fin)
+                self._recalcular(np.array(sin_historia + primer_registro, dtype=np.intp), 0)
+                # Antes del último registro que ya se conocía nada cambió
+                desde = min(desde_conocidas + primeros_nuevos, default=fin)
+                if conocidas:
+                    columna = min(int(anteriores[fila, 1]) for fila in conocidas) - self.inicio
+                    for fila in conocidas:
+                        self.minutos[fila, columna:] = self._fila(int(self.appids[fila]),
+                                                                  self.inicio + columna, fin)
+                    self._recalcular(np.array(conocidas, dtype=np.intp), columna)
+                logging.info(f"Resumen diario: {len(cambiadas)} de {len(self.appids)} juegos "
+                             f"recalculados desde {fecha_de_dia(desde)}")
+
+        self.estados = estados
+        self._guardar()
+        logging.info(f"Resumen diario actualizado en {time.perf_counter() - inicio_reloj:.3f} s")
+        return desde
+
+    # --- Consultas ---
+    def _columna(self, dia: Optional[int]) -> int:
+        columna = self.minutos.shape[1] - 1 if dia is None else dia - self.inicio
+        if not 0 <= columna < self.minutos.shape[1]:
+            raise ValueError(f"ERROR: No hay datos del {fecha_de_dia(dia)}.")
+        return columna
+
+    def jugados_por_dia(self) -> np.ndarray:
+        """Minutos jugados de cada juego (filas) en cada día (columnas)."""
+        return np.diff(self.acumulado, axis=1, prepend=0)
+
+    def ventana(self, dias: int, dia: Optional[int] = None) -> np.ndarray:
+        """Minutos jugados de cada juego en los `dias` días que terminan en `dia` (por defecto, el último)."""
+        columna = self._columna(dia)
+        hasta = self.acumulado[:, columna]
+        return hasta - self.acumulado[:, columna - dias] if columna >= dias else hasta.copy()
+
+    def ventanas_moviles(self, dias: int) -> np.ndarray:
+        """Como `ventana`, pero para cada día: matriz juegos x días."""
+        anterior = np.zeros_like(self.acumulado)
+        if dias < self.acumulado.shape[1]:
+            anterior[:, dias:] = self.acumulado[:, :-dias]
+        return self.acumulado - anterior
+
+    def resumen(self, nombres: Optional[Dict[int, str]] = None,
+                dia: Optional[int] = None) -> dict:
+        """Resumen de un día (por defecto, el último) en el formato de `resumen_diario.json`."""
+        nombres = nombres or {}
+        columna = self._columna(dia)
+        hoy = self.ventana(1, self.inicio + columna)
+        ventanas = {n: self.ventana(n, self.inicio + columna) for n in VENTANAS}
+        activos = np.flatnonzero(ventanas[max(VENTANAS)] > 0)
+        activos = activos[np.argsort(-ventanas[7][activos], kind="stable")]
+        return {
+            "fecha": fecha_de_dia(self.inicio + columna).strftime("%Y%m%d"),
+            "tiempo_hoy_horas": int(hoy.sum()) / 60,
+            "ventanas_horas": {str(n): int(v.sum()) / 60 for n, v in ventanas.items()},
+            "juegos": [{
+                "appid": str(appid),
+                "juego": nombres.get(appid, str(appid)),
+                "tiempo_total_horas": int(self.minutos[fila, columna]) / 60,
+                "tiempo_hoy": int(hoy[fila]) / 60,
+                "ventanas_horas": {str(n): int(v[fila]) / 60 for n, v in ventanas.items()},
+            } for fila, appid in ((f, int(self.appids[f])) for f in activos.tolist())],
+            "timestamp": datetime.now().isoformat(),
+        }
+
+
+def nombres_de_biblioteca(path_datos: Path) -> Dict[int, str]:
+    """appid -> nombre de los juegos de un `steam_data.json` o una respuesta de GetOwnedGames."""
+    datos = json.loads(path_datos.read_text(encoding="utf-8"))
+    juegos = datos.get("games") or datos.get("response", {}).get("games", [])
+    return {juego["appid"]: juego.get("name", str(juego["appid"])) for juego in juegos}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Actualiza data/processed/resumen_diario.json")
+    parser.add_argument("--nombres", type=Path, help="steam_data.json con los nombres de los juegos")
+    parser.add_argument("--salida", type=Path, default=DIR_PROCESSED / "resumen_diario.json")
+    args = parser.parse_args()
+
+    resumen_diario = ResumenDiario(AlmacenSeries())
+    resumen_diario.actualizar()
+    if resumen_diario.minutos.size == 0:
+        print("No hay series. Importa instantáneas con: python -m trackerforgames.series")
+    else:
+        nombres = nombres_de_biblioteca(args.nombres) if args.nombres else None
+        datos = resumen_diario.resumen(nombres)
+        args.salida.write_text(json.dumps(datos, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"{datos['fecha']}: hoy {datos['tiempo_hoy_horas']:.2f} h, "
+              + ", ".join(f"{n} días {h:.2f} h" for n, h in datos["ventanas_horas"].items()))
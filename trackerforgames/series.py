@@ -0,0 +1,217 @@
+"""
+Series de tiempo de juego por appid, en columnas y con acceso por mmap.
+
+`data/processed/total.json` guardaba todo el historial como
+`{appid: {AAAAMMDD: horas}}` y se reescribía entero en cada corrida. Aquí
+cada juego tiene su archivo `data/processed/series/<appid>.ser`:
+
+    cabecera (20 bytes)  "TGS1", registros uint32, último día int32,
+                         últimos minutos int32, visto hasta int32
+    registros (8 bytes)  día int32, minutos int32, ambos como diferencia
+                         con el registro anterior (el primero, absoluto);
+                         si dos seguidos caen en el mismo día vale el último
+
+Los días se cuentan desde 1970-01-01 y el tiempo va en minutos enteros
+(`playtime_forever` de la API). Un registro se escribe sólo cuando el
+tiempo cambió; "visto hasta" dice hasta qué día se sabe que siguió igual.
+
+    - Agregar la instantánea de hoy es O(1): se escribe el registro al
+      final y después la cabecera con el nuevo total (si se corta en medio,
+      el registro sobrante se ignora y se sobrescribe en la próxima). Una
+      corrección del mismo día también se agrega como registro nuevo (con
+      diferencia de días 0) en vez de reescribir el anterior, así la
+      cabecera nunca queda desfasada de los registros que cuenta.
+    - Leer mapea el archivo con `mmap`, lo ve como arreglo de NumPy sin
+      copiarlo y reconstruye los valores absolutos con `cumsum`.
+
+Uso:
+    python -m trackerforgames.series importar data/processed/total.json
+    python -m trackerforgames.series agregar data/raw/raw_20250906.json
+    python -m trackerforgames.series ver APPID
+"""
+import json
+import logging
+import mmap
+import struct
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from . import DIR_PROCESSED
+
+MAGIA = b"TGS1"
+CABECERA = struct.Struct("<4sIiii")
+REGISTRO = struct.Struct("<ii")
+EPOCA = date(1970, 1, 1)
+
+Dia = Union[int, date, str]
+
+
+def dia_epoca(dia: Dia) -> int:
+    """Días desde 1970-01-01 de una fecha, un texto AAAAMMDD / AAAA-MM-DD o un entero."""
+    if isinstance(dia, str):
+        dia = datetime.strptime(dia.replace("-", ""), "%Y%m%d").date()
+    if isinstance(dia, date):
+        return (dia - EPOCA).days
+    return int(dia)
+
+
+def fecha_de_dia(dia: int) -> date:
+    return EPOCA + timedelta(days=int(dia))
+
+
+class AlmacenSeries:
+    """Una serie (día, minutos jugados en total) por appid."""
+    def __init__(self, directorio: Path = DIR_PROCESSED / "series") -> None:
+        self.directorio = directorio
+
+    def _path(self, appid: Union[int, str]) -> Path:
+        return self.directorio / f"{int(appid)}.ser"
+
+    def appids(self) -> List[int]:
+        return sorted(int(path.stem) for path in self.directorio.glob("*.ser"))
+
+    # --- Escritura ---
+    def agregar(self, appid: Union[int, str], dia: Dia, minutos: int) -> bool:
+        """
+        Registra el tiempo total de un juego en un día. Devuelve True si
+        escribió un registro (False si el tiempo no cambió).
+
+        Un día repetido reemplaza el valor de ese día (con un registro más
+        que anula al anterior); uno anterior al último registrado lanza
+        ValueError.
+        """
+        dia, minutos = dia_epoca(dia), int(minutos)
+        path = self._path(appid)
+        if not path.exists():
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            with path.open("wb") as f:
+                f.write(CABECERA.pack(MAGIA, 1, dia, minutos, dia))
+                f.write(REGISTRO.pack(dia, minutos))
+            return True
+
+        with path.open("r+b") as f:
+            magia, cantidad, ultimo_dia, ultimos_minutos, visto = CABECERA.unpack(f.read(CABECERA.size))
+            if magia != MAGIA:
+                raise ValueError(f"ERROR: '{path.name}' no es un archivo de serie.")
+            if dia < ultimo_dia:
+                raise ValueError(f"ERROR: El {fecha_de_dia(dia)} es anterior al último registro "
+                                 f"del appid {appid} ({fecha_de_dia(ultimo_dia)}).")
+            if minutos == ultimos_minutos:
+                if dia > visto:
+                    f.seek(0)
+                    f.write(CABECERA.pack(MAGIA, cantidad, ultimo_dia, ultimos_minutos, dia))
+                return False
+            # Otra instantánea del mismo día queda como registro con diferencia
+            # de días 0: el anterior no se toca hasta que la cabecera lo confirme
+            f.seek(CABECERA.size + cantidad * REGISTRO.size)
+            f.write(REGISTRO.pack(dia - ultimo_dia, minutos - ultimos_minutos))
+            f.truncate()
+            cantidad += 1
+            f.flush()
+            f.seek(0)
+            f.write(CABECERA.pack(MAGIA, cantidad, dia, minutos, max(dia, visto)))
+        return True
+
+    def agregar_instantanea(self, dia: Dia, juegos: Iterable[dict]) -> int:
+        """Agrega el `playtime_forever` de cada juego de una respuesta de GetOwnedGames."""
+        escritos = 0
+        for juego in juegos:
+            escritos += self.agregar(juego["appid"], dia, juego.get("playtime_forever", 0))
+        return escritos
+
+    def importar_total(self, path_total: Path) -> int:
+        """Carga el historial de `total.json` ({appid: {AAAAMMDD: horas}}); devuelve los registros escritos."""
+        historial: Dict[str, Dict[str, float]] = json.loads(path_total.read_text(encoding="utf-8"))
+        escritos = 0
+        for appid, por_dia in historial.items():
+            for dia in sorted(por_dia):
+                escritos += self.agregar(appid, dia, round(por_dia[dia] * 60))
+        logging.info(f"Importados {escritos} registros de {len(historial)} juegos desde {path_total}")
+        return escritos
+
+    # --- Lectura ---
+    def registros(self, appid: Union[int, str]) -> Tuple[np.ndarray, np.ndarray, int]:
+        """(días, minutos, visto hasta) de los registros de un juego, como int64; un registro por día."""
+        path = self._path(appid)
+        if not path.exists():
+            vacio = np.zeros(0, dtype=np.int64)
+            return vacio, vacio, -1
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            magia, cantidad, _, _, visto = CABECERA.unpack_from(mapa)
+            if magia != MAGIA:
+                raise ValueError(f"ERROR: '{path.name}' no es un archivo de serie.")
+            deltas = np.frombuffer(mapa, dtype="<i4", count=cantidad * 2, offset=CABECERA.size)
+            absolutos = np.cumsum(deltas.reshape(cantidad, 2), axis=0, dtype=np.int64)
+            del deltas  # El mmap no puede cerrarse mientras haya vistas sobre él
+        dias = absolutos[:, 0]
+        ultimos_del_dia = np.append(dias[1:] != dias[:-1], True)  # Correcciones del mismo día
+        if not ultimos_del_dia.all():
+            absolutos = absolutos[ultimos_del_dia]
+        return absolutos[:, 0], absolutos[:, 1], visto
+
+    def rango(self, appid: Union[int, str], desde: Optional[Dia] = None,
+              hasta: Optional[Dia] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (días, minutos) de cada día entre `desde` y `hasta`, limitados a lo
+        observado: desde el primer registro hasta "visto hasta".
+        """
+        dias, minutos, visto = self.registros(appid)
+        if len(dias) == 0:
+            return dias, minutos
+        inicio = dias[0] if desde is None else max(dia_epoca(desde), int(dias[0]))
+        fin = visto if hasta is None else min(dia_epoca(hasta), visto)
+        todos = np.arange(inicio, fin + 1, dtype=np.int64)
+        return todos, minutos[np.searchsorted(dias, todos, side="right") - 1]
+
+    def matriz(self, appids: Sequence[int], desde: Dia, hasta: Dia) -> np.ndarray:
+        """
+        Minutos totales de cada juego (filas) en cada día de `desde` a
+        `hasta` (columnas). Antes del primer registro de un juego se repite
+        su primer valor (no se sabe cuándo se jugó ese tiempo) y después de
+        "visto hasta" el último; sin registros, la fila es 0.
+        """
+        inicio, fin = dia_epoca(desde), dia_epoca(hasta)
+        todos = np.arange(inicio, fin + 1, dtype=np.int64)
+        resultado = np.zeros((len(appids), len(todos)), dtype=np.int64)
+        for fila, appid in enumerate(appids):
+            dias, minutos, _ = self.registros(appid)
+            if len(dias):
+                posiciones = np.searchsorted(dias, todos, side="right") - 1
+                resultado[fila] = minutos[np.maximum(posiciones, 0)]
+        return resultado
+
+    def estado(self, appid: Union[int, str]) -> Tuple[int, int, int, int]:
+        """(registros, último día, últimos minutos, visto hasta) leídos sólo de la cabecera."""
+        with self._path(appid).open("rb") as f:
+            magia, *estado = CABECERA.unpack(f.read(CABECERA.size))
+        if magia != MAGIA:
+            raise ValueError(f"ERROR: '{self._path(appid).name}' no es un archivo de serie.")
+        return tuple(estado)
+
+    def visto_hasta(self) -> Optional[date]:
+        """Último día con una instantánea guardada en cualquier serie."""
+        vistos = [self.estado(appid)[3] for appid in self.appids()]
+        return fecha_de_dia(max(vistos)) if vistos else None
+
+
+if __name__ == "__main__":
+    almacen = AlmacenSeries()
+    if len(sys.argv) == 3 and sys.argv[1] == "importar":
+        print(f"Registros escritos: {almacen.importar_total(Path(sys.argv[2]))}")
+    elif len(sys.argv) == 3 and sys.argv[1] == "agregar":
+        path_raw = Path(sys.argv[2])
+        dia = path_raw.stem.rsplit("_", 1)[-1]
+        respuesta = json.loads(path_raw.read_text(encoding="utf-8"))
+        juegos = respuesta.get("response", respuesta).get("games", [])
+        print(f"Registros escritos: {almacen.agregar_instantanea(dia, juegos)} de {len(juegos)} juegos")
+    elif len(sys.argv) == 3 and sys.argv[1] == "ver":
+        dias, minutos = almacen.rango(sys.argv[2])
+        for dia, total in zip(dias.tolist(), minutos.tolist()):
+            print(f"{fecha_de_dia(dia)}  {total // 60}h {total % 60}m")
+    else:
+        print("Uso: python -m trackerforgames.series importar TOTAL_JSON | agregar RAW_JSON | ver APPID")
+        sys.exit(1)
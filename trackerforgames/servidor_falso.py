@@ -0,0 +1,154 @@
+"""
+Servidor local que imita los endpoints de la Web API de Steam que usa el
+tracker, para probar sin red ni clave.
+
+Responde con los datos grabados en `steam_data.json` para su cuenta. A
+cualquier otro steamid le arma una biblioteca propia a partir de la
+grabada (subconjunto de juegos y tiempos derivados del steamid), siempre
+la misma para el mismo steamid, así sirve para probar muchas cuentas.
+
+Manda ETag y contesta 304 a If-None-Match, y puede simular fallas: las
+primeras `fallas` peticiones devuelven 503 y `latencia` agrega una espera
+a cada respuesta.
+
+Uso:
+    python -m trackerforgames.servidor_falso [--puerto 8780] [--fallas N] [--latencia SEG]
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+HOST = "127.0.0.1"
+PUERTO = 8780
+PATH_GRABADO = Path(__file__).parent.parent / "steam_data.json"
+
+
+class DatosFalsos:
+    """Perfil, juegos y recientes de cualquier steamid a partir de una grabación."""
+    def __init__(self, path_grabado: Path = PATH_GRABADO) -> None:
+        self.grabado = json.loads(path_grabado.read_text(encoding="utf-8"))
+        self.steamid_grabado = str(self.grabado["profile"]["steamid"])
+        self._cuentas: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def cuenta(self, steamid: str) -> dict:
+        with self._lock:
+            if steamid not in self._cuentas:
+                self._cuentas[steamid] = self._generar(steamid)
+            return self._cuentas[steamid]
+
+    def _generar(self, steamid: str) -> dict:
+        if steamid == self.steamid_grabado:
+            return self.grabado
+        azar = random.Random(steamid)
+        juegos = [dict(juego) for juego in self.grabado["games"] if azar.random() < 0.6]
+        for juego in juegos:
+            factor = azar.uniform(0, 2)
+            juego["playtime_forever"] = int(juego.get("playtime_forever", 0) * factor)
+            juego["playtime_windows_forever"] = juego["playtime_forever"]
+        recientes = []
+        for juego in azar.sample(juegos, min(len(juegos), azar.randint(0, 10))):
+            recientes.append({**juego, "playtime_2weeks": min(juego["playtime_forever"], azar.randint(1, 3000))})
+        perfil = {**self.grabado["profile"], "steamid": steamid, "personaname": f"cuenta_{steamid[-4:]}"}
+        return {"profile": perfil, "games": juegos, "recent_games": recientes}
+
+
+class ManejadorSteam(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, como la API real
+
+    def log_message(self, formato, *args) -> None:
+        pass  # Sin una línea por petición en la consola
+
+    def do_GET(self) -> None:
+        servidor: "ServidorFalso" = self.server  # type: ignore[assignment]
+        with servidor.lock:
+            servidor.peticiones += 1
+            fallar = servidor.peticiones <= servidor.fallas
+        if servidor.latencia:
+            time.sleep(servidor.latencia)
+        if fallar:
+            return self._responder(503, b'{"error": "simulado"}', {"Retry-After": "0"})
+
+        partes = urlsplit(self.path)
+        parametros = {k: v[0] for k, v in parse_qs(partes.query).items()}
+        cuerpo = self._cuerpo(partes.path, parametros)
+        if cuerpo is None:
+            return self._responder(404, b'{"error": "no encontrado"}')
+        etag = '"' + hashlib.sha256(cuerpo).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            return self._responder(304, b"", {"ETag": etag})
+        self._responder(200, cuerpo, {"ETag": etag})
+
+    def _cuerpo(self, ruta: str, parametros: Dict[str, str]) -> Optional[bytes]:
+        datos: DatosFalsos = self.server.datos  # type: ignore[attr-defined]
+        if ruta.startswith("/IPlayerService/GetOwnedGames/"):
+            juegos = datos.cuenta(parametros.get("steamid", ""))["games"]
+            respuesta = {"response": {"game_count": len(juegos), "games": juegos}}
+        elif ruta.startswith("/IPlayerService/GetRecentlyPlayedGames/"):
+            juegos = datos.cuenta(parametros.get("steamid", ""))["recent_games"]
+            respuesta = {"response": {"total_count": len(juegos), "games": juegos}}
+        elif ruta.startswith("/ISteamUser/GetPlayerSummaries/"):
+            steamids = [s for s in parametros.get("steamids", "").split(",") if s]
+            respuesta = {"response": {"players": [datos.cuenta(s)["profile"] for s in steamids]}}
+        else:
+            return None
+        return json.dumps(respuesta, ensure_ascii=False).encode("utf-8")
+
+    def _responder(self, estado: int, cuerpo: bytes, cabeceras: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        for nombre, valor in (cabeceras or {}).items():
+            self.send_header(nombre, valor)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+class ServidorFalso(ThreadingHTTPServer):
+    """Servidor HTTP con los endpoints falsos; `iniciar()` lo corre en un hilo."""
+    daemon_threads = True
+
+    def __init__(self, host: str = HOST, puerto: int = 0, datos: Optional[DatosFalsos] = None,
+                 fallas: int = 0, latencia: float = 0.0) -> None:
+        super().__init__((host, puerto), ManejadorSteam)
+        self.datos = datos or DatosFalsos()
+        self.fallas = fallas
+        self.latencia = latencia
+        self.peticiones = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    def iniciar(self) -> "ServidorFalso":
+        threading.Thread(target=self.serve_forever, name="servidor-steam-falso", daemon=True).start()
+        return self
+
+    def detener(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Imitación local de la Web API de Steam")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--fallas", type=int, default=0, help="las primeras N peticiones responden 503")
+    parser.add_argument("--latencia", type=float, default=0.0, help="segundos de espera por respuesta")
+    args = parser.parse_args()
+
+    servidor = ServidorFalso(args.host, args.puerto, fallas=args.fallas, latencia=args.latencia)
+    print(f"Steam falso en {servidor.url} (Ctrl+C para detener)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("Servidor detenido.")
@@ -0,0 +1,72 @@
+"""
+Tracker de tiempo de juego de Steam.
+
+Descarga la biblioteca de una cuenta, la guarda en `steam_data.json` y en
+el almacén de instantáneas crudas (`instantaneas.py`, en lugar de un
+`data/raw/raw_AAAAMMDD.json` completo por día), agrega la instantánea del
+día a las series (`series.py`) y actualiza el resumen diario (`resumen.py`).
+
+Uso (desde la raíz del repositorio):
+    STEAM_API_KEY=... python -m trackerforgames.trackerforgames [--steamid ID]
+    # Sin red, contra el servidor falso:
+    python -m trackerforgames.servidor_falso &
+    STEAM_API_URL=http://127.0.0.1:8780 python -m trackerforgames.trackerforgames
+"""
+import argparse
+import json
+import logging
+from datetime import date
+from pathlib import Path
+
+from . import DATA_DIR
+from .cliente_steam import ClienteSteam
+from .instantaneas import AlmacenInstantaneas
+from .resumen import ResumenDiario
+from .series import AlmacenSeries
+
+PATH_DATOS = DATA_DIR.parent / "steam_data.json"
+
+
+def steamid_guardado() -> str:
+    """Steamid de la última cuenta descargada (la de `steam_data.json`)."""
+    try:
+        return str(json.loads(PATH_DATOS.read_text(encoding="utf-8"))["profile"]["steamid"])
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return ""
+
+
+def guardar_json(path: Path, datos: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(datos, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def actualizar(cliente: ClienteSteam, steamid: str, dia: date) -> dict:
+    """Descarga y guarda la instantánea de `steamid`; devuelve los datos."""
+    datos = cliente.instantanea(steamid)
+    guardar_json(PATH_DATOS, datos)
+    AlmacenInstantaneas().guardar(dia, {"response": {"game_count": len(datos["games"]),
+                                                     "games": datos["games"]}}, steamid)
+    escritos = AlmacenSeries().agregar_instantanea(dia, datos["games"])
+    ResumenDiario(AlmacenSeries()).actualizar()
+    logging.info(f"Instantánea de {steamid}: {len(datos['games'])} juegos, {escritos} series cambiaron")
+    return datos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tracker de tiempo de juego de Steam")
+    parser.add_argument("--steamid", default=steamid_guardado())
+    args = parser.parse_args()
+    if not args.steamid:
+        parser.error("indica --steamid (no hay steam_data.json de donde tomarlo)")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    cliente = ClienteSteam()
+    try:
+        datos = actualizar(cliente, args.steamid, date.today())
+        print(f"{datos['profile'].get('personaname', args.steamid)}: {len(datos['games'])} juegos, "
+              f"{len(datos['recent_games'])} recientes")
+        print(f"Llamadas: {cliente.estadisticas}")
+    except (ConnectionError, ValueError) as e:
+        print(e)
+    finally:
+        cliente.cerrar()